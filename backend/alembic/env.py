@@ -5,7 +5,7 @@ from app.core.config import settings
 from app.db.session import Base
 
 # Import models to register them with SQLAlchemy
-from app.models import event  # noqa: F401
+from app.models import event, reservation  # noqa: F401
 from sqlalchemy import engine_from_config, pool
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,70 @@
+"""add_event_minute_of_week_columns
+
+Revision ID: 3c9d1e7a5b2f
+Revises: fa4ee783ef4e
+Create Date: 2025-02-03
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9d1e7a5b2f"
+down_revision: Union[str, None] = "fa4ee783ef4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the columns as nullable first so existing rows can be backfilled
+    op.add_column("event", sa.Column("weekday", sa.Integer(), nullable=True))
+    op.add_column("event", sa.Column("start_minute_of_week", sa.Integer(), nullable=True))
+    op.add_column("event", sa.Column("end_minute_of_week", sa.Integer(), nullable=True))
+
+    # Backfill from the stored UTC datetimes (STRFTIME %w counts from Sunday, we count from Monday)
+    op.execute(
+        """
+        UPDATE event
+        SET weekday = (CAST(STRFTIME('%w', start_datetime) AS INTEGER) + 6) % 7
+    """
+    )
+    op.execute(
+        """
+        UPDATE event
+        SET start_minute_of_week = weekday * 1440
+            + CAST(STRFTIME('%H', start_datetime) AS INTEGER) * 60
+            + CAST(STRFTIME('%M', start_datetime) AS INTEGER)
+    """
+    )
+    op.execute(
+        """
+        UPDATE event
+        SET end_minute_of_week = start_minute_of_week
+            + CAST(STRFTIME('%s', end_datetime) AS INTEGER) / 60
+            - CAST(STRFTIME('%s', start_datetime) AS INTEGER) / 60
+    """
+    )
+
+    # SQLite can't add NOT NULL constraints in place, so batch mode rebuilds the table
+    with op.batch_alter_table("event") as batch_op:
+        batch_op.alter_column("weekday", existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column("start_minute_of_week", existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column("end_minute_of_week", existing_type=sa.Integer(), nullable=False)
+
+    op.create_index(
+        "ix_event_weekday_minute_of_week",
+        "event",
+        ["weekday", "start_minute_of_week", "end_minute_of_week"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_weekday_minute_of_week", table_name="event")
+
+    with op.batch_alter_table("event") as batch_op:
+        batch_op.drop_column("end_minute_of_week")
+        batch_op.drop_column("start_minute_of_week")
+        batch_op.drop_column("weekday")
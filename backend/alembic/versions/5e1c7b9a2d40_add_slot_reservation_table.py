@@ -0,0 +1,35 @@
+"""add_slot_reservation_table
+
+Revision ID: 5e1c7b9a2d40
+Revises: d27e5f0a4c81
+Create Date: 2025-02-10
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1c7b9a2d40"
+down_revision: Union[str, None] = "d27e5f0a4c81"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One row per weekday, matching RESERVATION_BUCKETS
+BUCKETS = 7
+
+
+def upgrade() -> None:
+    slot_reservation = op.create_table(
+        "slot_reservation",
+        sa.Column("bucket", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket"),
+    )
+    op.bulk_insert(slot_reservation, [{"bucket": bucket, "version": 0} for bucket in range(BUCKETS)])
+
+
+def downgrade() -> None:
+    op.drop_table("slot_reservation")
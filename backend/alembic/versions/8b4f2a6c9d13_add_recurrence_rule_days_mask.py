@@ -0,0 +1,40 @@
+"""add_recurrence_rule_days_mask
+
+Revision ID: 8b4f2a6c9d13
+Revises: 3c9d1e7a5b2f
+Create Date: 2025-02-05
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b4f2a6c9d13"
+down_revision: Union[str, None] = "3c9d1e7a5b2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+
+
+def upgrade() -> None:
+    op.add_column("recurrence_rule", sa.Column("days_mask", sa.Integer(), nullable=True))
+
+    # Backfill from the JSON list, e.g. '["MONDAY", "WEDNESDAY"]' -> 0b0000101
+    mask = " | ".join(
+        f"(CASE WHEN INSTR(days_of_week, '\"{day}\"') > 0 THEN {1 << bit} ELSE 0 END)"
+        for bit, day in enumerate(WEEKDAYS)
+    )
+    op.execute(f"UPDATE recurrence_rule SET days_mask = {mask}")
+
+    # SQLite can't add NOT NULL constraints in place, so batch mode rebuilds the table
+    with op.batch_alter_table("recurrence_rule") as batch_op:
+        batch_op.alter_column("days_mask", existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("recurrence_rule") as batch_op:
+        batch_op.drop_column("days_mask")
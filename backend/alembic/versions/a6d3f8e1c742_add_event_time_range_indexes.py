@@ -0,0 +1,37 @@
+"""add_event_time_range_indexes
+
+Revision ID: a6d3f8e1c742
+Revises: 5e1c7b9a2d40
+Create Date: 2025-02-11
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d3f8e1c742"
+down_revision: Union[str, None] = "5e1c7b9a2d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Back the start/end window of the events list: anchors overlapping it, and recurring series started by its end
+    op.create_index("ix_event_start_datetime_end_datetime", "event", ["start_datetime", "end_datetime"])
+    op.create_index(
+        "ix_event_recurrence_rule_id_start_datetime",
+        "event",
+        ["recurrence_rule_id", "start_datetime"],
+        sqlite_where=sa.text("recurrence_rule_id IS NOT NULL"),
+    )
+    # The longest event bounds how early an overlapping anchor can start
+    op.create_index("ix_event_length_minutes", "event", [sa.text("end_minute_of_week - start_minute_of_week")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_length_minutes", table_name="event")
+    op.drop_index("ix_event_recurrence_rule_id_start_datetime", table_name="event")
+    op.drop_index("ix_event_start_datetime_end_datetime", table_name="event")
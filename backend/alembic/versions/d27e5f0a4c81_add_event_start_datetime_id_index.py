@@ -0,0 +1,26 @@
+"""add_event_start_datetime_id_index
+
+Revision ID: d27e5f0a4c81
+Revises: 8b4f2a6c9d13
+Create Date: 2025-02-07
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d27e5f0a4c81"
+down_revision: Union[str, None] = "8b4f2a6c9d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination over (start_datetime, id)
+    op.create_index("ix_event_start_datetime_id", "event", ["start_datetime", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_start_datetime_id", table_name="event")
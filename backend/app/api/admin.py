@@ -0,0 +1,34 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.core.config import settings
+from app.core.slow_queries import slow_query_log
+from app.schemas.admin import SlowQueryRead
+
+
+def require_admin_api() -> None:
+    """Answer 404, as for an unknown path, unless ADMIN_API_ENABLED is set."""
+    if not settings.ADMIN_API_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_api)])
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryRead])
+def get_slow_queries() -> List[SlowQueryRead]:
+    """Get the most recent statements slower than SLOW_QUERY_MS, newest first.
+
+    Each entry has the statement's bound parameters, the service function
+    that issued it, the tags of its SELECTs (such as the conflict case of
+    each branch) and its EXPLAIN QUERY PLAN output.
+    """
+    return slow_query_log.recent()
+
+
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_queries() -> Response:
+    """Empty the slow-query log."""
+    slow_query_log.clear()
+    return Response(status_code=204)
@@ -1,18 +1,41 @@
-from typing import List
+from collections import Counter
+from datetime import datetime, timedelta
+from tempfile import SpooledTemporaryFile
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.session import get_db
-from app.schemas.event import EventCreate, EventRead
+from app.models.event import Event
+from app.schemas.event import (
+    EventBatchResult,
+    EventCreate,
+    EventImportReport,
+    EventOccurrence,
+    EventRead,
+    FreeBusyRead,
+    TimeInterval,
+)
 from app.services import event as event_service
+from app.services import group_commit, ics_import
+from app.services import occurrences as occurrence_service
+from app.services.event_cache import get_event_cache, serialize_page
+from app.services.reservations import sync_with_other_workers
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Uploaded .ics bodies beyond this are spooled to disk
+ICS_SPOOL_MAX_MEMORY = 1024 * 1024
+
 
 @router.post(
     "/",
     response_model=EventRead,
+    include_in_schema=not settings.ASYNC_DB,  # Served by events_async in ASYNC_DB mode
     responses={
         409: {"description": "Time slot conflict with existing event"},
     },
@@ -26,14 +49,194 @@ def create_event(
     The event can be a single occurrence or recurring weekly on specified days.
     Duration is specified in minutes.
     """
+    if settings.GROUP_COMMIT:
+        return group_commit.create_event(db=db, event=event)
     return event_service.create_event(db=db, event=event)
 
 
-@router.get("/", response_model=List[EventRead])
+@router.post("/batch", response_model=List[EventBatchResult])
+def create_events(
+    events: List[EventCreate],
+    db: Session = Depends(get_db),
+) -> List[EventBatchResult]:
+    """Create many events at once.
+
+    Events are checked in order against existing events and the ones accepted
+    earlier in the batch. Returns one result per event: 200 with the created
+    event, or 409 with the same detail as POST /api/events/ if its time slot
+    conflicts.
+    """
+    return [
+        EventBatchResult(status_code=200, event=outcome)
+        if isinstance(outcome, Event)
+        else EventBatchResult(status_code=409, detail=event_service.conflict_error(outcome).detail)
+        for outcome in event_service.create_events_with_conflicts(db=db, events=events)
+    ]
+
+
+@router.post(
+    "/import",
+    response_model=EventImportReport,
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"text/calendar": {"schema": {"type": "string"}}}},
+    },
+)
+async def import_events(
+    request: Request,
+    db: Session = Depends(get_db),
+) -> EventImportReport:
+    """Import the events of an iCalendar (.ics) file sent as the request body.
+
+    The body is spooled to a temporary file as it arrives and read back
+    incrementally. Events are checked in file order against existing events
+    and the ones imported before them, and committed in batches. Weekly
+    RRULEs become recurrence rules; a VEVENT that conflicts or can't be
+    represented is skipped and reported.
+    """
+    with SpooledTemporaryFile(max_size=ICS_SPOOL_MAX_MEMORY) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        results = await run_in_threadpool(
+            lambda: [
+                ics_import.import_result_read(result)
+                for result in ics_import.import_events(
+                    db, body, settings.ICS_IMPORT_BATCH_SIZE, settings.ICS_IMPORT_WORKERS
+                )
+            ]
+        )
+
+    statuses = Counter(result.status_code for result in results)
+    return EventImportReport(imported=statuses[200], conflicts=statuses[409], invalid=statuses[422], results=results)
+
+
+@router.get(
+    "/",
+    response_model=List[EventRead],
+    include_in_schema=not settings.ASYNC_DB,  # Served by events_async in ASYNC_DB mode
+    responses={
+        304: {"description": "Nothing changed since the ETag sent in If-None-Match"},
+    },
+)
 def get_events(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    window_start: Optional[datetime] = Query(None, alias="start"),
+    window_end: Optional[datetime] = Query(None, alias="end"),
     db: Session = Depends(get_db),
-) -> List[EventRead]:
-    """Get a list of events with pagination."""
-    return event_service.get_events(db=db, skip=skip, limit=limit)
+) -> Response:
+    """Get a list of events with pagination.
+
+    Pass the X-Next-Cursor header of a full page as ``cursor`` to fetch the
+    next one; unlike ``skip`` this stays fast on deep pages and doesn't shift
+    when events are added in between.
+
+    ``start`` and ``end`` narrow the list to the events active in that window:
+    those whose first occurrence overlaps it, and recurring events that have
+    started by its end. Expand them with /occurrences for the individual
+    occurrences.
+
+    Responses carry an ETag that changes whenever events are written. Sending
+    it back in If-None-Match gets an empty 304 while nothing has changed.
+    """
+    sync_with_other_workers(db)
+    cache = get_event_cache(db)
+    version, headers = cache.validators()
+    if cache.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    key = (version, skip, limit, cursor, window_start, window_end)
+    page = cache.get_page(key)
+    if page is None:
+        rows = event_service.get_event_rows(
+            db=db, skip=skip, limit=limit, cursor=cursor, window_start=window_start, window_end=window_end
+        )
+        next_cursor = event_service.encode_cursor(rows[-1]) if rows and len(rows) == limit else None
+        page = serialize_page(rows, next_cursor)
+        cache.put_page(key, page)
+
+    body, next_cursor = page
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One EventRead JSON object per line, in start order",
+            "content": {"application/x-ndjson": {}},
+        },
+    },
+)
+def export_events(
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Export every event as newline-delimited JSON.
+
+    Events are read and written in batches while the response streams, so
+    this is the way to pull the whole table for backups or analytics.
+    """
+    events = event_service.export_events(db=db)
+    return StreamingResponse(
+        (EventRead.model_validate(event).model_dump_json() + "\n" for event in events),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get(
+    "/occurrences",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One EventOccurrence JSON object per line, in start order",
+            "content": {"application/x-ndjson": {}},
+        },
+    },
+)
+def get_occurrences(
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Get every occurrence of every event within a time window.
+
+    Recurring events are expanded into their individual occurrences. The result
+    is streamed as newline-delimited JSON while it is generated.
+    """
+    occurrences = occurrence_service.get_occurrences(db=db, window_start=window_start, window_end=window_end)
+    return StreamingResponse(
+        (EventOccurrence(**occurrence._asdict()).model_dump_json() + "\n" for occurrence in occurrences),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/free-busy", response_model=FreeBusyRead)
+def get_free_busy(
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    duration: int = Query(..., gt=0, description="Length of the free slots in minutes"),
+    limit: int = Query(10, gt=0, le=1000, description="Maximum number of free slots to return"),
+    db: Session = Depends(get_db),
+) -> FreeBusyRead:
+    """Get busy times and available slots within a time window.
+
+    Returns the merged busy blocks of all event occurrences in the window and
+    the first free slots of ``duration`` minutes, one per gap. Creating a
+    one-off event in any returned slot won't conflict.
+    """
+    free_busy = occurrence_service.get_free_busy(
+        db=db,
+        window_start=window_start,
+        window_end=window_end,
+        duration=timedelta(minutes=duration),
+        limit=limit,
+    )
+    return FreeBusyRead(
+        busy=[TimeInterval(start_datetime=start, end_datetime=end) for start, end in free_busy.busy],
+        free=[TimeInterval(start_datetime=start, end_datetime=end) for start, end in free_busy.free],
+    )
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.schemas.event import EventCreate, EventRead
+from app.services import event as event_service
+from app.services import event_async as event_async_service
+from app.services.event_cache import get_event_cache, serialize_page
+from app.services.reservations import sync_with_other_workers
+
+# Async versions of the hot event routes, mounted ahead of the sync router in ASYNC_DB mode
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.post(
+    "/",
+    response_model=EventRead,
+    responses={
+        409: {"description": "Time slot conflict with existing event"},
+    },
+)
+async def create_event(
+    event: EventCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> EventRead:
+    """Create a new event.
+
+    The event can be a single occurrence or recurring weekly on specified days.
+    Duration is specified in minutes.
+    """
+    return await event_async_service.create_event(db=db, event=event)
+
+
+@router.get(
+    "/",
+    response_model=List[EventRead],
+    responses={
+        304: {"description": "Nothing changed since the ETag sent in If-None-Match"},
+    },
+)
+async def get_events(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    window_start: Optional[datetime] = Query(None, alias="start"),
+    window_end: Optional[datetime] = Query(None, alias="end"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Get a list of events with pagination.
+
+    Pass the X-Next-Cursor header of a full page as ``cursor`` to fetch the
+    next one; unlike ``skip`` this stays fast on deep pages and doesn't shift
+    when events are added in between.
+
+    ``start`` and ``end`` narrow the list to the events active in that window:
+    those whose first occurrence overlaps it, and recurring events that have
+    started by its end. Expand them with /occurrences for the individual
+    occurrences.
+
+    Responses carry an ETag that changes whenever events are written. Sending
+    it back in If-None-Match gets an empty 304 while nothing has changed.
+    """
+    await db.run_sync(sync_with_other_workers)
+    cache = get_event_cache(db)
+    version, headers = cache.validators()
+    if cache.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    key = (version, skip, limit, cursor, window_start, window_end)
+    page = cache.get_page(key)
+    if page is None:
+        rows = await event_async_service.get_event_rows(
+            db=db, skip=skip, limit=limit, cursor=cursor, window_start=window_start, window_end=window_end
+        )
+        next_cursor = event_service.encode_cursor(rows[-1]) if rows and len(rows) == limit else None
+        page = serialize_page(rows, next_cursor)
+        cache.put_page(key, page)
+
+    body, next_cursor = page
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
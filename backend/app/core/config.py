@@ -1,8 +1,25 @@
 import os
 from pathlib import Path
+from typing import Dict, Optional, Union
 
 from pydantic_settings import BaseSettings
 
+# PRAGMAs applied to every new SQLite connection, per SQLITE_PROFILE
+SQLITE_PROFILES: Dict[str, Dict[str, Union[int, str]]] = {
+    # SQLite's own defaults: rollback journal, synchronous=FULL, small page cache
+    "default": {},
+    # WAL lets readers run alongside the writer, and synchronous=NORMAL only fsyncs at
+    # checkpoints (still safe against corruption, may lose the last commits on power loss)
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # Negative means KiB, so 64 MiB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Sticky Note Scheduler"
@@ -18,10 +35,76 @@ class Settings(BaseSettings):
         str(BASE_DIR / "scheduler.db"),
     )
 
+    # Answer conflict checks from the in-memory conflict index rather than SQL
+    CONFLICT_INDEX_ENABLED: bool = True
+
+    # Serve the create/list event routes with async defs on an aiosqlite engine
+    ASYNC_DB: bool = False
+
+    # Record per-route latency and SQL metrics, served at /metrics and in Server-Timing headers
+    METRICS_ENABLED: bool = True
+
+    # Worker processes started by app.main.start (and the Docker image). With more than one,
+    # each worker checks for the others' writes before using its caches and conflict index
+    WORKERS: int = 1
+
+    # Queue POST /api/events/ creates for a single writer thread that commits them in groups
+    # (sync routes only; the ASYNC_DB route always writes per request)
+    GROUP_COMMIT: bool = False
+    # Most creates committed in one transaction in GROUP_COMMIT mode
+    GROUP_COMMIT_MAX_BATCH: int = 64
+
+    # VEVENTs checked and committed per transaction by POST /api/events/import and import-ics
+    ICS_IMPORT_BATCH_SIZE: int = 500
+    # Processes parsing imported .ics files; 0 parses in the request's own thread
+    ICS_IMPORT_WORKERS: int = 0
+
+    # Serialized GET /api/events/ pages kept per database (LRU); 0 disables the page cache
+    EVENT_PAGE_CACHE_SIZE: int = 256
+
+    # Statements slower than this are logged with their query plan (None disables the log)
+    SLOW_QUERY_MS: Optional[float] = 200.0
+    # Number of recent slow statements kept for /api/admin/slow-queries
+    SLOW_QUERY_LOG_SIZE: int = 100
+    # Serve /api/admin; its slow query log shows statements with their bound parameters, so it's off by default
+    ADMIN_API_ENABLED: bool = False
+
+    # SQLite tuning (see SQLITE_PROFILES); the individual settings override the profile
+    SQLITE_PROFILE: str = "default"
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_BUSY_TIMEOUT_MS: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+
+    # Connection pool sizing for the database engines
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+
+    @property
+    def SQLITE_PRAGMAS(self) -> Dict[str, Union[int, str]]:
+        pragmas = dict(SQLITE_PROFILES[self.SQLITE_PROFILE])
+        overrides = {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT_MS,
+            "temp_store": self.SQLITE_TEMP_STORE,
+        }
+        pragmas.update({name: value for name, value in overrides.items() if value is not None})
+        return pragmas
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return f"sqlite:///{self.SQLITE_DB_FILE}"
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        return f"sqlite+aiosqlite:///{self.SQLITE_DB_FILE}"
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,150 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Engine, event
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of the request being handled."""
+
+    queries: int = 0
+    query_seconds: float = 0.0
+
+
+# Set by the metrics middleware for the duration of a request. Sync endpoints run in a
+# threadpool with a copy of the context, which still points at the same RequestStats.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.series: Dict[Labels, List] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.series.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Prometheus-style counter per label set."""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.series: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, value: float = 1) -> None:
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{format_labels(labels)} {value}" for labels, value in sorted(self.series.items()))
+        return lines
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class MetricsRegistry:
+    """Process-wide request and SQL metrics, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests = Counter("http_requests_total", "HTTP requests by route and status.")
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds", "Time until the response headers are sent.", LATENCY_BUCKETS
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "SQL statements executed per request.", QUERY_COUNT_BUCKETS
+        )
+        self.request_query_seconds = Histogram(
+            "http_request_db_seconds", "Time spent executing SQL per request.", LATENCY_BUCKETS
+        )
+        self.queries = Counter("db_queries_total", "SQL statements executed, in or out of requests.")
+        self.query_seconds = Counter("db_query_seconds_total", "Time spent executing SQL, in or out of requests.")
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        labels = (("method", method), ("route", route))
+        with self.lock:
+            self.requests.inc(labels + (("status", str(status)),))
+            self.request_seconds.observe(labels, seconds)
+            self.request_queries.observe(labels, stats.queries)
+            self.request_query_seconds.observe(labels, stats.query_seconds)
+
+    def observe_query(self, seconds: float) -> None:
+        with self.lock:
+            self.queries.inc(())
+            self.query_seconds.inc((), seconds)
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = (
+                self.requests,
+                self.request_seconds,
+                self.request_queries,
+                self.request_query_seconds,
+                self.queries,
+                self.query_seconds,
+            )
+            return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement the engine executes.
+
+    Statements are added to the registry totals and, inside a request, to the
+    request's RequestStats.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+        registry.observe_query(seconds)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += seconds
+
+
+def server_timing(seconds: float, stats: RequestStats) -> str:
+    """Build a Server-Timing header value for a request."""
+    return f"app;dur={seconds * 1000:.1f}, " f'db;dur={stats.query_seconds * 1000:.1f};desc="{stats.queries} queries"'
@@ -0,0 +1,164 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import Engine, Select, event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements worth explaining; EXPLAIN QUERY PLAN on anything else isn't useful
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# Comment added by tag_query right after a SELECT keyword
+TAG_PATTERN = re.compile(r"SELECT /\* tag: ([\w.]+) \*/")
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: List[Any]
+    duration_ms: float
+    caller: Optional[str]
+    tags: List[str]
+    plan: List[str]
+    logged_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class SlowQueryLog:
+    """Ring buffer of the most recent slow statements."""
+
+    def __init__(self, size: int) -> None:
+        self.entries: deque = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def record(self, slow_query: SlowQuery) -> None:
+        with self.lock:
+            self.entries.append(slow_query)
+
+    def recent(self) -> List[SlowQuery]:
+        """Entries from newest to oldest."""
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+def find_caller() -> Optional[str]:
+    """Name the innermost app.services function on the stack, e.g. app.services.event.check_time_conflict."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.services."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def tag_query(query: Select, tag: str) -> Select:
+    """Mark a SELECT with a comment naming it, so its slow-query entries and plan steps can be told apart.
+
+    Useful for the branches of a UNION, which are logged as one statement.
+    """
+    return query.prefix_with(f"/* tag: {tag} */")
+
+
+def find_tags(statement: str) -> List[str]:
+    """Tags added by tag_query, in the order their SELECTs appear in the statement."""
+    return TAG_PATTERN.findall(statement)
+
+
+def label_plan(rows: List[tuple], tags: List[str]) -> List[str]:
+    """Prefix each EXPLAIN QUERY PLAN step with the tag of the SELECT it belongs to.
+
+    A compound statement's plan has one child of its COMPOUND QUERY step per
+    SELECT, in statement order; a plain SELECT has just the one. Steps are
+    left unlabelled when the tags can't be matched up that way.
+    """
+    parents = {row[0]: row[1] for row in rows}
+    compound = next((row[0] for row in rows if row[1] == 0 and row[3] == "COMPOUND QUERY"), None)
+    if compound is None and len(tags) == 1:
+        return [f"[{tags[0]}] {row[3]}" for row in rows]
+    branches = [row[0] for row in rows if compound is not None and row[1] == compound]
+    if not tags or len(branches) != len(tags):
+        return [row[3] for row in rows]
+
+    tag_of = dict(zip(branches, tags))
+    steps = []
+    for step_id, _, _, detail in rows:
+        # Walk up to the branch under the COMPOUND QUERY step
+        node = step_id
+        while node in parents and node not in tag_of:
+            node = parents[node]
+        steps.append(f"[{tag_of[node]}] {detail}" if node in tag_of else detail)
+    return steps
+
+
+def explain(dbapi_connection, statement: str, parameters) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN steps of a statement, run on the raw DBAPI connection.
+
+    Steps of SELECTs marked with tag_query are prefixed with their tag. The
+    raw connection keeps the EXPLAIN itself out of the engine's event
+    listeners (and so out of the metrics and this log).
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return label_plan(cursor.fetchall(), find_tags(statement))
+    except Exception as e:
+        return [f"EXPLAIN QUERY PLAN failed: {e}"]
+    finally:
+        cursor.close()
+
+
+def log_slow_queries(engine: Engine) -> None:
+    """Log statements slower than SLOW_QUERY_MS with their parameters, caller, tags and query plan.
+
+    The threshold is read on every statement, so it can be changed at runtime;
+    None turns logging off.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_slow_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def check_slow_query(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start_time"].pop()) * 1000
+        threshold = settings.SLOW_QUERY_MS
+        if threshold is None or duration_ms < threshold:
+            return
+
+        # executemany passes a list of parameter sets; explain with the first
+        params = parameters[0] if executemany and parameters else parameters
+        slow_query = SlowQuery(
+            statement=statement,
+            parameters=list(params) if isinstance(params, (list, tuple)) else [params],
+            duration_ms=duration_ms,
+            caller=find_caller(),
+            tags=find_tags(statement),
+            plan=explain(conn.connection.dbapi_connection, statement, params),
+        )
+        slow_query_log.record(slow_query)
+        logger.warning(
+            "Slow query (%.1f ms) from %s %s: %s; parameters %r; plan %s",
+            duration_ms,
+            slow_query.caller,
+            slow_query.tags,
+            statement,
+            slow_query.parameters,
+            slow_query.plan,
+        )
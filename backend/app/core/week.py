@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def to_utc_naive(dt: datetime) -> datetime:
+    """Normalize a datetime to the naive UTC form stored by SQLite."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def minute_of_week(dt: datetime) -> int:
+    """Minutes since Monday 00:00 (0 = Monday, matching Weekday.day_number)."""
+    return dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
+def duration_minutes(start_datetime: datetime, end_datetime: datetime) -> int:
+    """Whole-minute length of an event, truncating seconds like the SQL checks do."""
+    start = start_datetime.replace(second=0, microsecond=0)
+    end = end_datetime.replace(second=0, microsecond=0)
+    return int((end - start).total_seconds() // 60)
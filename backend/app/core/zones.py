@@ -0,0 +1,112 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import FrozenSet, Iterator, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Range covered by the transition tables; offsets outside it are clamped to the nearest end
+TRANSITIONS_START = datetime(1970, 1, 1)
+TRANSITIONS_END = datetime(2100, 1, 1)
+
+
+class ZoneSegment(NamedTuple):
+    """A stretch of UTC time over which a zone's UTC offset doesn't change."""
+
+    start: datetime
+    end: Optional[datetime]  # None for the open-ended last segment
+    offset: int  # Minutes east of UTC
+
+
+def _minutes(offset: timedelta) -> int:
+    return int(offset.total_seconds() // 60)
+
+
+@lru_cache(maxsize=None)
+def zone_transitions(zone_name: str) -> Tuple[Tuple[datetime, ...], Tuple[int, ...]]:
+    """Return the naive UTC instants at which a zone's offset changes and the offset from each one on.
+
+    Fixed-offset zones such as UTC have a single entry. Other zones are
+    sampled once a day and each change is narrowed down to the minute by
+    bisection. The table is built once per zone and memoized, so later
+    lookups are a binary search. The first instant is TRANSITIONS_START.
+    """
+    zone = ZoneInfo(zone_name)
+    fixed = zone.utcoffset(None)
+    if fixed is not None:
+        return (TRANSITIONS_START,), (_minutes(fixed),)
+
+    # Samples are UTC instants tagged with the zone, the form fromutc() converts without further checks
+    to_local = zone.fromutc
+    day = TRANSITIONS_START.replace(tzinfo=zone)
+    last_day = TRANSITIONS_END.replace(tzinfo=zone)
+    offset = to_local(day).utcoffset()
+    instants = [TRANSITIONS_START]
+    offsets = [_minutes(offset)]
+
+    while day < last_day:
+        next_day = day + timedelta(days=1)
+        next_offset = to_local(next_day).utcoffset()
+        if next_offset != offset:
+            lo, hi = 0, 24 * 60  # The change happens within (day + lo, day + hi] minutes
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if to_local(day + timedelta(minutes=mid)).utcoffset() == next_offset:
+                    hi = mid
+                else:
+                    lo = mid
+            instants.append((day + timedelta(minutes=hi)).replace(tzinfo=None))
+            offsets.append(_minutes(next_offset))
+            offset = next_offset
+        day = next_day
+
+    return tuple(instants), tuple(offsets)
+
+
+def utc_offset(zone_name: str, at: datetime) -> int:
+    """Minutes east of UTC in a zone at a naive UTC instant."""
+    instants, offsets = zone_transitions(zone_name)
+    return offsets[max(bisect_right(instants, at) - 1, 0)]
+
+
+@lru_cache(maxsize=None)
+def _later_offsets(zone_name: str) -> Tuple[FrozenSet[int], ...]:
+    """For each transition, the distinct offsets the zone takes from it onwards."""
+    _, offsets = zone_transitions(zone_name)
+    later = [frozenset([offsets[-1]])]
+    for offset in reversed(offsets[:-1]):
+        later.append(later[-1] | {offset})
+    return tuple(reversed(later))
+
+
+def zone_offsets(zone_name: str, start: datetime) -> FrozenSet[int]:
+    """The distinct offsets (in minutes) a zone takes from a naive UTC instant onwards."""
+    instants, _ = zone_transitions(zone_name)
+    return _later_offsets(zone_name)[max(bisect_right(instants, start) - 1, 0)]
+
+
+def zone_segments(zone_name: str, start: datetime, end: Optional[datetime] = None) -> Iterator[ZoneSegment]:
+    """Yield the constant-offset segments of a zone covering [start, end), clipped to the range.
+
+    With no ``end`` the last segment is open-ended.
+    """
+    instants, offsets = zone_transitions(zone_name)
+    i = max(bisect_right(instants, start) - 1, 0)
+    while end is None or start < end:
+        segment_end = instants[i + 1] if i + 1 < len(instants) else None
+        if end is not None and (segment_end is None or segment_end > end):
+            segment_end = end
+        yield ZoneSegment(start, segment_end, offsets[i])
+        if segment_end is None:
+            return
+        start = segment_end
+        i += 1
+
+
+def local_to_utc(zone_name: str, local: datetime) -> datetime:
+    """Convert a naive wall-clock time in a zone to naive UTC."""
+    return local.replace(tzinfo=ZoneInfo(zone_name)).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_to_local(zone_name: str, utc: datetime) -> datetime:
+    """Convert a naive UTC time to naive wall-clock time in a zone."""
+    return utc.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(zone_name)).replace(tzinfo=None)
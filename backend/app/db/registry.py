@@ -0,0 +1,51 @@
+import threading
+from typing import Any, Dict, Generic, List, MutableMapping, Optional, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine
+
+T = TypeVar("T")
+
+
+class DatabaseRegistry(Generic[T]):
+    """Process-wide objects kept per database.
+
+    File databases share one object across engines (e.g. the sync and async
+    engines in ASYNC_DB mode); in-memory databases are private to their engine
+    and their entries go away with it.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, T] = {}
+        self._memory: "WeakKeyDictionary[Engine, T]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _slot(self, bind: Engine) -> Tuple[MutableMapping, Any]:
+        database = bind.url.database
+        if database and database != ":memory:":
+            return self._files, database
+        return self._memory, bind
+
+    def get(self, bind: Engine) -> Optional[T]:
+        mapping, key = self._slot(bind)
+        with self._lock:
+            return mapping.get(key)
+
+    def setdefault(self, bind: Engine, value: T) -> T:
+        """Store ``value`` unless another thread got there first; return whichever is stored."""
+        mapping, key = self._slot(bind)
+        with self._lock:
+            return mapping.setdefault(key, value)
+
+    def pop(self, bind: Engine) -> Optional[T]:
+        mapping, key = self._slot(bind)
+        with self._lock:
+            return mapping.pop(key, None)
+
+    def pop_all(self) -> List[T]:
+        """Remove and return the objects of every database."""
+        with self._lock:
+            values = [*self._files.values(), *self._memory.values()]
+            self._files.clear()
+            self._memory.clear()
+            return values
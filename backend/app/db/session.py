@@ -1,15 +1,72 @@
-from sqlalchemy import create_engine
+from typing import Dict, Union
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.slow_queries import log_slow_queries
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Union[int, str]]) -> None:
+    """Run the given PRAGMAs on every new connection the engine opens."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(url: str, pragmas: Dict[str, Union[int, str]]) -> Engine:
+    """Create a SQLite engine with the configured pool sizing and PRAGMAs.
+
+    The engine is also instrumented for metrics and the slow-query log.
+    """
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    apply_sqlite_pragmas(db_engine, pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(db_engine)
+    log_slow_queries(db_engine)
+    return db_engine
+
+
+def create_async_db_engine(url: str, pragmas: Dict[str, Union[int, str]]) -> AsyncEngine:
+    """Async counterpart of create_db_engine."""
+    db_engine = create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    apply_sqlite_pragmas(db_engine.sync_engine, pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(db_engine.sync_engine)
+    log_slow_queries(db_engine.sync_engine)
+    return db_engine
+
 
 # SQLite specific settings
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-)
+engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URI, settings.SQLITE_PRAGMAS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for ASYNC_DB mode, only created when it is enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    async_engine = create_async_db_engine(settings.SQLALCHEMY_ASYNC_DATABASE_URI, settings.SQLITE_PRAGMAS)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 # Base class for SQLAlchemy models
 class Base(DeclarativeBase):
@@ -23,3 +80,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session (ASYNC_DB mode)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,40 @@
+"""Import an iCalendar (.ics) file into the scheduler's database.
+
+Prints one JSON result per VEVENT, in file order, as POST /api/events/import
+reports them, then a summary on stderr.
+
+Usage:
+    poetry run import-ics calendar.ics --workers 4
+"""
+
+import argparse
+import sys
+from collections import Counter
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import ics_import
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="the .ics file to import")
+    parser.add_argument("--batch-size", type=int, default=settings.ICS_IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.ICS_IMPORT_WORKERS, help="parser processes")
+    args = parser.parse_args()
+
+    statuses = Counter()
+    with SessionLocal() as db, open(args.path, "rb") as file:
+        for result in ics_import.import_events(db, file, args.batch_size, args.workers):
+            report = ics_import.import_result_read(result)
+            statuses[report.status_code] += 1
+            print(report.model_dump_json(exclude_none=True))
+
+    print(
+        f"imported {statuses[200]}  conflicts {statuses[409]}  invalid {statuses[422]}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
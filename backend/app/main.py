@@ -1,13 +1,48 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select
 
+from app.api.admin import router as admin_router
 from app.api.events import router as events_router
+from app.api.events_async import router as events_async_router
+from app.api.metrics import router as metrics_router
 from app.core.config import settings
+from app.core.metrics import RequestStats, current_request_stats, registry, server_timing
+from app.core.zones import zone_transitions
+from app.db.session import SessionLocal, async_engine
+from app.models.event import Event
+from app.services import group_commit
+from app.services.conflict_index import get_conflict_index
+from app.services.reservations import sync_with_other_workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with SessionLocal() as db:
+        # Note where the write counter stands, so the index built next isn't dropped straight away
+        sync_with_other_workers(db)
+        # Tabulate the offsets of the zones events use, so the first request in each zone doesn't pay for it
+        for zone in db.scalars(select(Event.timezone).distinct()):
+            zone_transitions(zone)
+        # Build the conflict index up front so the first create doesn't pay for it
+        if settings.CONFLICT_INDEX_ENABLED:
+            get_conflict_index(db)
+    yield
+    # The writer thread is a daemon; let it commit what's queued so no create is left without an answer
+    await asyncio.to_thread(group_commit.stop_writers)
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -17,14 +52,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Lets browsers read the pagination cursor and ETag
 )
 
+if settings.METRICS_ENABLED:
+
+    @app.middleware("http")
+    async def record_metrics(request: Request, call_next):
+        """Record latency and SQL activity per route, and report them in a Server-Timing header.
+
+        Latency is measured until the response headers are ready, so the body of
+        a streaming response isn't included.
+        """
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            current_request_stats.reset(token)
+        seconds = time.perf_counter() - started
+
+        # Label by route template rather than path, so ids don't create new series
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        registry.observe_request(request.method, route_path, response.status_code, seconds, stats)
+        response.headers["Server-Timing"] = server_timing(seconds, stats)
+        return response
+
+
 # Include routers
+if settings.ASYNC_DB:
+    # Registered first so the async create/list routes take precedence over the sync ones
+    app.include_router(events_async_router, prefix=settings.API_PREFIX)
 app.include_router(events_router, prefix=settings.API_PREFIX)
+app.include_router(admin_router, prefix=settings.API_PREFIX, include_in_schema=settings.ADMIN_API_ENABLED)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 
 def start(reload=True):
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=reload)
+    # Reloading always runs a single process, so it's only used with one worker
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=reload and settings.WORKERS == 1,
+        workers=settings.WORKERS,
+    )
 
 
 if __name__ == "__main__":
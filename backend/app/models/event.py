@@ -1,12 +1,13 @@
 import json
 from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import Iterable, List
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, TypeDecorator
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, TypeDecorator, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.week import duration_minutes, minute_of_week, to_utc_naive
 from app.db.session import Base
 
 
@@ -24,6 +25,28 @@ class Weekday(str, Enum):
         """Get the day number (0 = Monday, 6 = Sunday)."""
         return list(Weekday).index(self)
 
+    @property
+    def bit(self) -> int:
+        """Get the bit for this day in a days-of-week mask (Monday = 1, Sunday = 64)."""
+        return 1 << self.day_number
+
+
+def weekdays_to_mask(days: Iterable[Weekday]) -> int:
+    """Encode weekdays as a 7-bit mask."""
+    mask = 0
+    for day in days:
+        mask |= day.bit
+    return mask
+
+
+# Decoded weekdays for every possible mask, so reads don't parse anything per row
+_MASK_WEEKDAYS = tuple(tuple(day for day in Weekday if mask & day.bit) for mask in range(1 << len(Weekday)))
+
+
+def mask_to_weekdays(mask: int) -> List[Weekday]:
+    """Decode a 7-bit mask into weekdays, Monday first."""
+    return list(_MASK_WEEKDAYS[mask])
+
 
 class WeekdayList(TypeDecorator):
     impl = String
@@ -52,9 +75,14 @@ class RecurrenceRule(Base):
     __tablename__ = "recurrence_rule"
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    days_of_week: Mapped[List[Weekday]] = mapped_column(
+    # Bit i set for Weekday.day_number i; this is what queries filter on and reads decode
+    days_mask: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Original JSON encoding, still written for older readers but never loaded
+    _days_of_week_json: Mapped[List[Weekday]] = mapped_column(
+        "days_of_week",
         WeekdayList,
         nullable=False,
+        deferred=True,
     )
 
     # Relationship
@@ -64,9 +92,48 @@ class RecurrenceRule(Base):
         uselist=False,
     )
 
+    @property
+    def days_of_week(self) -> List[Weekday]:
+        return mask_to_weekdays(self.days_mask)
+
+    @days_of_week.setter
+    def days_of_week(self, value: List[Weekday]) -> None:
+        self.days_mask = weekdays_to_mask(value)
+        self._days_of_week_json = value
+
+
+def _anchor_start(context) -> datetime:
+    return to_utc_naive(context.get_current_parameters()["start_datetime"])
+
+
+def _default_weekday(context) -> int:
+    return _anchor_start(context).weekday()
+
+
+def _default_start_minute_of_week(context) -> int:
+    return minute_of_week(_anchor_start(context))
+
+
+def _default_end_minute_of_week(context) -> int:
+    params = context.get_current_parameters()
+    start = _anchor_start(context)
+    return minute_of_week(start) + duration_minutes(start, to_utc_naive(params["end_datetime"]))
+
 
 class Event(Base):
     __tablename__ = "event"
+    __table_args__ = (
+        Index("ix_event_weekday_minute_of_week", "weekday", "start_minute_of_week", "end_minute_of_week"),
+        Index("ix_event_start_datetime_id", "start_datetime", "id"),
+        Index("ix_event_start_datetime_end_datetime", "start_datetime", "end_datetime"),
+        # Partial, so it only holds recurring events and lookups of one-off events keep using the weekday index
+        Index(
+            "ix_event_recurrence_rule_id_start_datetime",
+            "recurrence_rule_id",
+            "start_datetime",
+            sqlite_where=text("recurrence_rule_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -74,6 +141,21 @@ class Event(Base):
     end_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     timezone: Mapped[str] = mapped_column(String(50), nullable=False)
 
+    # Anchor occurrence in UTC, precomputed on insert so conflict queries can use an index.
+    # weekday: 0 = Monday; minutes are counted from Monday 00:00 and the end may run past
+    # the end of the day (or week) for events that cross midnight.
+    weekday: Mapped[int] = mapped_column(Integer, nullable=False, default=_default_weekday)
+    start_minute_of_week: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=_default_start_minute_of_week,
+    )
+    end_minute_of_week: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=_default_end_minute_of_week,
+    )
+
     # Foreign key and relationship
     recurrence_rule_id: Mapped[UUID | None] = mapped_column(
         ForeignKey("recurrence_rule.id"),
@@ -83,3 +165,7 @@ class Event(Base):
         "RecurrenceRule",
         back_populates="event",
     )
+
+
+# Lets get_longest_event_query find the longest event from one end of an index
+Index("ix_event_length_minutes", Event.end_minute_of_week - Event.start_minute_of_week)
@@ -0,0 +1,29 @@
+from sqlalchemy import Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.week import MINUTES_PER_DAY, MINUTES_PER_WEEK
+from app.db.session import Base
+
+# Event writes reserve the weekdays their UTC minute-of-week footprint touches
+RESERVATION_BUCKET_MINUTES = MINUTES_PER_DAY
+RESERVATION_BUCKETS = MINUTES_PER_WEEK // RESERVATION_BUCKET_MINUTES
+
+
+class SlotReservation(Base):
+    """Write version of one bucket of the week.
+
+    Every event write bumps the versions of the buckets it could conflict in,
+    so a writer can tell whether another process wrote into its buckets
+    between its conflict check and its insert.
+    """
+
+    __tablename__ = "slot_reservation"
+
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(SlotReservation.__table__, "after_create")
+def seed_slot_reservations(target, connection, **kwargs) -> None:
+    # Writers only ever update these rows, so they must exist from the start
+    connection.execute(target.insert(), [{"bucket": bucket, "version": 0} for bucket in range(RESERVATION_BUCKETS)])
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SlowQueryRead(BaseModel):
+    statement: str
+    parameters: List[Any]
+    duration_ms: float
+    caller: Optional[str] = Field(None, description="Innermost app.services function that issued the statement")
+    tags: List[str] = Field(..., description="Tags of the statement's SELECTs, e.g. the conflict case of each branch")
+    plan: List[str] = Field(..., description="EXPLAIN QUERY PLAN steps, prefixed with the tag of their SELECT")
+    logged_at: datetime
+    model_config = ConfigDict(from_attributes=True)
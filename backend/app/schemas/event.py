@@ -108,3 +108,57 @@ class EventRead(EventBase):
     id: UUID
     recurrence_rule: Optional[RecurrenceRuleRead] = None
     model_config = ConfigDict(from_attributes=True)
+
+
+class ConflictingEventRead(BaseModel):
+    id: UUID
+    name: str
+
+
+class ConflictDetail(BaseModel):
+    """The ``detail`` of a 409: what the new event conflicts with, up to CONFLICT_LIMIT events."""
+
+    message: str
+    conflicts: List[ConflictingEventRead]
+
+
+class EventBatchResult(BaseModel):
+    status_code: int = Field(..., description="200 if the event was created, 409 if it conflicted")
+    event: Optional[EventRead] = None
+    detail: Optional[ConflictDetail] = None
+
+
+class EventImportResult(BaseModel):
+    line: int = Field(..., description="Line of the file where the VEVENT begins")
+    uid: Optional[str] = Field(None, description="UID of the VEVENT")
+    status_code: int = Field(
+        ..., description="200 if the event was imported, 409 if it conflicted, 422 if it couldn't be read"
+    )
+    event: Optional[EventRead] = None
+    detail: Optional[str] = None
+    conflicts: Optional[List[ConflictingEventRead]] = None
+
+
+class EventImportReport(BaseModel):
+    imported: int
+    conflicts: int
+    invalid: int
+    results: List[EventImportResult] = Field(..., description="One result per VEVENT, in file order")
+
+
+class EventOccurrence(BaseModel):
+    event_id: UUID
+    name: str
+    start_datetime: datetime
+    end_datetime: datetime
+    timezone: str
+
+
+class TimeInterval(BaseModel):
+    start_datetime: datetime
+    end_datetime: datetime
+
+
+class FreeBusyRead(BaseModel):
+    busy: List[TimeInterval] = Field(..., description="Merged busy blocks within the window, in order")
+    free: List[TimeInterval] = Field(..., description="The first free slots of the requested duration")
@@ -0,0 +1,506 @@
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.week import MINUTES_PER_DAY, MINUTES_PER_WEEK, duration_minutes, minute_of_week, to_utc_naive
+from app.core.zones import ZoneSegment, local_to_utc, utc_offset, utc_to_local, zone_offsets, zone_segments
+from app.db.registry import DatabaseRegistry
+from app.models.event import Event, Weekday, weekdays_to_mask
+
+
+def week_slots(start: int, length: int) -> List[Tuple[int, int]]:
+    """Split a minute-of-week interval into pieces that don't wrap past Sunday midnight."""
+    end = start + length
+    if end <= MINUTES_PER_WEEK:
+        return [(start, end)]
+    return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)]
+
+
+def recurrence_slots(
+    start_datetime: datetime,
+    end_datetime: datetime,
+    days_of_week: Iterable[Weekday],
+) -> List[Tuple[int, int]]:
+    """Minute-of-week intervals occupied every week by a recurring event."""
+    time_of_day = minute_of_week(start_datetime) % MINUTES_PER_DAY
+    length = duration_minutes(start_datetime, end_datetime)
+    slots = []
+    for day in days_of_week:
+        slots.extend(week_slots(day.day_number * MINUTES_PER_DAY + time_of_day, length))
+    return slots
+
+
+def anchor_slots(start_datetime: datetime, end_datetime: datetime) -> List[Tuple[int, int]]:
+    """Minute-of-week intervals occupied by a single occurrence."""
+    return week_slots(minute_of_week(start_datetime), duration_minutes(start_datetime, end_datetime))
+
+
+def slots_mask(slots: Iterable[Tuple[int, int]]) -> int:
+    """Minute-of-week occupancy bitmap: bit ``m`` is set when minute ``m`` is busy.
+
+    A full week is 10,080 bits, so a Python int holds it in about 1.3 KB and
+    two footprints intersect exactly when their masks AND to non-zero.
+    """
+    mask = 0
+    for lo, hi in slots:
+        if hi > lo:
+            mask |= ((1 << (hi - lo)) - 1) << lo
+    return mask
+
+
+class _Node:
+    __slots__ = ("lo", "hi", "stamp", "key", "priority", "left", "right", "max_hi", "min_stamp", "max_stamp")
+
+    def __init__(self, lo, hi, stamp, key):
+        self.lo = lo
+        self.hi = hi
+        self.stamp = stamp
+        self.key = key
+        self.priority = random.random()
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.max_hi = hi
+        self.min_stamp = stamp
+        self.max_stamp = stamp
+
+    def update(self) -> None:
+        self.max_hi = self.hi
+        self.min_stamp = self.max_stamp = self.stamp
+        for child in (self.left, self.right):
+            if child is None:
+                continue
+            if child.max_hi > self.max_hi:
+                self.max_hi = child.max_hi
+            if child.min_stamp < self.min_stamp:
+                self.min_stamp = child.min_stamp
+            if child.max_stamp > self.max_stamp:
+                self.max_stamp = child.max_stamp
+
+
+class IntervalTree:
+    """Augmented treap of half-open intervals [lo, hi).
+
+    Nodes are ordered by ``lo`` and track the largest ``hi`` in their subtree,
+    so overlap queries prune any branch that ends before the query starts.
+    Each interval also carries a ``stamp`` (e.g. the event's start datetime);
+    subtrees keep their stamp range so queries restricted to a stamp window
+    skip whole branches too.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, lo: Any, hi: Any, stamp: Any = None, key: Any = None) -> None:
+        """Add [lo, hi); the stamp defaults to ``lo``."""
+        self._root = self._insert(self._root, _Node(lo, hi, lo if stamp is None else stamp, key))
+        self._size += 1
+
+    def _insert(self, root: Optional[_Node], node: _Node) -> _Node:
+        if root is None:
+            return node
+        if node.lo < root.lo:
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                root = self._rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                root = self._rotate_left(root)
+        root.update()
+        return root
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    def overlapping(
+        self,
+        lo: Any,
+        hi: Any,
+        min_stamp: Any = None,
+        max_stamp: Any = None,
+    ) -> Iterator[Tuple[Any, Any, Any, Any]]:
+        """Yield (lo, hi, stamp, key) for intervals overlapping [lo, hi).
+
+        Optionally restricted to intervals whose stamp lies in [min_stamp, max_stamp].
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_hi <= lo:
+                continue
+            if min_stamp is not None and node.max_stamp < min_stamp:
+                continue
+            if max_stamp is not None and node.min_stamp > max_stamp:
+                continue
+            stack.append(node.left)
+            if node.lo < hi:
+                stack.append(node.right)
+                if (
+                    node.hi > lo
+                    and (min_stamp is None or node.stamp >= min_stamp)
+                    and (max_stamp is None or node.stamp <= max_stamp)
+                ):
+                    yield node.lo, node.hi, node.stamp, node.key
+
+    @property
+    def max_stamp(self) -> Any:
+        """Largest stamp in the tree, or None when it's empty."""
+        return self._root.max_stamp if self._root else None
+
+    def overlaps(self, lo: Any, hi: Any, min_stamp: Any = None, max_stamp: Any = None) -> bool:
+        """Return True if any interval overlaps [lo, hi) within the stamp window."""
+        return next(self.overlapping(lo, hi, min_stamp, max_stamp), None) is not None
+
+
+class RecurringSeries:
+    """A weekly series evaluated in the wall-clock time of its own zone.
+
+    Occurrences repeat the anchor's local time of day on each of the rule's
+    local weekdays, from the day after the anchor onwards, so a 9:00 meeting
+    stays at 9:00 across DST changes. While the zone's UTC offset is constant
+    the series has a fixed UTC minute-of-week footprint, which lets it be
+    compared one offset segment at a time instead of week by week.
+    """
+
+    def __init__(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Iterable[Weekday],
+        timezone: str,
+    ) -> None:
+        self.start = to_utc_naive(start_datetime)
+        self.duration = to_utc_naive(end_datetime) - self.start
+        self.length = duration_minutes(self.start, to_utc_naive(end_datetime))
+        self.timezone = timezone
+        self.local_start = utc_to_local(timezone, self.start)
+        self.days_mask = weekdays_to_mask(days_of_week)
+        time_of_day = self.local_start.hour * 60 + self.local_start.minute
+        self.local_starts = [day.day_number * MINUTES_PER_DAY + time_of_day for day in days_of_week]
+        self._masks: Dict[int, int] = {}
+
+    @classmethod
+    def from_event(cls, event: Event) -> "RecurringSeries":
+        return cls(event.start_datetime, event.end_datetime, event.recurrence_rule.days_of_week, event.timezone)
+
+    def slots(self, offset: int) -> List[Tuple[int, int]]:
+        """UTC minute-of-week intervals occupied every week while the zone is at ``offset``."""
+        slots = []
+        for local_start in self.local_starts:
+            slots.extend(week_slots((local_start - offset) % MINUTES_PER_WEEK, self.length))
+        return slots
+
+    def mask(self, offset: int) -> int:
+        if offset not in self._masks:
+            self._masks[offset] = slots_mask(self.slots(offset))
+        return self._masks[offset]
+
+    def footprint_mask(self) -> int:
+        """Union of the series' weekly footprints under every offset its zone takes."""
+        mask = 0
+        for offset in self.offsets():
+            mask |= self.mask(offset)
+        return mask
+
+    def segments(self) -> Iterator[ZoneSegment]:
+        """Constant-offset segments of the zone from the start of the series onwards."""
+        return zone_segments(self.timezone, self.start)
+
+    def offsets(self) -> FrozenSet[int]:
+        """Every UTC offset the series' zone takes from its start onwards."""
+        return zone_offsets(self.timezone, self.start)
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """Yield the (start, end) of recurring occurrences overlapping [window_start, window_end), in order."""
+        # Start early enough to catch an occurrence still running into the window: a day for
+        # each day it lasts, begun or not, and one more for the UTC offset
+        lookback = timedelta(days=-(-self.duration // timedelta(days=1)) + 1)
+        day = max(
+            self.local_start.date() + timedelta(days=1),
+            utc_to_local(self.timezone, window_start).date() - lookback,
+        )
+        last_day = utc_to_local(self.timezone, window_end).date()
+        while day <= last_day:
+            if self.days_mask & (1 << day.weekday()):
+                start = local_to_utc(self.timezone, datetime.combine(day, self.local_start.time()))
+                if start < window_end and start + self.duration > window_start:
+                    yield start, start + self.duration
+            day += timedelta(days=1)
+
+    def overlaps(self, start_datetime: datetime, end_datetime: datetime) -> bool:
+        return next(self.occurrences(start_datetime, end_datetime), None) is not None
+
+    def overlaps_series(self, other: "RecurringSeries") -> bool:
+        """Return True if the two series ever have overlapping occurrences once both have started.
+
+        Walks the merged offset segments of both zones. Segments a week or
+        longer compare the full weekly footprints (memoized per offset pair);
+        shorter ones only the minutes of the week they cover.
+        """
+        ours, theirs = self.segments(), other.segments()
+        start = max(self.start, other.start)
+        ours_segment, theirs_segment = next(ours), next(theirs)
+        checked = set()
+        while True:
+            while ours_segment.end is not None and ours_segment.end <= start:
+                ours_segment = next(ours)
+            while theirs_segment.end is not None and theirs_segment.end <= start:
+                theirs_segment = next(theirs)
+            ends = [end for end in (ours_segment.end, theirs_segment.end) if end is not None]
+            end = min(ends) if ends else None
+
+            offsets = (ours_segment.offset, theirs_segment.offset)
+            overlap = self.mask(offsets[0]) & other.mask(offsets[1])
+            if end is None or end - start >= timedelta(weeks=1):
+                if offsets not in checked and overlap:
+                    return True
+                checked.add(offsets)
+            elif overlap & slots_mask(week_slots(minute_of_week(start), duration_minutes(start, end))):
+                return True
+
+            if end is None:
+                return False
+            start = end
+
+
+class ConflictCheck:
+    """The four conflict cases of one new event, decided one stored event at a time.
+
+    ConflictIndex finds its candidates with interval trees; the SQL path
+    loads them from the database. This applies the tests the trees make, as
+    bitmap intersections, and then the same RecurringSeries confirmation, so
+    the two paths give the same answers.
+    """
+
+    def __init__(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]] = None,
+        timezone: str = "UTC",
+    ) -> None:
+        self.start = to_utc_naive(start_datetime)
+        self.end = to_utc_naive(end_datetime)
+        self.anchor_mask = slots_mask(anchor_slots(self.start, self.end))
+        self.series = RecurringSeries(self.start, self.end, days_of_week, timezone) if days_of_week else None
+        self.series_mask = self.series.footprint_mask() if self.series else 0
+
+    def conflicts_with(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]] = None,
+        timezone: str = "UTC",
+    ) -> bool:
+        """Return True if the new event conflicts with a stored one."""
+        start = to_utc_naive(start_datetime)
+        end = to_utc_naive(end_datetime)
+
+        # Case 1: Anchor vs Anchor
+        if start < self.end and end > self.start:
+            return True
+
+        if days_of_week:
+            stored = RecurringSeries(start, end, days_of_week, timezone)
+            footprint = stored.footprint_mask()
+            # Case 2: Anchor vs Recurrence (series that started before this anchor)
+            if stored.start <= self.start and self.anchor_mask & footprint and stored.overlaps(self.start, self.end):
+                return True
+            # Case 4: Recurrence vs Recurrence
+            return bool(self.series and self.series_mask & footprint and self.series.overlaps_series(stored))
+
+        # Case 3: Recurrence vs Anchor, with the series' footprint at the offset in effect at the anchor
+        if self.series is None or start < self.series.start:
+            return False
+        offset = utc_offset(self.series.timezone, start)
+        return bool(slots_mask(anchor_slots(start, end)) & self.series.mask(offset))
+
+
+class ConflictIndex:
+    """Process-resident mirror of the event table used to answer conflict checks.
+
+    Mirrors the four cases of check_time_conflict:
+    - ``anchors``: absolute [start, end) of every event's anchor occurrence
+    - ``anchor_slots``: UTC minute-of-week footprint of one-off events, stamped with their start
+    - ``recurrence_slots``: weekly UTC minute-of-week footprint of recurring series under every
+      offset their zone takes, stamped with the series start
+    - ``recurrence_mask``: union of those footprints as a minute-of-week bitmap
+
+    Recurring series are compared in their zone's wall-clock time (see
+    RecurringSeries): the slot trees and bitmap find candidates, which are
+    then confirmed per offset segment. Minute-of-week intervals that run past
+    Sunday midnight are split, so events crossing midnight UTC compare
+    correctly. An occurrence that straddles a DST change is compared using the
+    offset in effect on the side being checked. ConflictCheck applies the
+    same rules to one stored event at a time.
+    """
+
+    def __init__(self) -> None:
+        self.anchors = IntervalTree()
+        self.anchor_slots = IntervalTree()
+        self.recurrence_slots = IntervalTree()
+        self.recurrence_mask = 0
+        self.series: Dict[Any, RecurringSeries] = {}
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.anchors)
+
+    def add(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]] = None,
+        key: Any = None,
+        timezone: str = "UTC",
+    ) -> None:
+        """Register a stored event with the index."""
+        start = to_utc_naive(start_datetime)
+        end = to_utc_naive(end_datetime)
+        with self.lock:
+            self.anchors.insert(start, end, key=key)
+            if days_of_week:
+                series = RecurringSeries(start, end, days_of_week, timezone)
+                # Keys only need to be unique for lookups; unkeyed series get a private one
+                series_key = key if key is not None else object()
+                self.series[series_key] = series
+                for offset in series.offsets():
+                    for lo, hi in series.slots(offset):
+                        self.recurrence_slots.insert(lo, hi, stamp=start, key=series_key)
+                    self.recurrence_mask |= series.mask(offset)
+            else:
+                for lo, hi in anchor_slots(start, end):
+                    self.anchor_slots.insert(lo, hi, stamp=start, key=key)
+
+    def add_event(self, event: Event) -> None:
+        days_of_week = event.recurrence_rule.days_of_week if event.recurrence_rule else None
+        self.add(event.start_datetime, event.end_datetime, days_of_week, key=event.id, timezone=event.timezone)
+
+    def _conflicts(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]],
+        timezone: str,
+    ) -> Iterator[Any]:
+        """Yield the keys of conflicting events case by case; keys may repeat."""
+        start = to_utc_naive(start_datetime)
+        end = to_utc_naive(end_datetime)
+
+        # Case 1: Anchor vs Anchor
+        for *_, key in self.anchors.overlapping(start, end):
+            yield key
+
+        # Case 2: Anchor vs Recurrence (series that started before this anchor)
+        # The bitmap rules out most anchors; candidates are confirmed against their actual occurrences
+        slots = anchor_slots(start, end)
+        if slots_mask(slots) & self.recurrence_mask:
+            candidates = {
+                key for lo, hi in slots for *_, key in self.recurrence_slots.overlapping(lo, hi, max_stamp=start)
+            }
+            for key in candidates:
+                if self.series[key].overlaps(start, end):
+                    yield key
+
+        if not days_of_week:
+            return
+
+        series = RecurringSeries(start, end, days_of_week, timezone)
+
+        # Case 4: Recurrence vs Recurrence
+        slots = [slot for offset in series.offsets() for slot in series.slots(offset)]
+        if slots_mask(slots) & self.recurrence_mask:
+            candidates = {key for lo, hi in slots for *_, key in self.recurrence_slots.overlapping(lo, hi)}
+            for key in candidates:
+                if series.overlaps_series(self.series[key]):
+                    yield key
+
+        # Case 3: Recurrence vs Anchor (one-off events on or after the series start),
+        # one offset segment at a time up to the last stored anchor
+        last_anchor = self.anchor_slots.max_stamp
+        for segment in series.segments():
+            if last_anchor is None or segment.start > last_anchor:
+                break
+            max_stamp = segment.end - timedelta(microseconds=1) if segment.end else None
+            for lo, hi in series.slots(segment.offset):
+                for *_, key in self.anchor_slots.overlapping(lo, hi, min_stamp=segment.start, max_stamp=max_stamp):
+                    yield key
+
+    def has_conflict(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]] = None,
+        timezone: str = "UTC",
+    ) -> bool:
+        """Index-backed equivalent of the four SQL conflict checks, in wall-clock time."""
+        with self.lock:
+            # Keys may be None for unkeyed events, so any yielded key counts
+            for _ in self._conflicts(start_datetime, end_datetime, days_of_week, timezone):
+                return True
+            return False
+
+    def conflicting_keys(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        days_of_week: Optional[List[Weekday]] = None,
+        timezone: str = "UTC",
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """Return the keys of the stored events that conflict, in case order, up to ``limit``."""
+        keys = {}  # Insertion-ordered set; an event can match several slots and cases
+        with self.lock:
+            for key in self._conflicts(start_datetime, end_datetime, days_of_week, timezone):
+                keys[key] = None
+                if limit is not None and len(keys) >= limit:
+                    break
+        return list(keys)
+
+    @classmethod
+    def build(cls, db: Session) -> "ConflictIndex":
+        """Load every stored event into a fresh index."""
+        index = cls()
+        for event in db.query(Event).options(joinedload(Event.recurrence_rule)):
+            index.add_event(event)
+        return index
+
+
+_indexes: DatabaseRegistry[ConflictIndex] = DatabaseRegistry()
+
+
+def get_conflict_index(db: Session) -> ConflictIndex:
+    """Return the conflict index for the session's database, building it on first use."""
+    index = _indexes.get(db.get_bind())
+    if index is None:
+        # Build without holding the registry lock: under run_sync the queries yield to the
+        # event loop, and another coroutine on the same thread would block on the lock forever
+        index = _indexes.setdefault(db.get_bind(), ConflictIndex.build(db))
+    return index
+
+
+def reset_conflict_index(db: Session) -> None:
+    """Drop the cached index so the next lookup rebuilds it from the database."""
+    _indexes.pop(db.get_bind())
@@ -1,246 +1,477 @@
-from datetime import datetime
-from typing import List, Optional
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import Integer, and_, case, cast, func, or_, text
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, and_, func, insert, literal_column, or_, select, tuple_, union, union_all
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.event import Event, RecurrenceRule, Weekday
+from app.core.config import settings
+from app.core.slow_queries import tag_query
+from app.core.week import MINUTES_PER_WEEK, to_utc_naive
+from app.models.event import Event, RecurrenceRule, Weekday, mask_to_weekdays, weekdays_to_mask
 from app.schemas.event import EventCreate
-
-
-def get_time_overlap_conditions(
-    start_datetime: datetime,
-    end_datetime: datetime,
+from app.services.conflict_index import (
+    ConflictCheck,
+    ConflictIndex,
+    RecurringSeries,
+    get_conflict_index,
+    reset_conflict_index,
+)
+from app.services.event_cache import bump_data_version
+from app.services.reservations import Reservation, reservation_buckets, reserve_slots
+
+CONFLICT_DETAIL = "This time slot conflicts with an existing event"
+# Maximum number of conflicting events listed in a 409 response
+CONFLICT_LIMIT = 10
+# Sorts below every generated id
+NIL_UUID = UUID(int=0)
+
+# What an EventRead needs, read by list routes that serialize rows without the ORM
+EVENT_READ_COLUMNS = (
+    Event.id,
+    Event.name,
+    Event.start_datetime,
+    Event.end_datetime,
+    Event.timezone,
+    RecurrenceRule.id.label("recurrence_rule_id"),
+    RecurrenceRule.days_mask,
+)
+
+# What confirm_conflicts needs to check a candidate event with ConflictCheck
+CONFLICT_CANDIDATE_COLUMNS = (
+    Event.id,
+    Event.name,
+    Event.start_datetime,
+    Event.end_datetime,
+    Event.timezone,
+    RecurrenceRule.days_mask,
+)
+
+
+class ConflictingEvent(NamedTuple):
+    """An event accepted earlier in the same batch, shaped like a get_conflicting_events row."""
+
+    id: UUID
+    name: str
+
+
+# What a rejected event conflicts with: get_conflicting_events rows, or ConflictingEvents within a batch
+Conflicts = List[Union[Row, ConflictingEvent]]
+
+
+def get_week_window_conditions(
+    start_minute: int,
+    end_minute: int,
 ):
-    """Returns SQLAlchemy filter conditions for checking time overlaps.
+    """Returns SQLAlchemy filter conditions for anchors overlapping a minute-of-week window.
+
+    Anchors are compared by their UTC minute-of-week columns, and an anchor
+    that runs past Sunday midnight also covers the start of the week. No
+    anchor starts more than the longest event's length before the window, so
+    each branch is a range over the (weekday, start_minute_of_week) index,
+    probed once per weekday.
 
     Args:
-        start_datetime: Start time to check
-        end_datetime: End time to check
+        start_minute: Window start, in minutes since Monday 00:00
+        end_minute: Window end, at most the end of the week
 
     Returns:
-        SQLAlchemy OR condition containing all overlap cases
-
-    Bug: Edge case around daylights savings, since the time is stored in UTC, and the timezone is not considered.
-    Bug: Edge case around casting time to minutes, since it doesn't consider the timezone,
-         if UTC time crosses into the next day, it resets to 0.
+        SQLAlchemy OR condition with one indexable branch per week the anchor may fall in
     """
-
-    # Convert datetime to minutes since midnight for comparison
-    def to_minutes(dt: datetime) -> int:
-        return dt.hour * 60 + dt.minute
-
-    start_minutes = to_minutes(start_datetime)
-    end_minutes = to_minutes(end_datetime)
-
-    # Base time expressions
-    event_start = (
-        "(CAST(STRFTIME('%H', event.start_datetime) AS INTEGER) * 60 + "
-        "CAST(STRFTIME('%M', event.start_datetime) AS INTEGER))"
-    )
-    event_end = (
-        "(CAST(STRFTIME('%H', event.end_datetime) AS INTEGER) * 60 + "
-        "CAST(STRFTIME('%M', event.end_datetime) AS INTEGER))"
+    longest = get_longest_event_query().scalar_subquery()
+    return or_(
+        *[
+            and_(
+                # Lets the range on start_minute_of_week use the weekday-led index
+                Event.weekday.in_(range(7)),
+                Event.start_minute_of_week > start_minute + shift - longest,
+                Event.start_minute_of_week < end_minute + shift,
+                Event.end_minute_of_week > start_minute + shift,
+            )
+            for shift in (0, MINUTES_PER_WEEK)
+        ]
     )
 
-    overlap_conditions = f"""
-    (
-        ({event_start} >= {start_minutes} AND {event_start} < {end_minutes}) OR
-        ({event_end} > {start_minutes} AND {event_end} <= {end_minutes}) OR
-        ({event_start} <= {start_minutes} AND {event_end} >= {end_minutes})
-    )
-    """
-    return text(overlap_conditions)
 
-
-def check_anchor_x_anchor_conflict(
-    db: Session,
+def get_anchor_x_anchor_query(
     start_datetime: datetime,
     end_datetime: datetime,
-) -> bool:
-    """Check if a new event's anchor datetime conflicts with any existing events' anchor datetimes.
+) -> Select:
+    """Returns a query for existing events whose anchor datetimes overlap a new event's anchor.
 
-    Checks three overlap conditions:
-    1. An existing event starts during our event
-    2. An existing event ends during our event
-    3. An existing event completely surrounds our event
+    Intervals are half-open: an existing event overlaps if it starts before our
+    event ends and ends after our event starts. This covers events starting
+    during, ending during, or surrounding our event.
 
     Args:
-        db: Database session
         start_datetime: Start time of new event
         end_datetime: End time of new event
 
     Returns:
-        bool: True if there's a conflict, False otherwise
+        SELECT of CONFLICT_CANDIDATE_COLUMNS for the conflicting events
     """
-    existing_events = (
-        db.query(Event)
-        .filter(
-            or_(
-                # Case 1: Event starts during our event
-                and_(
-                    Event.start_datetime >= start_datetime,
-                    Event.start_datetime < end_datetime,
-                ),
-                # Case 2: Event ends during our event
-                and_(
-                    Event.end_datetime > start_datetime,
-                    Event.end_datetime <= end_datetime,
-                ),
-                # Case 3: Event completely surrounds our event
-                and_(
-                    Event.start_datetime <= start_datetime,
-                    Event.end_datetime >= end_datetime,
-                ),
-            )
+    return (
+        select(*CONFLICT_CANDIDATE_COLUMNS)
+        .outerjoin(Event.recurrence_rule)
+        .where(
+            Event.start_datetime < to_utc_naive(end_datetime),
+            Event.end_datetime > to_utc_naive(start_datetime),
         )
-        .all()
     )
 
-    return len(existing_events) > 0
 
+def get_anchor_x_recurrence_query(start_datetime: datetime) -> Select:
+    """Returns a query for the recurring events that could conflict with a new event's anchor.
 
-def check_anchor_x_recurrence_conflict(
-    db: Session,
-    start_datetime: datetime,
-    end_datetime: datetime,
-) -> bool:
-    """Check if a new event's anchor datetime conflicts with recurring events."""
-    # Get the weekday of the start datetime
-    weekday = Weekday[start_datetime.strftime("%A").upper()]
-
-    # Find recurring events that happen on this weekday
-    existing_events = (
-        db.query(Event)
-        .join(RecurrenceRule)
-        .filter(
-            Event.recurrence_rule_id.isnot(None),
-            text(f"recurrence_rule.days_of_week LIKE '%{weekday.value}%'"),
-            Event.start_datetime <= start_datetime,
-            get_time_overlap_conditions(start_datetime, end_datetime),
+    Only series that started by the anchor's start can; which of them do
+    depends on their zone's offsets, so that is left to the confirmation.
+    """
+    # A range implies IS NOT NULL, so it seeks the partial index even on a database that was never ANALYZEd
+    return (
+        select(*CONFLICT_CANDIDATE_COLUMNS)
+        .join(Event.recurrence_rule)
+        .where(Event.recurrence_rule_id > NIL_UUID, Event.start_datetime <= to_utc_naive(start_datetime))
+    )
+
+
+def get_recurrence_x_anchor_query(series: RecurringSeries) -> Select:
+    """Returns a query for existing one-off events that a new recurring series could conflict with.
+
+    Covers the series' UTC footprint under every offset its zone takes, which
+    includes the footprint of whichever offset is in effect at each anchor.
+    """
+    slots = [slot for offset in series.offsets() for slot in series.slots(offset)]
+    return (
+        select(*CONFLICT_CANDIDATE_COLUMNS)
+        .outerjoin(Event.recurrence_rule)
+        .where(
+            Event.recurrence_rule_id.is_(None),
+            Event.start_datetime >= series.start,
+            or_(*[get_week_window_conditions(lo, hi) for lo, hi in slots]),
         )
     )
 
-    existing_events = existing_events.all()
 
-    return len(existing_events) > 0
+def get_recurrence_x_recurrence_query() -> Select:
+    """Returns a query for the recurring events that could conflict with a new recurring series.
 
+    Series never end, so the stored ones have disjoint weekly footprints and
+    there are never more of them than fit in a week.
+    """
+    return select(*CONFLICT_CANDIDATE_COLUMNS).join(Event.recurrence_rule).where(Event.recurrence_rule_id > NIL_UUID)
 
-def check_recurrence_x_anchor_conflict(
-    db: Session,
+
+def get_conflict_queries(
     start_datetime: datetime,
     end_datetime: datetime,
-    days_of_week: List[Weekday],
-) -> bool:
-    """Check if a new recurring event conflicts with existing anchor events."""
-    weekday_values = [day.value for day in days_of_week]
+    timezone: str,
+    days_of_week: Optional[List[Weekday]] = None,
+) -> List[Select]:
+    """Returns the candidate query of each case that applies to a new event.
 
-    # Create SQLAlchemy weekday check using the CASE statement we developed
-    weekday_check = case(
-        {0: "SUNDAY", 1: "MONDAY", 2: "TUESDAY", 3: "WEDNESDAY", 4: "THURSDAY", 5: "FRIDAY", 6: "SATURDAY"},
-        value=cast(func.strftime("%w", Event.start_datetime), Integer),
-    )
+    Every event is composed of an anchor event (the initial event),
+    and a potential recurrence rule defining future events.
 
-    # Find non-recurring events that happen on any of our weekdays
-    existing_events = db.query(Event).filter(
-        Event.recurrence_rule_id.is_(None),
-        Event.start_datetime >= start_datetime,
-        weekday_check.in_(weekday_values),
-        get_time_overlap_conditions(start_datetime, end_datetime),
-    )
+    The initial event may exist outside the rule for recurring events.
+    E.g. A 3-hour event Monday, then repeats every Tuesday;
+    in which case there is a single Monday anchor event,
+    followed by infinite Tuesday events.
 
-    existing_events = existing_events.all()
+    This creates 4 cases to check for conflicts:
 
-    return len(existing_events) > 0
+    Checks:
+    1. Anchor vs Anchor
+    2. Anchor vs Recurrence
+    3. Recurrence vs Anchor (recurring events only)
+    4. Recurrence vs Recurrence (recurring events only)
+
+    Recurring events keep their local time of day across DST changes (see
+    RecurringSeries), which SQL can't follow, so each query returns a
+    superset of the events that conflict; confirm_conflicts decides. Each
+    query is tagged with its case, which the slow query log reports.
+    """
+    queries = [
+        tag_query(get_anchor_x_anchor_query(start_datetime, end_datetime), "conflict.anchor_x_anchor"),
+        tag_query(get_anchor_x_recurrence_query(start_datetime), "conflict.anchor_x_recurrence"),
+    ]
+    if days_of_week:
+        series = RecurringSeries(start_datetime, end_datetime, days_of_week, timezone)
+        queries.append(tag_query(get_recurrence_x_anchor_query(series), "conflict.recurrence_x_anchor"))
+        queries.append(tag_query(get_recurrence_x_recurrence_query(), "conflict.recurrence_x_recurrence"))
+    return queries
+
+
+def confirm_conflicts(
+    candidates: Iterable[Row],
+    start_datetime: datetime,
+    end_datetime: datetime,
+    timezone: str,
+    days_of_week: Optional[List[Weekday]] = None,
+    limit: Optional[int] = CONFLICT_LIMIT,
+) -> List[Row]:
+    """Pick the candidate rows a new event actually conflicts with, by the conflict index's rules."""
+    check = ConflictCheck(start_datetime, end_datetime, days_of_week, timezone)
+    conflicts = []
+    for row in candidates:
+        days = mask_to_weekdays(row.days_mask) if row.days_mask else None
+        if check.conflicts_with(row.start_datetime, row.end_datetime, days, row.timezone):
+            conflicts.append(row)
+            if limit is not None and len(conflicts) >= limit:
+                break
+    return conflicts
 
 
-def check_recurrence_x_recurrence_conflict(
+def check_time_conflict(
     db: Session,
     start_datetime: datetime,
     end_datetime: datetime,
-    days_of_week: List[Weekday],
+    timezone: str,
+    days_of_week: Optional[List[Weekday]] = None,
 ) -> bool:
-    """Check if a new recurring event conflicts with existing recurring events."""
-    # Convert weekdays to their string values for SQL comparison
-    weekday_values = [day.value for day in days_of_week]
-
-    # Find recurring events that happen on any of our weekdays
-    existing_events = (
-        db.query(Event)
-        .join(RecurrenceRule)
-        .filter(
-            Event.recurrence_rule_id.isnot(None),
-            or_(*[text(f"recurrence_rule.days_of_week LIKE '%{day}%'") for day in weekday_values]),
-            get_time_overlap_conditions(start_datetime, end_datetime),
-        )
-    )
-
-    existing_events = existing_events.all()
+    """Check all possible conflict cases (see get_conflict_queries).
 
-    return len(existing_events) > 0
+    When CONFLICT_INDEX_ENABLED is set the cases are answered by the
+    in-memory conflict index instead of querying the database. Both give
+    the same answer.
+    """
+    if settings.CONFLICT_INDEX_ENABLED:
+        return get_conflict_index(db).has_conflict(start_datetime, end_datetime, days_of_week, timezone)
+    return bool(get_conflicting_events(db, start_datetime, end_datetime, timezone, days_of_week, limit=1))
 
 
-def check_time_conflict(
+def get_conflicting_events(
     db: Session,
     start_datetime: datetime,
     end_datetime: datetime,
     timezone: str,
     days_of_week: Optional[List[Weekday]] = None,
-) -> bool:
-    """Orchestrating function to check all possible conflict cases.
+    limit: int = CONFLICT_LIMIT,
+) -> List[Row]:
+    """Get the events a new event would conflict with.
 
-    Every event is composed of an anchor event (the initial event),
-    and a potential recurrence rule defining future events.
+    Without the conflict index the candidates of every case come from a
+    single UNION and are confirmed with confirm_conflicts. With it, the index
+    finds the ids and names are only loaded when there are any.
 
-    The initial event may exist outside the rule for recurring events.
-    E.g. A 3-hour event Monday, then repeats every Tuesday;
-    in which case there is a single Monday anchor event,
-    followed by infinite Tuesday events.
+    Args:
+        db: Database session
+        start_datetime: Start time of new event
+        end_datetime: End time of new event
+        timezone: Timezone of new event
+        days_of_week: Days the new event recurs on, if any
+        limit: Maximum number of conflicting events to return
 
-    This creates 4 cases to check for conflicts:
+    Returns:
+        List of rows with an id and name; empty if there's no conflict
+    """
+    if settings.CONFLICT_INDEX_ENABLED:
+        ids = get_conflict_index(db).conflicting_keys(start_datetime, end_datetime, days_of_week, timezone, limit=limit)
+        if not ids:
+            return []
+        rows = {row.id: row for row in db.execute(select(Event.id, Event.name).where(Event.id.in_(ids)))}
+        return [rows[event_id] for event_id in ids if event_id in rows]
+
+    queries = get_conflict_queries(start_datetime, end_datetime, timezone, days_of_week)
+    candidates = db.execute(union(*queries))
+    return confirm_conflicts(candidates, start_datetime, end_datetime, timezone, days_of_week, limit)
+
+
+def conflict_error(conflicts: Conflicts) -> HTTPException:
+    """Build the 409 raised when a new event conflicts with ``conflicts``."""
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": CONFLICT_DETAIL,
+            "conflicts": [{"id": str(conflict.id), "name": conflict.name} for conflict in conflicts],
+        },
+    )
 
-    Checks:
-    1. Anchor vs Anchor
-    2. Anchor vs Recurrence
-    3. Recurrence vs Anchor
-    4. Recurrence vs Recurrence
+
+def encode_cursor(event: Event) -> str:
+    """Encode an event's position in (start_datetime, id) order as an opaque cursor."""
+    raw = f"{to_utc_naive(event.start_datetime).isoformat()}|{event.id.hex}"
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    # Case 1: Check anchor-to-anchor conflicts
-    if check_anchor_x_anchor_conflict(db, start_datetime, end_datetime):
-        return True
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, event_id = raw.split("|")
+        return datetime.fromisoformat(start), UUID(hex=event_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, skip: int, limit: int, cursor: Optional[str]):
+    """Apply (start_datetime, id) ordering, a cursor and skip/limit to an event query or select."""
+    if cursor is not None:
+        start_datetime, event_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Event.start_datetime, Event.id) > tuple_(start_datetime, event_id))
+    return query.order_by(Event.start_datetime, Event.id).offset(skip).limit(limit)
+
+
+def get_longest_event_query() -> Select:
+    """Returns a query for the whole-minute length of the longest anchor, answered from ix_event_length_minutes."""
+    return select(func.max(Event.end_minute_of_week - Event.start_minute_of_week))
 
-    # Case 2: Check anchor-to-recurrence conflicts
-    if check_anchor_x_recurrence_conflict(db, start_datetime, end_datetime):
-        return True
 
-    # Case 3: Check recurrence-to-anchor conflicts
-    if days_of_week and check_recurrence_x_anchor_conflict(db, start_datetime, end_datetime, days_of_week):
-        return True
+def get_window_conditions(
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    longest_event_minutes: Optional[int],
+):
+    """Returns SQLAlchemy filter conditions for events active in a time window.
+
+    An event is active if its anchor overlaps the window, or if it recurs and
+    the series has started by the end of the window (series don't end).
+    Anchors can't start more than the longest event's length before the
+    window, which bounds them to a range over the covering
+    ix_event_start_datetime_end_datetime index; recurring events are a range
+    over ix_event_recurrence_rule_id_start_datetime. Only the row ids of the
+    two ranges are collected before rows are read. Either bound may be left
+    out to leave that side of the window open.
 
-    # Case 4: Check recurrence-to-recurrence conflicts
-    if days_of_week and check_recurrence_x_recurrence_conflict(db, start_datetime, end_datetime, days_of_week):
-        return True
+    Args:
+        window_start: Start of the window, or None
+        window_end: End of the window, or None
+        longest_event_minutes: Result of get_longest_event_query
+
+    Returns:
+        SQLAlchemy condition, or None if neither bound is given
 
-    return False
+    Raises:
+        HTTPException: If the window ends before it starts
+    """
+    if window_start is None and window_end is None:
+        return None
+
+    anchor_conditions = []
+    # A range implies IS NOT NULL, so it seeks the partial index even on a database that was never ANALYZEd
+    recurring_conditions = [Event.recurrence_rule_id > NIL_UUID]
+    if window_start is not None:
+        window_start = to_utc_naive(window_start)
+        anchor_conditions.append(Event.end_datetime > window_start)
+        if longest_event_minutes is not None:
+            # Lengths are truncated to whole minutes, so allow one more
+            earliest_start = window_start - timedelta(minutes=longest_event_minutes + 1)
+            anchor_conditions.append(Event.start_datetime > earliest_start)
+    if window_end is not None:
+        window_end = to_utc_naive(window_end)
+        anchor_conditions.append(Event.start_datetime < window_end)
+        recurring_conditions.append(Event.start_datetime < window_end)
+    if window_start is not None and window_end is not None and window_end <= window_start:
+        raise HTTPException(status_code=400, detail="Window must end after it starts")
+
+    # rowid can be read straight from either index, where the id would cost a table lookup per row
+    rowid = literal_column("event.rowid")
+    anchors = select(rowid).select_from(Event).where(*anchor_conditions).correlate(None)
+    recurring = select(rowid).select_from(Event).where(*recurring_conditions).correlate(None)
+    return rowid.in_(union_all(anchors, recurring))
+
+
+def get_window(
+    db: Session,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+):
+    """Look up the longest event if a window needs it, and return get_window_conditions."""
+    longest_event_minutes = db.scalar(get_longest_event_query()) if window_start is not None else None
+    return get_window_conditions(window_start, window_end, longest_event_minutes)
 
 
 def get_events(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
 ) -> List[Event]:
     """Get a list of events with pagination.
 
+    Events are ordered by (start_datetime, id). Passing the cursor of the last
+    event on a page seeks straight to the next page through the
+    ix_event_start_datetime_id index instead of skipping rows. Recurrence rules
+    are loaded with one extra SELECT for the page, not one per event.
+
     Args:
         db: Database session
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Cursor from encode_cursor; only events after it are returned
+        window_start: Only return events active from this time on (see get_window_conditions)
+        window_end: Only return events active before this time
 
     Returns:
         List of events
+
+    Raises:
+        HTTPException: If the window ends before it starts
+    """
+    query = db.query(Event).options(selectinload(Event.recurrence_rule))
+    window = get_window(db, window_start, window_end)
+    if window is not None:
+        query = query.filter(window)
+    return paginate(query, skip, limit, cursor).all()
+
+
+def get_event_rows_query(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, window=None) -> Select:
+    """Build the query behind get_event_rows, optionally filtered by get_window_conditions."""
+    query = select(*EVENT_READ_COLUMNS).outerjoin(Event.recurrence_rule)
+    if window is not None:
+        query = query.where(window)
+    return paginate(query, skip, limit, cursor)
+
+
+def get_event_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+) -> List[Row]:
+    """Like get_events, but return plain rows of EVENT_READ_COLUMNS for read-only serialization.
+
+    Rows skip the ORM's identity map and attribute instrumentation, and the
+    recurrence rule comes from the same query instead of a lazy load per event.
     """
-    return db.query(Event).order_by(Event.start_datetime).offset(skip).limit(limit).all()
+    window = get_window(db, window_start, window_end)
+    return list(db.execute(get_event_rows_query(skip, limit, cursor, window)))
+
+
+def export_events(
+    db: Session,
+    batch_size: int = 500,
+) -> Iterator[Event]:
+    """Iterate over every event in (start_datetime, id) order without loading them all.
+
+    Rows are fetched from an open cursor in batches of ``batch_size`` (yield_per),
+    with recurrence rules loaded per batch, so memory stays flat regardless of
+    table size. The iteration uses its own session on the same database, so it
+    can outlive the request's session while a response is being streamed.
+
+    Args:
+        db: Database session whose database should be exported
+        batch_size: Number of rows fetched per round trip
+
+    Returns:
+        Iterator of events
+    """
+    with Session(bind=db.get_bind()) as export_db:
+        yield from export_db.scalars(
+            select(Event)
+            .options(selectinload(Event.recurrence_rule))
+            .order_by(Event.start_datetime, Event.id)
+            .execution_options(yield_per=batch_size)
+        )
 
 
 def create_event(
@@ -259,37 +490,190 @@ def create_event(
     Raises:
         HTTPException: If there's a time conflict with existing events
     """
-    # Check for time conflicts
-    if check_time_conflict(
-        db=db,
-        start_datetime=event.start_datetime,
-        end_datetime=event.end_datetime,
-        timezone=event.timezone,
-        days_of_week=event.days_of_week,
-    ):
-        raise HTTPException(
-            status_code=409,
-            detail="This time slot conflicts with an existing event",
+    buckets = reservation_buckets(event.start_datetime, event.end_datetime, event.timezone, event.days_of_week)
+    # Concurrent creates that could conflict take turns from the check until the
+    # index is updated; the rest go ahead in parallel
+    with reserve_slots(db, buckets) as reservation:
+        claim_slots(db, reservation, event)
+
+        # Create recurrence rule if days are specified
+        recurrence_rule = None
+        if event.days_of_week:
+            recurrence_rule = RecurrenceRule(days_of_week=event.days_of_week)
+            db.add(recurrence_rule)
+            db.flush()  # Get the ID without committing
+
+        # Create the event
+        db_event = Event(
+            name=event.name,
+            start_datetime=event.start_datetime,
+            end_datetime=event.end_datetime,
+            timezone=event.timezone,
+            recurrence_rule_id=recurrence_rule.id if recurrence_rule else None,
         )
 
-    # Create recurrence rule if days are specified
-    recurrence_rule = None
-    if event.days_of_week:
-        recurrence_rule = RecurrenceRule(days_of_week=event.days_of_week)
-        db.add(recurrence_rule)
-        db.flush()  # Get the ID without committing
-
-    # Create the event
-    db_event = Event(
-        name=event.name,
-        start_datetime=event.start_datetime,
-        end_datetime=event.end_datetime,
-        timezone=event.timezone,
-        recurrence_rule_id=recurrence_rule.id if recurrence_rule else None,
+        db.add(db_event)
+        db.commit()
+        bump_data_version(db)
+        reservation.committed(db)
+        db.refresh(db_event)
+
+        if settings.CONFLICT_INDEX_ENABLED:
+            get_conflict_index(db).add_event(db_event)
+
+    return db_event
+
+
+def claim_slots(db: Session, reservation: Reservation, event: EventCreate) -> None:
+    """Check a new event for conflicts and claim its reservation buckets.
+
+    If another process wrote into the buckets after the check, its events
+    aren't in this process's conflict index, so the index is rebuilt from the
+    database and the check repeated until the claim succeeds.
+
+    Raises:
+        HTTPException: If there's a time conflict with existing events
+    """
+    while True:
+        conflicts = get_conflicting_events(
+            db=db,
+            start_datetime=event.start_datetime,
+            end_datetime=event.end_datetime,
+            timezone=event.timezone,
+            days_of_week=event.days_of_week,
+        )
+        if conflicts:
+            raise conflict_error(conflicts)
+        if reservation.claim(db):
+            return
+        reset_conflict_index(db)
+
+
+def create_events_with_conflicts(
+    db: Session,
+    events: List[EventCreate],
+) -> List[Union[Event, Conflicts]]:
+    """Create many events in a single transaction.
+
+    Each event is checked against the database and against the events accepted
+    before it in the same batch, so the outcome matches posting them one by one
+    in order. Accepted events are written with one bulk insert per table and a
+    single commit. The batch holds the reservation buckets of all its events.
+
+    Args:
+        db: Database session
+        events: Events to create, in priority order
+
+    Returns:
+        The created event for each input, or where it conflicted the events it
+        conflicts with, as for get_conflicting_events
+    """
+    buckets = frozenset().union(
+        *(reservation_buckets(e.start_datetime, e.end_datetime, e.timezone, e.days_of_week) for e in events)
     )
+    with reserve_slots(db, buckets) as reservation:
+        # As in claim_slots: if another process wrote into the buckets meanwhile, plan again on a rebuilt index
+        while True:
+            rule_rows, event_rows, outcomes = plan_batch(db, events)
+            if not event_rows:
+                return outcomes
+            if reservation.claim(db):
+                break
+            reset_conflict_index(db)
+
+        outcomes = insert_batch(db, rule_rows, event_rows, outcomes)
+        reservation.committed(db)
+        return outcomes
+
+
+def plan_batch(
+    db: Session,
+    events: List[EventCreate],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Union[UUID, Conflicts]]]:
+    """Pick the events of a batch that can be created, in order.
 
-    db.add(db_event)
+    Returns:
+        Recurrence rule rows and event rows to insert, and for each input
+        either its new event id or the events it conflicts with
+    """
+    batch_index = ConflictIndex()
+    accepted: Dict[UUID, ConflictingEvent] = {}
+    rule_rows = []
+    event_rows = []
+    outcomes = []
+
+    for event in events:
+        conflicts = get_conflicting_events(
+            db=db,
+            start_datetime=event.start_datetime,
+            end_datetime=event.end_datetime,
+            timezone=event.timezone,
+            days_of_week=event.days_of_week,
+        )
+        if not conflicts:
+            keys = batch_index.conflicting_keys(
+                event.start_datetime, event.end_datetime, event.days_of_week, event.timezone, limit=CONFLICT_LIMIT
+            )
+            conflicts = [accepted[key] for key in keys]
+        if conflicts:
+            outcomes.append(conflicts)
+            continue
+
+        event_id = uuid4()
+        batch_index.add(
+            event.start_datetime, event.end_datetime, event.days_of_week, key=event_id, timezone=event.timezone
+        )
+        accepted[event_id] = ConflictingEvent(event_id, event.name)
+
+        recurrence_rule_id = None
+        if event.days_of_week:
+            recurrence_rule_id = uuid4()
+            rule_rows.append(
+                {
+                    "id": recurrence_rule_id,
+                    "days_mask": weekdays_to_mask(event.days_of_week),
+                    "_days_of_week_json": event.days_of_week,
+                }
+            )
+
+        event_rows.append(
+            {
+                "id": event_id,
+                "name": event.name,
+                "start_datetime": event.start_datetime,
+                "end_datetime": event.end_datetime,
+                "timezone": event.timezone,
+                "recurrence_rule_id": recurrence_rule_id,
+            }
+        )
+        outcomes.append(event_id)
+
+    return rule_rows, event_rows, outcomes
+
+
+def insert_batch(
+    db: Session,
+    rule_rows: List[Dict[str, Any]],
+    event_rows: List[Dict[str, Any]],
+    outcomes: List[Union[UUID, Conflicts]],
+) -> List[Union[Event, Conflicts]]:
+    """Write a planned batch in one commit and add it to the conflict index."""
+    if rule_rows:
+        db.execute(insert(RecurrenceRule), rule_rows)
+    db.execute(insert(Event), event_rows)
     db.commit()
-    db.refresh(db_event)
+    bump_data_version(db)
 
-    return db_event
+    created = {
+        db_event.id: db_event
+        for db_event in db.query(Event)
+        .options(selectinload(Event.recurrence_rule))
+        .filter(Event.id.in_([row["id"] for row in event_rows]))
+    }
+
+    if settings.CONFLICT_INDEX_ENABLED:
+        index = get_conflict_index(db)
+        for db_event in created.values():
+            index.add_event(db_event)
+
+    return [created[outcome] if isinstance(outcome, UUID) else outcome for outcome in outcomes]
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.event import Event, RecurrenceRule
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+from app.services.conflict_index import get_conflict_index
+from app.services.event_cache import bump_data_version
+from app.services.reservations import reservation_buckets, reserve_slots_async
+
+
+async def get_window(
+    db: AsyncSession,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+):
+    """Async version of event_service.get_window."""
+    longest_event_minutes = (
+        await db.scalar(event_service.get_longest_event_query()) if window_start is not None else None
+    )
+    return event_service.get_window_conditions(window_start, window_end, longest_event_minutes)
+
+
+async def get_event_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+) -> List[Row]:
+    """Async version of event_service.get_event_rows."""
+    window = await get_window(db, window_start, window_end)
+    return list(await db.execute(event_service.get_event_rows_query(skip, limit, cursor, window)))
+
+
+async def create_event(
+    db: AsyncSession,
+    event: EventCreate,
+) -> Event:
+    """Async version of event_service.create_event.
+
+    Raises:
+        HTTPException: If there's a time conflict with existing events
+    """
+    buckets = reservation_buckets(event.start_datetime, event.end_datetime, event.timezone, event.days_of_week)
+    async with reserve_slots_async(db, buckets) as reservation:
+        await db.run_sync(event_service.claim_slots, reservation, event)
+
+        # Assign the relationship directly so it's loaded when the response is built;
+        # lazy loading isn't available on an AsyncSession
+        db_event = Event(
+            name=event.name,
+            start_datetime=event.start_datetime,
+            end_datetime=event.end_datetime,
+            timezone=event.timezone,
+            recurrence_rule=RecurrenceRule(days_of_week=event.days_of_week) if event.days_of_week else None,
+        )
+
+        db.add(db_event)
+        await db.commit()
+        bump_data_version(db)
+        reservation.committed(db)
+
+        if settings.CONFLICT_INDEX_ENABLED:
+            await db.run_sync(lambda sync_db: get_conflict_index(sync_db).add_event(db_event))
+
+    return db_event
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from pydantic_core import to_json
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.registry import DatabaseRegistry
+from app.models.event import mask_to_weekdays
+
+# A serialized page: the JSON body and its X-Next-Cursor header, if any
+Page = Tuple[bytes, Optional[str]]
+
+
+class EventCache:
+    """Data version and serialized list pages of one database.
+
+    The version goes up on every write, which makes it an ETag for any read:
+    a client whose ETag matches the current version already has the current
+    data. Pages are cached per version, so a write makes every cached page
+    unreachable; they are dropped straight away rather than left to the LRU.
+    """
+
+    def __init__(self, max_pages: int) -> None:
+        # The epoch keeps ETags from one process lifetime from matching another's
+        self.epoch = uuid4().hex[:8]
+        self.version = 0
+        # The database's write counter as of the last sync_with_other_workers
+        self.shared_version: Optional[int] = None
+        self.last_modified = datetime.now(timezone.utc)
+        self.max_pages = max_pages
+        self.pages: "OrderedDict[Hashable, Page]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def etag(self) -> str:
+        if self.shared_version is not None:
+            # The write counter is the same in every worker, so any of them can validate this ETag
+            return f'"w{self.shared_version}"'
+        return f'"{self.epoch}-{self.version}"'
+
+    def validators(self) -> Tuple[int, Dict[str, str]]:
+        """Return the current version and the caching headers that describe it."""
+        with self.lock:
+            return self.version, {
+                "ETag": self.etag,
+                "Last-Modified": format_datetime(self.last_modified.replace(microsecond=0), usegmt=True),
+                "Cache-Control": "no-cache",  # Cache, but revalidate with If-None-Match every time
+            }
+
+    def bump(self) -> None:
+        with self.lock:
+            self.version += 1
+            self.last_modified = datetime.now(timezone.utc)
+            self.pages.clear()
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Return True if an If-None-Match header value includes the current ETag."""
+        if not if_none_match:
+            return False
+        etag = self.etag
+        # Weak comparison: W/"x" matches "x"
+        return any(tag.strip() in ("*", etag, f"W/{etag}") for tag in if_none_match.split(","))
+
+    def get_page(self, key: Hashable) -> Optional[Page]:
+        with self.lock:
+            page = self.pages.get(key)
+            if page is not None:
+                self.pages.move_to_end(key)
+            return page
+
+    def put_page(self, key: Hashable, page: Page) -> None:
+        if self.max_pages <= 0:
+            return
+        with self.lock:
+            self.pages[key] = page
+            self.pages.move_to_end(key)
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+
+
+_caches: DatabaseRegistry[EventCache] = DatabaseRegistry()
+
+
+def get_event_cache(db: Union[Session, AsyncSession]) -> EventCache:
+    """Return the cache of the session's database, creating it on first use."""
+    bind = db.get_bind()
+    cache = _caches.get(bind)
+    if cache is None:
+        cache = _caches.setdefault(bind, EventCache(settings.EVENT_PAGE_CACHE_SIZE))
+    return cache
+
+
+def bump_data_version(db: Union[Session, AsyncSession]) -> None:
+    """Record a write to the session's database. Every write path calls this after committing."""
+    get_event_cache(db).bump()
+
+
+def event_row_to_dict(row: Row) -> Dict[str, Any]:
+    """Shape a row of EVENT_READ_COLUMNS like a dumped EventRead, fields in the same order.
+
+    Rows come from the database, where every event was validated on the way
+    in, so this skips EventRead's validators (including the ZoneInfo lookup of
+    the end time check) rather than running them again on every read.
+    """
+    recurrence_rule = None
+    if row.recurrence_rule_id is not None:
+        recurrence_rule = {"days_of_week": mask_to_weekdays(row.days_mask), "id": row.recurrence_rule_id}
+    return {
+        "name": row.name,
+        "start_datetime": row.start_datetime,
+        "end_datetime": row.end_datetime,
+        "timezone": row.timezone,
+        "id": row.id,
+        "recurrence_rule": recurrence_rule,
+    }
+
+
+def serialize_page(rows: List[Row], next_cursor: Optional[str]) -> Page:
+    """Encode rows from get_event_rows as the JSON of a List[EventRead].
+
+    pydantic-core's encoder formats datetimes, UUIDs and enums exactly as an
+    EventRead dump would, without building the models.
+    """
+    return to_json([event_row_to_dict(row) for row in rows]), next_cursor
@@ -0,0 +1,129 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.registry import DatabaseRegistry
+from app.models.event import Event
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+
+Submission = Tuple[EventCreate, Future]
+
+
+class GroupCommitWriter:
+    """The single writer of event creates for one database in GROUP_COMMIT mode.
+
+    Requests queue their event and wait. A writer thread takes everything
+    queued so far (up to ``max_batch``), checks it in arrival order as POST
+    /batch does, and commits it in one transaction. Under bursts one commit
+    (and fsync) covers many requests, instead of each request queueing for
+    SQLite's write lock and paying for its own. A lone request is written
+    straight away, so nothing waits for a group to fill up.
+    """
+
+    def __init__(self, bind: Engine, max_batch: int) -> None:
+        self.bind = bind
+        self.max_batch = max_batch
+        self.queue: "queue.Queue[Optional[Submission]]" = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="group-commit-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, event: EventCreate) -> Future:
+        """Queue an event; the future resolves to the created Event or fails with a 409 HTTPException."""
+        future: Future = Future()
+        self.queue.put((event, future))
+        return future
+
+    def stop(self) -> None:
+        """Write what's already queued, then stop the writer thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self) -> None:
+        while True:
+            batch: List[Submission] = []
+            submission = self.queue.get()
+            while submission is not None:
+                batch.append(submission)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    submission = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+            if submission is None:
+                return
+
+    def write(self, batch: List[Submission]) -> None:
+        try:
+            with Session(self.bind, autoflush=False) as db:
+                outcomes = event_service.create_events_with_conflicts(db, [event for event, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Event):
+                future.set_result(outcome)
+            else:
+                future.set_exception(event_service.conflict_error(outcome))
+
+
+_writers: DatabaseRegistry[GroupCommitWriter] = DatabaseRegistry()
+# Held while starting a writer, so a database never gets two writer threads
+_writers_lock = threading.Lock()
+
+
+def get_writer(db: Session) -> GroupCommitWriter:
+    """Return the group-commit writer of the session's database, starting it on first use."""
+    bind = db.get_bind()
+    writer = _writers.get(bind)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(bind)
+            if writer is None:
+                writer = _writers.setdefault(bind, GroupCommitWriter(bind, settings.GROUP_COMMIT_MAX_BATCH))
+    return writer
+
+
+def stop_writer(db: Session) -> None:
+    """Stop the writer of the session's database, if it has one, once its queue is written."""
+    writer = _writers.pop(db.get_bind())
+    if writer is not None:
+        writer.stop()
+
+
+def stop_writers() -> None:
+    """Stop the writers of every database once their queues are written, e.g. at shutdown."""
+    for writer in _writers.pop_all():
+        writer.stop()
+
+
+def create_event(
+    db: Session,
+    event: EventCreate,
+) -> Event:
+    """Create an event through the database's group-commit writer.
+
+    Waits until the group the event was written in has committed.
+
+    Args:
+        db: Database session; only used to find the database
+        event: Event data including optional recurrence rule
+
+    Returns:
+        Created event
+
+    Raises:
+        HTTPException: If there's a time conflict with existing events, or
+            with events queued before it
+    """
+    return get_writer(db).submit(event).result()
@@ -0,0 +1,400 @@
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.zones import local_to_utc, utc_to_local
+from app.models.event import Event, Weekday
+from app.schemas.event import EventCreate, EventImportResult, EventRead
+from app.services import event as event_service
+from app.services.event import Conflicts
+
+ICS_WEEKDAYS = {
+    "MO": Weekday.MONDAY,
+    "TU": Weekday.TUESDAY,
+    "WE": Weekday.WEDNESDAY,
+    "TH": Weekday.THURSDAY,
+    "FR": Weekday.FRIDAY,
+    "SA": Weekday.SATURDAY,
+    "SU": Weekday.SUNDAY,
+}
+# VEVENTs handed to a parser process at a time; enough to outweigh pickling them
+PARSE_CHUNK_SIZE = 200
+# Chunks queued per parser process, so reading runs ahead of parsing without buffering the file
+PARSE_CHUNKS_IN_FLIGHT = 2
+
+DURATION_PATTERN = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+TEXT_ESCAPE_PATTERN = re.compile(r"\\([\\;,nN])")
+
+
+class ContentLine(NamedTuple):
+    """One unfolded iCalendar property: ``NAME;PARAM=value:VALUE``."""
+
+    name: str
+    params: Dict[str, str]
+    value: str
+
+
+class VEvent(NamedTuple):
+    """The properties of one VEVENT, as unparsed content lines.
+
+    Components nested in it (VALARM) are left out. ``default_timezone`` is
+    the calendar's X-WR-TIMEZONE if it came before the event, which is
+    where calendar properties go.
+    """
+
+    line: int
+    properties: List[str]
+    default_timezone: Optional[str]
+
+
+class ParsedVEvent(NamedTuple):
+    """A VEVENT read into an EventCreate, or why it couldn't be."""
+
+    line: int
+    uid: Optional[str]
+    event: Optional[EventCreate]
+    error: Optional[str]
+
+
+class ImportResult(NamedTuple):
+    """What happened to one VEVENT: its new event, the events it conflicts with, or why it was skipped."""
+
+    line: int
+    uid: Optional[str]
+    outcome: Union[Event, Conflicts, str]
+
+
+def unfold_lines(lines: Iterable[bytes]) -> Iterator[Tuple[int, str]]:
+    """Join folded lines back into content lines, with the line number each one starts on.
+
+    A line starting with a space or tab continues the previous one (RFC 5545
+    3.1). Lines are joined before decoding, since a fold may split a UTF-8
+    character. Blank lines are dropped.
+    """
+    current = b""
+    start = 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip(b"\r\n")
+        if line[:1] in (b" ", b"\t"):
+            current += line[1:]
+            continue
+        if current:
+            yield start, current.decode("utf-8", errors="replace")
+        current, start = line, number
+    if current:
+        yield start, current.decode("utf-8", errors="replace")
+
+
+def parse_content_line(line: str) -> ContentLine:
+    """Split a content line into its name, parameters and value.
+
+    Raises:
+        ValueError: If the line has no value
+    """
+    parts = []
+    start = 0
+    in_quotes = False
+    # Parameter values may quote ':' and ';', the value itself can hold anything
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char in ";:" and not in_quotes:
+            parts.append(line[start:i])
+            start = i + 1
+            if char == ":":
+                break
+    else:
+        raise ValueError(f"Malformed line: {line[:50]}")
+
+    name, *raw_params = parts
+    params = {}
+    for raw_param in raw_params:
+        key, _, value = raw_param.partition("=")
+        params[key.upper()] = value.strip('"')
+    return ContentLine(name.upper(), params, line[start:])
+
+
+def read_vevents(lines: Iterable[bytes]) -> Iterator[VEvent]:
+    """Lazily yield the VEVENTs of an iCalendar stream, holding one event's lines at a time."""
+    default_timezone = None
+    properties: Optional[List[str]] = None
+    start = 0
+    depth = 0  # Components open inside the current VEVENT
+    for number, line in unfold_lines(lines):
+        upper = line.upper()
+        if properties is None:
+            if upper == "BEGIN:VEVENT":
+                properties, start = [], number
+            elif upper.startswith("X-WR-TIMEZONE"):
+                default_timezone = parse_content_line(line).value.strip()
+        elif upper.startswith("BEGIN:"):
+            depth += 1
+        elif upper.startswith("END:"):
+            if depth:
+                depth -= 1
+            else:
+                yield VEvent(start, properties, default_timezone)
+                properties = None
+        elif not depth:
+            properties.append(line)
+
+
+def resolve_timezone(tzid: str) -> str:
+    """Return the IANA zone a TZID names.
+
+    Some calendars prefix the zone with a path, as in
+    ``/citadel.org/20190914_1/America/New_York``; the longest suffix that is
+    a known zone is used.
+
+    Raises:
+        ValueError: If no part of the TZID is a known zone
+    """
+    parts = tzid.strip().strip("/").split("/")
+    for i in range(len(parts)):
+        name = "/".join(parts[i:])
+        try:
+            ZoneInfo(name)
+            return name
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    raise ValueError(f"Unknown timezone {tzid}")
+
+
+def is_date(prop: ContentLine) -> bool:
+    """Whether a DTSTART or DTEND is a DATE (all day) rather than a DATE-TIME."""
+    return prop.params.get("VALUE") == "DATE" or len(prop.value.strip()) == 8
+
+
+def parse_datetime(prop: ContentLine, zone: str) -> datetime:
+    """Parse a DATE or DATE-TIME property into naive UTC.
+
+    Floating times and dates are taken as wall-clock time in ``zone``; a
+    date is its midnight.
+
+    Raises:
+        ValueError: If the value isn't a date or date-time
+    """
+    value = prop.value.strip()
+    if is_date(prop):
+        return local_to_utc(zone, datetime.strptime(value, "%Y%m%d"))
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+    return local_to_utc(zone, datetime.strptime(value, "%Y%m%dT%H%M%S"))
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse an iCalendar DURATION such as ``PT1H30M`` or ``P1D``.
+
+    Raises:
+        ValueError: If the value isn't a duration
+    """
+    match = DURATION_PATTERN.fullmatch(value.strip())
+    if match is None or not any(match.groups()[1:]):
+        raise ValueError(f"Malformed DURATION: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+    )
+    return -duration if sign == "-" else duration
+
+
+def parse_rrule(value: str, local_start: datetime) -> List[Weekday]:
+    """Map a weekly (or daily) RRULE to the weekdays of a RecurrenceRule.
+
+    Recurrence rules here repeat every week and never end, so only those
+    RRULEs can be imported: FREQ=WEEKLY with an optional BYDAY (the start's
+    weekday without one), or FREQ=DAILY (every day, or its BYDAY days).
+
+    Raises:
+        ValueError: If the rule has no RecurrenceRule equivalent
+    """
+    parts = {}
+    for part in value.strip().upper().split(";"):
+        key, _, part_value = part.partition("=")
+        parts[key] = part_value
+    freq = parts.pop("FREQ", None)
+    byday = parts.pop("BYDAY", None)
+    parts.pop("WKST", None)
+    if parts.pop("INTERVAL", "1") != "1":
+        raise ValueError("Only rules repeating every week are supported, not INTERVAL")
+    if "COUNT" in parts or "UNTIL" in parts:
+        raise ValueError("Recurring events don't end, so COUNT and UNTIL aren't supported")
+    if freq not in ("WEEKLY", "DAILY"):
+        raise ValueError(f"Only weekly rules are supported, not FREQ={freq}")
+    if parts:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(parts))}")
+
+    if byday is None:
+        return list(Weekday) if freq == "DAILY" else [list(Weekday)[local_start.weekday()]]
+    days = set()
+    for day in byday.split(","):
+        if day not in ICS_WEEKDAYS:
+            raise ValueError(f"Unsupported BYDAY value {day}")
+        days.add(ICS_WEEKDAYS[day])
+    return sorted(days, key=lambda day: day.day_number)
+
+
+def unescape_text(value: str) -> str:
+    """Undo iCalendar TEXT escaping; line breaks become spaces, as names are one line."""
+    return TEXT_ESCAPE_PATTERN.sub(lambda match: " " if match[1] in "nN" else match[1], value).strip()
+
+
+def to_event_create(properties: Dict[str, ContentLine], default_timezone: Optional[str]) -> EventCreate:
+    """Build the EventCreate for a VEVENT's properties.
+
+    EXDATEs are ignored: the whole series is imported, which can only make
+    conflict checks stricter.
+
+    Raises:
+        ValueError: If the VEVENT can't be imported; ValidationError if the
+            event it describes isn't valid
+    """
+    if "RECURRENCE-ID" in properties:
+        raise ValueError("Changes to a single occurrence of a series aren't supported")
+    if "STATUS" in properties and properties["STATUS"].value.strip().upper() == "CANCELLED":
+        raise ValueError("The event is cancelled")
+    if "DTSTART" not in properties:
+        raise ValueError("DTSTART is missing")
+
+    dtstart = properties["DTSTART"]
+    tzid = dtstart.params.get("TZID") or default_timezone
+    zone = resolve_timezone(tzid) if tzid else "UTC"
+    start = parse_datetime(dtstart, zone)
+    local_start = utc_to_local(zone, start)
+    if "DTEND" in properties:
+        dtend = properties["DTEND"]
+        end_zone = resolve_timezone(dtend.params["TZID"]) if "TZID" in dtend.params else zone
+        end = parse_datetime(dtend, end_zone)
+    elif "DURATION" in properties:
+        # Added to the wall-clock start, so a day stays a day across DST changes
+        end = local_to_utc(zone, local_start + parse_duration(properties["DURATION"].value))
+    elif is_date(dtstart):
+        end = local_to_utc(zone, local_start + timedelta(days=1))
+    else:
+        end = start
+
+    days_of_week = None
+    if "RRULE" in properties:
+        days_of_week = parse_rrule(properties["RRULE"].value, local_start)
+
+    return EventCreate(
+        name=unescape_text(properties["SUMMARY"].value) if "SUMMARY" in properties else "",
+        start_datetime=start,
+        end_datetime=end,
+        timezone=zone,
+        days_of_week=days_of_week,
+    )
+
+
+def parse_vevent(vevent: VEvent) -> ParsedVEvent:
+    """Read a VEVENT into an EventCreate; errors are returned rather than raised."""
+    uid = None
+    try:
+        properties: Dict[str, ContentLine] = {}
+        for line in vevent.properties:
+            prop = parse_content_line(line)
+            properties.setdefault(prop.name, prop)
+        if "UID" in properties:
+            uid = properties["UID"].value.strip()
+        return ParsedVEvent(vevent.line, uid, to_event_create(properties, vevent.default_timezone), None)
+    except ValidationError as e:
+        return ParsedVEvent(vevent.line, uid, None, "; ".join(error["msg"] for error in e.errors()))
+    except ValueError as e:
+        return ParsedVEvent(vevent.line, uid, None, str(e))
+
+
+def parse_vevents(vevents: List[VEvent]) -> List[ParsedVEvent]:
+    """Parse a chunk of VEVENTs; what parser processes run."""
+    return [parse_vevent(vevent) for vevent in vevents]
+
+
+def parse_all(vevents: Iterable[VEvent], workers: int = 0) -> Iterator[ParsedVEvent]:
+    """Lazily parse VEVENTs in order, in ``workers`` processes if there's more than one.
+
+    Only a few chunks per process are in flight at a time, so memory stays
+    flat however long the file is.
+    """
+    if workers <= 1:
+        yield from map(parse_vevent, vevents)
+        return
+
+    # Spawned rather than forked: forking a process that runs threads (the server's) can deadlock
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending: Deque[Future] = deque()
+        iterator = iter(vevents)
+        while chunk := list(islice(iterator, PARSE_CHUNK_SIZE)):
+            pending.append(pool.submit(parse_vevents, chunk))
+            if len(pending) >= workers * PARSE_CHUNKS_IN_FLIGHT:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_batch(db: Session, batch: List[ParsedVEvent]) -> Iterator[ImportResult]:
+    """Create a batch's valid events in one transaction and report every VEVENT of it, in order."""
+    events = [parsed.event for parsed in batch if parsed.event is not None]
+    outcomes = iter(event_service.create_events_with_conflicts(db, events) if events else [])
+    for parsed in batch:
+        outcome = next(outcomes) if parsed.event is not None else parsed.error
+        yield ImportResult(parsed.line, parsed.uid, outcome)
+
+
+def import_events(
+    db: Session,
+    lines: Iterable[bytes],
+    batch_size: int = 500,
+    workers: int = 0,
+) -> Iterator[ImportResult]:
+    """Import the VEVENTs of an iCalendar stream.
+
+    The stream is read and parsed incrementally. Every ``batch_size``
+    VEVENTs go through create_events_with_conflicts: checked in file order
+    against existing events and the ones imported before them, then inserted
+    in one transaction. A VEVENT that conflicts or can't be read is
+    reported and skipped; the rest are still imported.
+
+    Args:
+        db: Database session
+        lines: Raw lines of the file, such as an open binary file
+        batch_size: VEVENTs checked and committed together
+        workers: Parser processes; 0 or 1 parses in this process
+
+    Returns:
+        Iterator of one result per VEVENT, in file order
+    """
+    batch: List[ParsedVEvent] = []
+    for parsed in parse_all(read_vevents(lines), workers):
+        batch.append(parsed)
+        if len(batch) >= batch_size:
+            yield from write_batch(db, batch)
+            batch = []
+    yield from write_batch(db, batch)
+
+
+def import_result_read(result: ImportResult) -> EventImportResult:
+    """Build the report entry of an ImportResult."""
+    if isinstance(result.outcome, Event):
+        return EventImportResult(
+            line=result.line, uid=result.uid, status_code=200, event=EventRead.model_validate(result.outcome)
+        )
+    if isinstance(result.outcome, str):
+        return EventImportResult(line=result.line, uid=result.uid, status_code=422, detail=result.outcome)
+    return EventImportResult(
+        line=result.line,
+        uid=result.uid,
+        status_code=409,
+        detail=event_service.CONFLICT_DETAIL,
+        conflicts=[{"id": conflict.id, "name": conflict.name} for conflict in result.outcome],
+    )
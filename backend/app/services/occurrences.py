@@ -0,0 +1,169 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Iterator, List, NamedTuple, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.week import to_utc_naive
+from app.models.event import Event
+from app.services.conflict_index import RecurringSeries
+
+
+class Occurrence(NamedTuple):
+    """A concrete occurrence of an event. Tuples order by start time first."""
+
+    start_datetime: datetime
+    end_datetime: datetime
+    event_id: UUID
+    name: str
+    timezone: str
+
+
+def expand_event(
+    event: Event,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Occurrence]:
+    """Lazily yield an event's occurrences overlapping [window_start, window_end), in start order.
+
+    The anchor is the first occurrence; a recurrence rule then repeats the
+    anchor's local time of day in the event's timezone on each of its weekdays,
+    from the day after the anchor onwards (see RecurringSeries).
+    """
+    start = to_utc_naive(event.start_datetime)
+    end = to_utc_naive(event.end_datetime)
+
+    if start < window_end and end > window_start:
+        yield Occurrence(start, end, event.id, event.name, event.timezone)
+
+    if event.recurrence_rule is None:
+        return
+
+    for occurrence_start, occurrence_end in RecurringSeries.from_event(event).occurrences(window_start, window_end):
+        yield Occurrence(occurrence_start, occurrence_end, event.id, event.name, event.timezone)
+
+
+def get_occurrences(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Occurrence]:
+    """Get every event occurrence overlapping a window, in start order.
+
+    Only the events are loaded up front; their occurrences are generated on
+    demand and merged with a heap, so memory grows with the number of events
+    rather than the length of the window.
+
+    Args:
+        db: Database session
+        window_start: Start of the window
+        window_end: End of the window
+
+    Returns:
+        Iterator of occurrences
+
+    Raises:
+        HTTPException: If the window ends before it starts
+    """
+    window_start = to_utc_naive(window_start)
+    window_end = to_utc_naive(window_end)
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="Window must end after it starts")
+
+    # One-off events come back from the database already in start order
+    one_off_events = (
+        db.query(Event)
+        .filter(
+            Event.recurrence_rule_id.is_(None),
+            Event.start_datetime < window_end,
+            Event.end_datetime > window_start,
+        )
+        .order_by(Event.start_datetime)
+        .all()
+    )
+    # Recurring series that have started by the end of the window each get their own stream
+    recurring_events = (
+        db.query(Event)
+        .options(selectinload(Event.recurrence_rule))
+        .filter(
+            Event.recurrence_rule_id.isnot(None),
+            Event.start_datetime < window_end,
+        )
+        .all()
+    )
+
+    one_offs = (
+        Occurrence(
+            to_utc_naive(event.start_datetime), to_utc_naive(event.end_datetime), event.id, event.name, event.timezone
+        )
+        for event in one_off_events
+    )
+    return heapq.merge(one_offs, *[expand_event(event, window_start, window_end) for event in recurring_events])
+
+
+class FreeBusy(NamedTuple):
+    """Busy blocks and free slots within a window."""
+
+    busy: List[Tuple[datetime, datetime]]
+    free: List[Tuple[datetime, datetime]]
+
+
+def get_free_busy(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    limit: int = 10,
+) -> FreeBusy:
+    """Get the busy blocks in a window and the first free slots of a given length.
+
+    A single sweep over the start-ordered occurrences merges overlapping or
+    touching occurrences into busy blocks. The gaps between blocks are free,
+    with the same half-open semantics as check_time_conflict: a slot may start
+    exactly when a busy block ends. Each gap long enough for ``duration``
+    contributes one slot, starting at the beginning of the gap.
+
+    Args:
+        db: Database session
+        window_start: Start of the window
+        window_end: End of the window
+        duration: Length of the free slots to find
+        limit: Maximum number of free slots to return
+
+    Returns:
+        The busy blocks clipped to the window, and up to ``limit`` free slots
+
+    Raises:
+        HTTPException: If the window ends before it starts
+    """
+    busy: List[Tuple[datetime, datetime]] = []
+    free: List[Tuple[datetime, datetime]] = []
+
+    def add_gap(gap_start: datetime, gap_end: datetime) -> None:
+        if len(free) < limit and gap_end - gap_start >= duration:
+            free.append((gap_start, gap_start + duration))
+
+    window_start = to_utc_naive(window_start)
+    window_end = to_utc_naive(window_end)
+    block_start = block_end = None
+    for occurrence in get_occurrences(db, window_start, window_end):
+        start = max(occurrence.start_datetime, window_start)
+        end = min(occurrence.end_datetime, window_end)
+        if block_end is not None and start <= block_end:
+            block_end = max(block_end, end)
+            continue
+        if block_end is None:
+            add_gap(window_start, start)
+        else:
+            busy.append((block_start, block_end))
+            add_gap(block_end, start)
+        block_start, block_end = start, end
+
+    if block_end is None:
+        add_gap(window_start, window_end)
+    else:
+        busy.append((block_start, block_end))
+        add_gap(block_end, window_end)
+    return FreeBusy(busy, free)
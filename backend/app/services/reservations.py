@@ -0,0 +1,222 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, Iterator, List, Optional, Union
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.week import MINUTES_PER_WEEK, duration_minutes, to_utc_naive
+from app.db.registry import DatabaseRegistry
+from app.models.event import Weekday
+from app.models.reservation import RESERVATION_BUCKET_MINUTES, RESERVATION_BUCKETS, SlotReservation
+from app.services.conflict_index import RecurringSeries, anchor_slots, reset_conflict_index
+from app.services.event_cache import get_event_cache
+
+ALL_BUCKETS = frozenset(range(RESERVATION_BUCKETS))
+
+
+def reservation_buckets(
+    start_datetime: datetime,
+    end_datetime: datetime,
+    timezone: str,
+    days_of_week: Optional[List[Weekday]] = None,
+) -> FrozenSet[int]:
+    """Buckets of the week an event could conflict in.
+
+    Conflicts are only reported where the two events' UTC minute-of-week
+    footprints meet, with and without the conflict index (see ConflictCheck).
+    This covers the anchor's footprint and a series' footprint under every
+    UTC offset its zone takes, so two events that can conflict always share
+    a bucket.
+    """
+    start, end = to_utc_naive(start_datetime), to_utc_naive(end_datetime)
+    if duration_minutes(start, end) >= MINUTES_PER_WEEK:
+        return ALL_BUCKETS
+
+    slots = anchor_slots(start, end)
+    if days_of_week:
+        series = RecurringSeries(start, end, days_of_week, timezone)
+        for offset in series.offsets():
+            slots.extend(series.slots(offset))
+
+    buckets = set()
+    for slot_start, slot_end in slots:
+        last_minute = max(slot_start, slot_end - 1)
+        buckets.update(range(slot_start // RESERVATION_BUCKET_MINUTES, last_minute // RESERVATION_BUCKET_MINUTES + 1))
+    return frozenset(buckets)
+
+
+class SlotLocks:
+    """In-process locks, one per reservation bucket of a database."""
+
+    def __init__(self) -> None:
+        self.locks = [threading.Lock() for _ in range(RESERVATION_BUCKETS)]
+
+    def acquire(self, buckets: Iterable[int], blocking: bool = True) -> bool:
+        """Take the locks of ``buckets``; without ``blocking``, take none unless all are free."""
+        taken = []
+        # Always in bucket order, so two writers never each hold a lock the other waits for
+        for bucket in sorted(buckets):
+            if not self.locks[bucket].acquire(blocking):
+                self.release(taken)
+                return False
+            taken.append(bucket)
+        return True
+
+    def release(self, buckets: Iterable[int]) -> None:
+        for bucket in buckets:
+            self.locks[bucket].release()
+
+
+_slot_locks: DatabaseRegistry[SlotLocks] = DatabaseRegistry()
+
+
+def get_slot_locks(db: Union[Session, AsyncSession]) -> SlotLocks:
+    bind = db.get_bind()
+    locks = _slot_locks.get(bind)
+    if locks is None:
+        locks = _slot_locks.setdefault(bind, SlotLocks())
+    return locks
+
+
+class WriteCounter:
+    """What this process knows about the database's write counter.
+
+    The counter is the sum of the bucket versions. Every event write claims
+    its buckets, which adds the number of buckets to it, so the counter only
+    stays at ``seen`` plus this process's own claims while no other process
+    writes.
+    """
+
+    def __init__(self) -> None:
+        self.seen: Optional[int] = None
+        self.local = 0
+        self.lock = threading.Lock()
+
+    def add_local(self, count: int) -> None:
+        with self.lock:
+            self.local += count
+
+    def sync(self, current: int) -> bool:
+        """Move to ``current``; return True if another process wrote since the last sync."""
+        with self.lock:
+            # Local claims are only added once committed, so a concurrent local write can
+            # make this report a foreign write that wasn't one, but never hide one that was
+            foreign = self.seen is None or current != self.seen + self.local
+            self.seen = current
+            self.local = 0
+            return foreign
+
+
+_write_counters: DatabaseRegistry[WriteCounter] = DatabaseRegistry()
+
+
+def get_write_counter(db: Union[Session, AsyncSession]) -> WriteCounter:
+    bind = db.get_bind()
+    counter = _write_counters.get(bind)
+    if counter is None:
+        counter = _write_counters.setdefault(bind, WriteCounter())
+    return counter
+
+
+def sync_with_other_workers(db: Session) -> None:
+    """Drop this process's event list cache and conflict index if another process has written since.
+
+    The other process can be another of the WORKERS or the import-ics
+    command, so this runs with a single worker too; it costs one small
+    query. Run it before answering from either structure.
+    """
+    if not settings.CONFLICT_INDEX_ENABLED and settings.EVENT_PAGE_CACHE_SIZE <= 0:
+        return
+    current = db.scalar(select(func.sum(SlotReservation.version)))
+    cache = get_event_cache(db)
+    if get_write_counter(db).sync(current):
+        cache.bump()
+        reset_conflict_index(db)
+    cache.shared_version = current
+
+
+class Reservation:
+    """Buckets held by one write, with their versions from before its conflict check."""
+
+    def __init__(self, buckets: FrozenSet[int]) -> None:
+        self.buckets = buckets
+        self.versions: Dict[int, int] = {}
+
+    def read_versions(self, db: Session) -> None:
+        query = select(SlotReservation.bucket, SlotReservation.version).where(SlotReservation.bucket.in_(self.buckets))
+        self.versions = dict(db.execute(query).tuples().all())
+        if len(self.versions) != len(self.buckets):
+            raise RuntimeError("slot_reservation is missing buckets; run the database migrations")
+
+    def claim(self, db: Session) -> bool:
+        """Bump the bucket versions in the current transaction, unless another process already has.
+
+        Run this before writing anything else. The UPDATE takes the database's
+        write lock (SQLite) or the bucket rows' locks (PostgreSQL) until commit,
+        so nobody can write into these buckets between the claim and the insert.
+        On False the transaction is rolled back and the versions read again;
+        the caller should rebuild its conflict index, check again and retry.
+        """
+        claim = (
+            update(SlotReservation)
+            .where(tuple_(SlotReservation.bucket, SlotReservation.version).in_(list(self.versions.items())))
+            .values(version=SlotReservation.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(claim).rowcount == len(self.versions):
+            return True
+        db.rollback()
+        self.read_versions(db)
+        return False
+
+    def committed(self, db: Union[Session, AsyncSession]) -> None:
+        """Count the claim as this process's own write once its transaction has committed.
+
+        Call it after bump_data_version: until then a sync has to see the write
+        as foreign, or it could pair the new counter with an old cached page.
+        """
+        get_write_counter(db).add_local(len(self.versions))
+
+
+@contextmanager
+def reserve_slots(db: Session, buckets: FrozenSet[int]) -> Iterator[Reservation]:
+    """Hold the buckets against other writers in this process while checking and inserting.
+
+    Writes whose buckets don't overlap proceed in parallel. Writers in other
+    processes are caught by Reservation.claim.
+    """
+    locks = get_slot_locks(db)
+    locks.acquire(buckets)
+    try:
+        reservation = Reservation(buckets)
+        reservation.read_versions(db)
+        sync_with_other_workers(db)
+        yield reservation
+    finally:
+        locks.release(buckets)
+
+
+@asynccontextmanager
+async def reserve_slots_async(db: AsyncSession, buckets: FrozenSet[int]) -> AsyncIterator[Reservation]:
+    """Async version of reserve_slots; waiting for a held bucket doesn't block the event loop."""
+    locks = get_slot_locks(db)
+    if not locks.acquire(buckets, blocking=False):
+        acquiring = asyncio.ensure_future(asyncio.to_thread(locks.acquire, buckets))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The thread still takes the locks; hand them back once it has
+            acquiring.add_done_callback(lambda _: locks.release(buckets))
+            raise
+    try:
+        reservation = Reservation(buckets)
+        await db.run_sync(reservation.read_versions)
+        await db.run_sync(sync_with_other_workers)
+        yield reservation
+    finally:
+        locks.release(buckets)
@@ -1,10 +1,20 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.session import Base, get_db
+from app.api.events_async import router as events_async_router
+from app.core.config import settings
+from app.db.session import Base, get_async_db, get_db
 from app.main import app
 
 
@@ -20,6 +30,43 @@ def engine():
     return engine
 
 
+@pytest.fixture
+def file_engine(tmp_path):
+    """Create a test database in a file, so concurrent sessions get their own connections."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget(engine):
+    """Fail a block that runs more SQL statements than allowed.
+
+    ``with query_budget(2) as statements:`` counts every statement the test
+    engine runs inside the block, so an N+1 load that grows with the data
+    fails the test. The statements are listed in the failure message.
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sa_event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", record)
+        assert len(statements) <= max_queries, f"{len(statements)} queries, budget {max_queries}:\n" + "\n".join(
+            statements
+        )
+
+    return budget
+
+
 @pytest.fixture
 def db_session(engine):
     """Create a test database session."""
@@ -44,3 +91,26 @@ def client(db_session):
     app.dependency_overrides[get_db] = override_get_db
     yield TestClient(app)
     del app.dependency_overrides[get_db]
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Create an async test client serving the ASYNC_DB routes from an in-memory aiosqlite database."""
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+    )
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.include_router(events_async_router, prefix=settings.API_PREFIX)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async with AsyncClient(transport=ASGITransport(app=async_app), base_url="http://test") as client:
+        yield client
+    await async_engine.dispose()
@@ -0,0 +1,250 @@
+import random
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from app.core.config import settings
+from app.core.week import MINUTES_PER_WEEK
+from app.core.zones import TRANSITIONS_START, utc_offset, zone_segments, zone_transitions
+from app.models.event import Event, RecurrenceRule, Weekday
+from app.services import event as event_service
+from app.services.conflict_index import ConflictIndex, IntervalTree, RecurringSeries, recurrence_slots, slots_mask
+
+
+def test_interval_tree_overlaps():
+    """Test half-open overlap queries and stamp filtering."""
+    tree = IntervalTree()
+    for lo, hi, stamp in [(10, 20, 1), (30, 40, 2), (35, 50, 3), (60, 70, 4)]:
+        tree.insert(lo, hi, stamp=stamp, key=stamp)
+
+    assert len(tree) == 4
+    assert tree.overlaps(15, 16)
+    assert not tree.overlaps(20, 30)  # Touching intervals don't overlap
+    assert not tree.overlaps(50, 60)
+    assert sorted(key for *_, key in tree.overlapping(32, 38)) == [2, 3]
+    assert [key for *_, key in tree.overlapping(32, 38, min_stamp=3)] == [3]
+    assert not tree.overlaps(0, 100, max_stamp=0)
+
+
+def test_slots_mask():
+    """Test the minute-of-week bitmap for a recurring event that wraps past the end of the week."""
+    # Sunday 23:30 - Monday 00:30
+    slots = recurrence_slots(datetime(2024, 3, 24, 23, 30), datetime(2024, 3, 25, 0, 30), [Weekday.SUNDAY])
+    mask = slots_mask(slots)
+
+    assert mask.bit_count() == 60
+    assert mask >> (MINUTES_PER_WEEK - 30) == (1 << 30) - 1
+    assert mask & ((1 << 30) - 1) == (1 << 30) - 1
+    assert not mask & (1 << 30)
+
+
+def test_index_handles_midnight_wrap():
+    """Test that recurring events crossing midnight UTC conflict with the next morning."""
+    index = ConflictIndex()
+    # Monday 23:00 - Tuesday 01:00, every Monday
+    index.add(datetime(2024, 3, 18, 23, 0), datetime(2024, 3, 19, 1, 0), [Weekday.MONDAY])
+
+    assert index.has_conflict(datetime(2024, 3, 26, 0, 30), datetime(2024, 3, 26, 1, 30))
+    assert not index.has_conflict(datetime(2024, 3, 26, 1, 0), datetime(2024, 3, 26, 2, 0))
+
+    # Sunday 23:30 - Monday 00:30 wraps around the end of the week
+    index.add(datetime(2024, 3, 24, 23, 30), datetime(2024, 3, 25, 0, 30), [Weekday.SUNDAY])
+    assert index.has_conflict(datetime(2024, 4, 1, 0, 0), datetime(2024, 4, 1, 0, 15))
+
+
+def test_index_matches_sql_checks(db_session, monkeypatch):
+    """Test that the index agrees with the SQL conflict checks on random data."""
+    rng = random.Random(42)
+    base = datetime(2024, 3, 4)
+    weekdays = list(Weekday)
+
+    def random_event():
+        start = base + timedelta(days=rng.randrange(28), hours=rng.randrange(20), minutes=rng.choice([0, 15, 30, 45]))
+        end = start + timedelta(minutes=rng.choice([15, 30, 60, 90, 180]))
+        days = rng.sample(weekdays, rng.randint(1, 2)) if rng.random() < 0.3 else None
+        return start, end, days
+
+    for _ in range(60):
+        start, end, days = random_event()
+        rule = None
+        if days:
+            rule = RecurrenceRule(days_of_week=days)
+            db_session.add(rule)
+            db_session.flush()
+        db_session.add(
+            Event(
+                name="Seed",
+                start_datetime=start,
+                end_datetime=end,
+                timezone="UTC",
+                recurrence_rule_id=rule.id if rule else None,
+            )
+        )
+    db_session.commit()
+
+    index = ConflictIndex.build(db_session)
+    assert len(index) == 60
+
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    for _ in range(200):
+        start, end, days = random_event()
+        expected = event_service.check_time_conflict(db_session, start, end, "UTC", days)
+        assert index.has_conflict(start, end, days) == expected
+
+
+def test_index_matches_sql_across_dst(db_session, monkeypatch):
+    """Test that the index and the SQL path find the same conflicts for series in zones with DST."""
+    rng = random.Random(7)
+    zones = ["UTC", "America/New_York", "Europe/Berlin", "Australia/Sydney"]
+    weekdays = list(Weekday)
+    # Spans the spring and autumn DST changes of both hemispheres
+    base = datetime(2024, 3, 1)
+
+    def random_event():
+        start = base + timedelta(days=rng.randrange(270), hours=rng.randrange(24), minutes=rng.choice([0, 30]))
+        end = start + timedelta(minutes=rng.choice([30, 60, 120, 600, 1500]))
+        days = rng.sample(weekdays, rng.randint(1, 3)) if rng.random() < 0.5 else None
+        return start, end, days, rng.choice(zones)
+
+    for i in range(80):
+        start, end, days, zone = random_event()
+        db_session.add(
+            Event(
+                id=UUID(int=i + 1),
+                name=f"Seed {i}",
+                start_datetime=start,
+                end_datetime=end,
+                timezone=zone,
+                recurrence_rule=RecurrenceRule(days_of_week=days) if days else None,
+            )
+        )
+    db_session.commit()
+
+    index = ConflictIndex.build(db_session)
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    found = 0
+    for _ in range(300):
+        start, end, days, zone = random_event()
+        expected = set(index.conflicting_keys(start, end, days, zone))
+        rows = event_service.get_conflicting_events(db_session, start, end, zone, days, limit=len(index))
+        assert {row.id for row in rows} == expected, (start, end, days, zone)
+        assert event_service.check_time_conflict(db_session, start, end, zone, days) == bool(expected)
+        found += bool(expected)
+    # Both outcomes are exercised
+    assert 0 < found < 300
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_conflicts_with_and_without_index(client, monkeypatch, enabled):
+    """Test that the API rejects conflicts whichever backend answers them."""
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", enabled)
+    start = datetime(2024, 3, 18, 10, 0)
+    event_data = {
+        "name": "Weekly Sync",
+        "start_datetime": start.isoformat(),
+        "end_datetime": (start + timedelta(hours=1)).isoformat(),
+        "timezone": "UTC",
+        "days_of_week": ["MONDAY"],
+    }
+    response = client.post("/api/events/", json=event_data)
+    assert response.status_code == 200
+    series_id = response.json()["id"]
+
+    next_monday = {
+        **event_data,
+        "name": "One-off",
+        "start_datetime": (start + timedelta(days=7, minutes=30)).isoformat(),
+        "end_datetime": (start + timedelta(days=7, minutes=90)).isoformat(),
+        "days_of_week": None,
+    }
+    response = client.post("/api/events/", json=next_monday)
+    assert response.status_code == 409
+    assert response.json()["detail"]["conflicts"] == [{"id": series_id, "name": "Weekly Sync"}]
+
+
+def test_zone_transitions():
+    """Test the memoized UTC offset table of a DST zone."""
+    assert utc_offset("America/New_York", datetime(2024, 3, 10, 6, 59)) == -300
+    assert utc_offset("America/New_York", datetime(2024, 3, 10, 7, 0)) == -240
+    assert utc_offset("America/New_York", datetime(2024, 11, 3, 6, 0)) == -300
+
+    segments = list(zone_segments("America/New_York", datetime(2024, 1, 1), datetime(2025, 1, 1)))
+    assert [(segment.start, segment.offset) for segment in segments] == [
+        (datetime(2024, 1, 1), -300),
+        (datetime(2024, 3, 10, 7, 0), -240),
+        (datetime(2024, 11, 3, 6, 0), -300),
+    ]
+    assert segments[-1].end == datetime(2025, 1, 1)
+    assert list(zone_segments("UTC", datetime(2024, 1, 1))) == [(datetime(2024, 1, 1), None, 0)]
+
+    # Fixed-offset zones skip the sampling
+    assert zone_transitions("UTC") == ((TRANSITIONS_START,), (0,))
+    assert zone_transitions("Etc/GMT+5") == ((TRANSITIONS_START,), (-300,))
+    # A zone whose last change was before 1970 has no transitions in range
+    assert zone_transitions("Asia/Kolkata") == ((TRANSITIONS_START,), (330,))
+
+
+def test_index_compares_recurrences_in_local_time():
+    """Test that a series keeps its wall-clock time across DST changes."""
+    index = ConflictIndex()
+    # Mondays 9:00 - 10:00 in New York, created in January (14:00 UTC)
+    index.add(datetime(2024, 1, 8, 14, 0), datetime(2024, 1, 8, 15, 0), [Weekday.MONDAY], timezone="America/New_York")
+
+    # In June 9:00 New York is 13:00 UTC
+    assert index.has_conflict(datetime(2024, 6, 10, 13, 0), datetime(2024, 6, 10, 13, 30))
+    assert not index.has_conflict(datetime(2024, 6, 10, 14, 0), datetime(2024, 6, 10, 14, 30))
+    assert index.has_conflict(datetime(2024, 12, 9, 14, 0), datetime(2024, 12, 9, 14, 30))
+
+    # Mondays 13:00 in London only line up with New York while their DST changes are out of step
+    assert index.has_conflict(
+        datetime(2024, 1, 8, 13, 0), datetime(2024, 1, 8, 14, 0), [Weekday.MONDAY], timezone="Europe/London"
+    )
+    # A UTC series at 13:00 - 13:30 only collides in summer
+    assert index.has_conflict(datetime(2024, 1, 8, 13, 0), datetime(2024, 1, 8, 13, 30), [Weekday.MONDAY])
+    assert not index.has_conflict(datetime(2024, 1, 8, 15, 0), datetime(2024, 1, 8, 16, 0), [Weekday.MONDAY])
+
+    # A new New York series against a one-off in June
+    index = ConflictIndex()
+    index.add(datetime(2024, 6, 10, 13, 0), datetime(2024, 6, 10, 13, 30))
+    assert index.has_conflict(
+        datetime(2024, 1, 8, 14, 0), datetime(2024, 1, 8, 15, 0), [Weekday.MONDAY], timezone="America/New_York"
+    )
+    assert not index.has_conflict(datetime(2024, 1, 8, 14, 0), datetime(2024, 1, 8, 15, 0), [Weekday.MONDAY])
+
+
+def test_recurring_series_occurrences_follow_dst():
+    """Test that expanded occurrences stay at the same local time."""
+    series = RecurringSeries(
+        datetime(2024, 3, 4, 14, 0), datetime(2024, 3, 4, 15, 0), [Weekday.MONDAY], "America/New_York"
+    )
+    assert list(series.occurrences(datetime(2024, 3, 5), datetime(2024, 3, 19))) == [
+        (datetime(2024, 3, 11, 13, 0), datetime(2024, 3, 11, 14, 0)),
+        (datetime(2024, 3, 18, 13, 0), datetime(2024, 3, 18, 14, 0)),
+    ]
+
+
+def test_occurrences_longer_than_a_day(db_session, monkeypatch):
+    """Test that an occurrence begun days before the checked interval is still found."""
+    # Mondays 8:00 to Wednesdays 10:00 in Berlin
+    start, end = datetime(2024, 3, 4, 7, 0), datetime(2024, 3, 6, 9, 0)
+    series = RecurringSeries(start, end, [Weekday.MONDAY], "Europe/Berlin")
+    # A Wednesday in June, during the tail of that week's occurrence
+    check_start, check_end = datetime(2024, 6, 12, 7, 0), datetime(2024, 6, 12, 7, 30)
+    assert list(series.occurrences(check_start, check_end)) == [
+        (datetime(2024, 6, 10, 6, 0), datetime(2024, 6, 12, 8, 0)),
+    ]
+
+    db_session.add(
+        Event(
+            name="Offsite",
+            start_datetime=start,
+            end_datetime=end,
+            timezone="Europe/Berlin",
+            recurrence_rule=RecurrenceRule(days_of_week=[Weekday.MONDAY]),
+        )
+    )
+    db_session.commit()
+    assert ConflictIndex.build(db_session).has_conflict(check_start, check_end)
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    assert event_service.check_time_conflict(db_session, check_start, check_end, "UTC")
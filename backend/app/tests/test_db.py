@@ -0,0 +1,24 @@
+from sqlalchemy import text
+
+from app.core.config import SQLITE_PROFILES, Settings
+from app.db.session import create_db_engine
+
+
+def test_sqlite_pragmas_from_profile_and_overrides():
+    """Test that individual SQLite settings override the selected profile."""
+    assert Settings(SQLITE_PROFILE="default").SQLITE_PRAGMAS == {}
+
+    pragmas = Settings(SQLITE_PROFILE="performance", SQLITE_BUSY_TIMEOUT_MS=250).SQLITE_PRAGMAS
+    assert pragmas == {**SQLITE_PROFILES["performance"], "busy_timeout": 250}
+
+
+def test_engine_applies_pragmas_on_connect(tmp_path):
+    """Test that the engine runs the profile's PRAGMAs on every new connection."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", SQLITE_PROFILES["performance"])
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+    engine.dispose()
@@ -1,10 +1,19 @@
+import json
 from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
 
 import pytest
 from fastapi import status
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import event as sa_event
 
-from app.schemas.event import EventCreate
+from app.core.config import settings
+from app.main import app
+from app.models.event import Event, RecurrenceRule, Weekday, mask_to_weekdays, weekdays_to_mask
+from app.schemas.event import EventCreate, EventRead
+from app.services import event as event_service
+from app.services.event_cache import EventCache, serialize_page
 
 
 def test_create_event(client):
@@ -200,3 +209,510 @@ def test_get_events(client):
     assert all(isinstance(event["start_datetime"], str) for event in data)
     assert all(isinstance(event["end_datetime"], str) for event in data)
     assert all(isinstance(event["timezone"], str) for event in data)
+
+
+def test_minute_of_week_columns_populated_on_insert(client, db_session):
+    """Test that the precomputed anchor columns are filled in on insert."""
+    # Sunday 23:30 UTC, crossing into Monday
+    event_data = {
+        "name": "Late Call",
+        "start_datetime": "2024-03-24T23:30:00Z",
+        "end_datetime": "2024-03-25T00:30:00Z",
+        "timezone": "UTC",
+    }
+    response = client.post("/api/events/", json=event_data)
+    assert response.status_code == status.HTTP_200_OK
+
+    event = db_session.get(Event, UUID(response.json()["id"]))
+    assert event.weekday == 6
+    assert event.start_minute_of_week == 6 * 1440 + 23 * 60 + 30
+    assert event.end_minute_of_week == event.start_minute_of_week + 60
+
+
+def test_conflict_queries_use_indexes(engine, db_session, monkeypatch):
+    """Test that the SQL conflict check searches an index for every case instead of scanning a table."""
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    plans = []
+
+    @sa_event.listens_for(engine, "before_cursor_execute")
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append([row[3] for row in rows])
+
+    start_time = datetime(2024, 3, 24, 23, 0)
+    end_time = start_time + timedelta(minutes=90)
+    days = [Weekday.MONDAY, Weekday.SUNDAY]
+
+    event_service.check_time_conflict(db_session, start_time, end_time, "UTC", days)
+
+    # One statement, with a SELECT per case
+    assert len(plans) == 1
+    plan = plans[0]
+    assert not any(step.startswith("SCAN") for step in plan), plan
+    for index in (
+        "ix_event_start_datetime_end_datetime",  # Anchor vs anchor
+        "ix_event_recurrence_rule_id_start_datetime",  # Anchor vs recurrence, recurrence vs recurrence
+        "ix_event_weekday_minute_of_week",  # Recurrence vs anchor
+    ):
+        assert any(f"USING INDEX {index}" in step for step in plan), plan
+
+
+def test_conflict_check_is_a_single_query(db_session, query_budget, monkeypatch):
+    """Test that the SQL conflict check and conflict listing each take one round trip."""
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    start_time = datetime(2024, 3, 18, 10, 0)
+    db_session.add(
+        Event(
+            name="Weekly Sync",
+            start_datetime=start_time,
+            end_datetime=start_time + timedelta(hours=1),
+            timezone="UTC",
+            recurrence_rule=RecurrenceRule(days_of_week=[Weekday.MONDAY]),
+        )
+    )
+    db_session.commit()
+
+    # Overlaps the series' anchor and recurs on the same weekday, so it matches several cases
+    args = (start_time + timedelta(minutes=30), start_time + timedelta(minutes=90), "UTC", [Weekday.MONDAY])
+    with query_budget(2):
+        assert event_service.check_time_conflict(db_session, *args)
+        conflicts = event_service.get_conflicting_events(db_session, *args)
+    assert [conflict.name for conflict in conflicts] == ["Weekly Sync"]
+
+    assert not event_service.check_time_conflict(
+        db_session, start_time + timedelta(hours=1), start_time + timedelta(hours=2), "UTC"
+    )
+
+
+# Statements each GET route may run, however many events it returns. Every GET route
+# under /api/events must be listed, so a new endpoint gets a budget when it's added.
+READ_QUERY_BUDGETS = {
+    "/api/events/": ({"limit": 50}, 2),
+    "/api/events/export": ({}, 2),
+    "/api/events/occurrences": ({"from": "2024-03-01T00:00:00", "to": "2024-04-01T00:00:00"}, 3),
+    "/api/events/free-busy": ({"from": "2024-03-01T00:00:00", "to": "2024-04-01T00:00:00", "duration": 30}, 3),
+}
+
+
+def test_read_paths_stay_within_query_budget(client, db_session, query_budget):
+    """Test that reads take a fixed number of statements, with no per-event lazy loads."""
+    routes = {route.path for route in app.routes if "GET" in getattr(route, "methods", ())}
+    assert {path for path in routes if path.startswith("/api/events")} == set(READ_QUERY_BUDGETS)
+
+    base_time = datetime(2024, 3, 4, 8, 0)
+    for i in range(20):
+        start = base_time + timedelta(days=i, minutes=15 * i)
+        db_session.add(
+            Event(
+                name=f"Event {i}",
+                start_datetime=start,
+                end_datetime=start + timedelta(minutes=15),
+                timezone="UTC",
+                recurrence_rule=RecurrenceRule(days_of_week=[Weekday.SATURDAY]) if i % 2 else None,
+            )
+        )
+    db_session.commit()
+
+    for path, (params, budget) in READ_QUERY_BUDGETS.items():
+        db_session.expire_all()  # As in a fresh request
+        with query_budget(budget):
+            response = client.get(path, params=params)
+            assert response.status_code == status.HTTP_200_OK, path
+            response.read()
+
+    db_session.expire_all()
+    with query_budget(2):
+        events = event_service.get_events(db_session, limit=50)
+        assert sum(event.recurrence_rule is not None for event in events) == 10
+
+
+def test_days_of_week_mask(db_session):
+    """Test that recurrence days round-trip through the integer mask."""
+    days = [Weekday.SUNDAY, Weekday.MONDAY, Weekday.WEDNESDAY]
+    assert weekdays_to_mask(days) == 0b1000101
+    assert mask_to_weekdays(0b1000101) == [Weekday.MONDAY, Weekday.WEDNESDAY, Weekday.SUNDAY]
+
+    rule = RecurrenceRule(days_of_week=days)
+    db_session.add(rule)
+    db_session.commit()
+    db_session.expire_all()
+
+    stored = db_session.get(RecurrenceRule, rule.id)
+    assert stored.days_mask == 0b1000101
+    assert stored.days_of_week == [Weekday.MONDAY, Weekday.WEDNESDAY, Weekday.SUNDAY]
+    # The legacy JSON column is deferred, so reads never decode it
+    assert "_days_of_week_json" not in stored.__dict__
+
+
+def test_create_events_batch(client):
+    """Test batch creation reports conflicts against the database and within the batch."""
+    base_time = datetime(2024, 3, 18, 10, 0)
+
+    def event_data(name, start, minutes=60, days=None):
+        return {
+            "name": name,
+            "start_datetime": start.isoformat(),
+            "end_datetime": (start + timedelta(minutes=minutes)).isoformat(),
+            "timezone": "UTC",
+            "days_of_week": days,
+        }
+
+    response = client.post("/api/events/", json=event_data("Existing", base_time))
+    assert response.status_code == status.HTTP_200_OK
+
+    batch = [
+        event_data("Clashes with existing", base_time + timedelta(minutes=30)),
+        event_data("Weekly", base_time + timedelta(days=1), days=["TUESDAY"]),
+        event_data("Clashes with weekly", base_time + timedelta(days=8, minutes=15)),
+        event_data("Free", base_time + timedelta(days=2)),
+    ]
+    response = client.post("/api/events/batch", json=batch)
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()
+    assert [result["status_code"] for result in results] == [409, 200, 409, 200]
+    assert results[0]["event"] is None
+    # Rejected events get the detail of a single create's 409, conflicts within the batch included
+    assert results[0]["detail"]["message"] == event_service.CONFLICT_DETAIL
+    assert [conflict["name"] for conflict in results[0]["detail"]["conflicts"]] == ["Existing"]
+    assert [conflict["name"] for conflict in results[2]["detail"]["conflicts"]] == ["Weekly"]
+    assert results[1]["event"]["name"] == "Weekly"
+    assert results[1]["event"]["recurrence_rule"]["days_of_week"] == ["TUESDAY"]
+    assert results[3]["event"]["name"] == "Free"
+
+    # Batch-created events take part in later conflict checks
+    response = client.post("/api/events/", json=event_data("Late", base_time + timedelta(days=2, minutes=30)))
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert len(client.get("/api/events/").json()) == 3
+
+
+def test_get_events_cursor_pagination(client):
+    """Test paging through events with the X-Next-Cursor header."""
+    base_time = datetime(2024, 3, 18, 9, 0)
+    for i in range(5):
+        response = client.post(
+            "/api/events/",
+            json={
+                "name": f"Event {i}",
+                "start_datetime": (base_time + timedelta(days=i)).isoformat(),
+                "end_datetime": (base_time + timedelta(days=i, minutes=30)).isoformat(),
+                "timezone": "UTC",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    names = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/events/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        names.extend(event["name"] for event in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert names == [f"Event {i}" for i in range(5)]
+
+    # skip/limit keeps working alongside cursors
+    response = client.get("/api/events/", params={"skip": 3, "limit": 2})
+    assert [event["name"] for event in response.json()] == ["Event 3", "Event 4"]
+
+    response = client.get("/api/events/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_events_in_window(client, db_session, query_budget):
+    """Test listing the events active in a start/end window."""
+    for name, start, end, days in [
+        ("Before", datetime(2024, 3, 10, 9, 0), datetime(2024, 3, 10, 10, 0), None),
+        ("Weekly", datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 10, 0), [Weekday.MONDAY]),
+        ("Long", datetime(2024, 3, 15, 8, 0), datetime(2024, 3, 18, 9, 30), None),
+        ("Ends At Start", datetime(2024, 3, 17, 23, 0), datetime(2024, 3, 18, 0, 0), None),
+        ("Inside", datetime(2024, 3, 20, 9, 0), datetime(2024, 3, 20, 10, 0), None),
+        ("Starts At End", datetime(2024, 3, 25, 0, 0), datetime(2024, 3, 25, 1, 0), None),
+        ("Later Weekly", datetime(2024, 4, 1, 9, 0), datetime(2024, 4, 1, 10, 0), [Weekday.MONDAY]),
+    ]:
+        db_session.add(
+            Event(
+                name=name,
+                start_datetime=start,
+                end_datetime=end,
+                timezone="UTC",
+                recurrence_rule=RecurrenceRule(days_of_week=days) if days else None,
+            )
+        )
+    db_session.commit()
+
+    def names(**params) -> List[str]:
+        response = client.get("/api/events/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [event["name"] for event in response.json()]
+
+    window = {"start": "2024-03-18T00:00:00", "end": "2024-03-25T00:00:00"}
+    # One query for the shared write counter, one for the longest event, one for the page
+    with query_budget(3):
+        assert names(**window) == ["Weekly", "Long", "Inside"]
+    assert names(start="2024-03-18T00:00:00") == ["Weekly", "Long", "Inside", "Starts At End", "Later Weekly"]
+    assert names(end="2024-03-18T00:00:00") == ["Weekly", "Before", "Long", "Ends At Start"]
+    # Bounds with an offset are compared in UTC
+    assert names(start="2024-03-18T05:00:00+05:00", end="2024-03-25T05:00:00+05:00") == ["Weekly", "Long", "Inside"]
+
+    response = client.get("/api/events/", params={**window, "limit": 2})
+    assert [event["name"] for event in response.json()] == ["Weekly", "Long"]
+    response = client.get("/api/events/", params={**window, "limit": 2, "cursor": response.headers["X-Next-Cursor"]})
+    assert [event["name"] for event in response.json()] == ["Inside"]
+
+    response = client.get("/api/events/", params={"start": window["end"], "end": window["start"]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_window_query_uses_indexes(engine, db_session):
+    """Test that a windowed list reads index ranges instead of scanning the event table."""
+    plans = []
+
+    @sa_event.listens_for(engine, "before_cursor_execute")
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append([row[3] for row in rows])
+
+    event_service.get_event_rows(db_session, window_start=datetime(2024, 3, 18), window_end=datetime(2024, 3, 25))
+
+    steps = [step for plan in plans for step in plan]
+    assert not any(step.startswith("SCAN event") for step in steps), plans
+    for index in (
+        "ix_event_length_minutes",
+        "ix_event_start_datetime_end_datetime",
+        "ix_event_recurrence_rule_id_start_datetime",
+    ):
+        assert any(index in step for step in steps), plans
+
+
+def test_get_events_etag(client, query_budget):
+    """Test conditional GETs of the event list and invalidation on writes."""
+    event_data = {
+        "name": "Planning",
+        "start_datetime": "2024-03-18T09:00:00",
+        "end_datetime": "2024-03-18T09:30:00",
+        "timezone": "UTC",
+    }
+    assert client.post("/api/events/", json=event_data).status_code == status.HTTP_200_OK
+
+    response = client.get("/api/events/")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" in response.headers
+
+    # Each request reads the shared write counter and nothing else
+    with query_budget(3):
+        # Unchanged data: 304 without loading any events
+        response = client.get("/api/events/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        response = client.get("/api/events/", headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # A repeated page is served from the page cache
+        response = client.get("/api/events/")
+        assert [event["name"] for event in response.json()] == ["Planning"]
+
+    # A write changes the ETag, so the old one no longer matches
+    event_data.update(name="Review", start_datetime="2024-03-19T09:00:00", end_datetime="2024-03-19T09:30:00")
+    assert client.post("/api/events/", json=event_data).status_code == status.HTTP_200_OK
+    response = client.get("/api/events/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert [event["name"] for event in response.json()] == ["Planning", "Review"]
+
+
+def test_event_cache_evicts_least_recently_used():
+    """Test the page cache LRU and that a bump drops every page."""
+    cache = EventCache(max_pages=2)
+    cache.put_page("a", (b"[]", None))
+    cache.put_page("b", (b"[]", None))
+    cache.get_page("a")
+    cache.put_page("c", (b"[]", None))
+    assert cache.get_page("b") is None
+    assert cache.get_page("a") is not None
+
+    etag = cache.etag
+    cache.bump()
+    assert cache.etag != etag
+    assert cache.get_page("a") is None and cache.get_page("c") is None
+
+
+def test_serialize_page_matches_event_read(client, db_session):
+    """Test the row serialization path produces the same JSON as validating EventRead."""
+    for i, days in enumerate([None, ["WEDNESDAY", "MONDAY"]]):
+        response = client.post(
+            "/api/events/",
+            json={
+                "name": f"Event {i}",
+                "start_datetime": f"2024-03-1{8 + i}T09:00:00",
+                "end_datetime": f"2024-03-1{8 + i}T09:30:00",
+                "timezone": "America/New_York",
+                "days_of_week": days,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    body, _ = serialize_page(event_service.get_event_rows(db_session), None)
+    expected = TypeAdapter(List[EventRead]).dump_json(
+        [EventRead.model_validate(event) for event in event_service.get_events(db_session)]
+    )
+    assert body == expected
+
+
+def test_get_occurrences(client):
+    """Test expanding anchors and recurrence rules into occurrences within a window."""
+    events = [
+        {
+            # Anchor on Monday 18th, then every Wednesday and Friday
+            "name": "Standup",
+            "start_datetime": "2024-03-18T09:00:00",
+            "end_datetime": "2024-03-18T09:15:00",
+            "timezone": "UTC",
+            "days_of_week": ["WEDNESDAY", "FRIDAY"],
+        },
+        {
+            "name": "Lunch",
+            "start_datetime": "2024-03-20T12:00:00",
+            "end_datetime": "2024-03-20T13:00:00",
+            "timezone": "UTC",
+        },
+    ]
+    for event in events:
+        assert client.post("/api/events/", json=event).status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/events/occurrences",
+        params={"from": "2024-03-18T00:00:00", "to": "2024-03-25T00:00:00"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    occurrences = [json.loads(line) for line in response.text.splitlines()]
+    assert [(occurrence["name"], occurrence["start_datetime"]) for occurrence in occurrences] == [
+        ("Standup", "2024-03-18T09:00:00"),
+        ("Standup", "2024-03-20T09:00:00"),
+        ("Lunch", "2024-03-20T12:00:00"),
+        ("Standup", "2024-03-22T09:00:00"),
+    ]
+
+    response = client.get(
+        "/api/events/occurrences",
+        params={"from": "2024-03-25T00:00:00", "to": "2024-03-18T00:00:00"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_free_busy(client):
+    """Test merging occurrences into busy blocks and finding free slots that don't conflict."""
+    events = [
+        {
+            "name": "Standup",
+            "start_datetime": "2024-03-18T09:00:00",
+            "end_datetime": "2024-03-18T09:30:00",
+            "timezone": "UTC",
+            "days_of_week": ["TUESDAY"],
+        },
+        {
+            # Touches the standup, so they merge into one block
+            "name": "Review",
+            "start_datetime": "2024-03-19T09:30:00",
+            "end_datetime": "2024-03-19T10:00:00",
+            "timezone": "UTC",
+        },
+        {
+            "name": "Planning",
+            "start_datetime": "2024-03-19T10:30:00",
+            "end_datetime": "2024-03-19T11:00:00",
+            "timezone": "UTC",
+        },
+    ]
+    for event in events:
+        assert client.post("/api/events/", json=event).status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/events/free-busy",
+        params={"from": "2024-03-19T08:00:00", "to": "2024-03-19T12:00:00", "duration": 45},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    free_busy = response.json()
+    assert [(block["start_datetime"], block["end_datetime"]) for block in free_busy["busy"]] == [
+        ("2024-03-19T09:00:00", "2024-03-19T10:00:00"),
+        ("2024-03-19T10:30:00", "2024-03-19T11:00:00"),
+    ]
+    # The 30 minute gap between the blocks is too short
+    assert [(slot["start_datetime"], slot["end_datetime"]) for slot in free_busy["free"]] == [
+        ("2024-03-19T08:00:00", "2024-03-19T08:45:00"),
+        ("2024-03-19T11:00:00", "2024-03-19T11:45:00"),
+    ]
+
+    for slot in free_busy["free"]:
+        response = client.post("/api/events/", json={"name": "Free", "timezone": "UTC", **slot})
+        assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/events/free-busy",
+        params={"from": "2024-03-19T08:00:00", "to": "2024-03-19T12:00:00", "duration": 0},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_export_events(client):
+    """Test streaming every event as NDJSON."""
+    base_time = datetime(2024, 3, 18, 9, 0)
+    for i in range(3):
+        response = client.post(
+            "/api/events/",
+            json={
+                "name": f"Event {i}",
+                "start_datetime": (base_time + timedelta(days=2 - i)).isoformat(),
+                "end_datetime": (base_time + timedelta(days=2 - i, minutes=30)).isoformat(),
+                "timezone": "UTC",
+                "days_of_week": ["SUNDAY"] if i == 0 else None,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/events/export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["name"] for event in events] == ["Event 2", "Event 1", "Event 0"]
+    assert events[2]["recurrence_rule"]["days_of_week"] == ["SUNDAY"]
+
+
+@pytest.mark.asyncio
+async def test_async_routes(async_client):
+    """Test creating and listing events through the ASYNC_DB routes."""
+    event_data = {
+        "name": "Weekly Standup",
+        "start_datetime": "2024-03-18T09:00:00",
+        "end_datetime": "2024-03-18T09:30:00",
+        "timezone": "UTC",
+        "days_of_week": ["MONDAY", "WEDNESDAY"],
+    }
+    response = await async_client.post("/api/events/", json=event_data)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["recurrence_rule"]["days_of_week"] == ["MONDAY", "WEDNESDAY"]
+
+    conflicting = {
+        **event_data,
+        "name": "Clash",
+        "start_datetime": "2024-03-27T09:15:00",
+        "end_datetime": "2024-03-27T10:00:00",
+        "days_of_week": None,
+    }
+    response = await async_client.post("/api/events/", json=conflicting)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await async_client.get("/api/events/", params={"limit": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert [event["name"] for event in response.json()] == ["Weekly Standup"]
+    assert "X-Next-Cursor" in response.headers
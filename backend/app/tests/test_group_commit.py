@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, status
+from fastapi.testclient import TestClient
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.main import app
+from app.models.event import Event
+from app.schemas.event import EventCreate
+from app.services import group_commit
+
+
+def test_group_commit_route(client, db_session, monkeypatch):
+    """Test creating events through the group-commit writer."""
+    monkeypatch.setattr(settings, "GROUP_COMMIT", True)
+    event_data = {
+        "name": "Planning",
+        "start_datetime": "2024-03-18T09:00:00",
+        "end_datetime": "2024-03-18T10:00:00",
+        "timezone": "UTC",
+        "days_of_week": ["MONDAY"],
+    }
+    try:
+        response = client.post("/api/events/", json=event_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["recurrence_rule"]["days_of_week"] == ["MONDAY"]
+
+        response = client.post("/api/events/", json={**event_data, "name": "Clash", "days_of_week": None})
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert [conflict["name"] for conflict in response.json()["detail"]["conflicts"]] == ["Planning"]
+    finally:
+        group_commit.stop_writer(db_session)
+
+
+def test_group_commit_batches_concurrent_creates(file_engine, monkeypatch):
+    """Test that concurrent creates share commits and conflicts within a group are still rejected."""
+    monkeypatch.setattr(settings, "GROUP_COMMIT_MAX_BATCH", 16)
+    commits = []
+    sa_event.listen(file_engine, "commit", lambda conn: commits.append(True))
+
+    base_time = datetime(2024, 3, 18, 9, 0)
+    # Two contenders for each of 24 slots
+    attempts = [
+        (base_time + timedelta(days=slot // 8, hours=slot % 8), contender)
+        for slot in range(24)
+        for contender in range(2)
+    ]
+    start_together = threading.Barrier(len(attempts))
+
+    def create(attempt):
+        start, contender = attempt
+        event = EventCreate(
+            name=f"Contender {contender} at {start:%a %H:%M}",
+            start_datetime=start,
+            end_datetime=start + timedelta(minutes=45),
+            timezone="UTC",
+        )
+        with Session(file_engine) as db:
+            start_together.wait()
+            try:
+                return group_commit.create_event(db, event).name
+            except HTTPException as e:
+                assert e.status_code == 409
+                (conflict,) = e.detail["conflicts"]
+                return f"lost to {conflict['name']}"
+
+    with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+        outcomes = list(pool.map(create, attempts))
+    with Session(file_engine) as db:
+        group_commit.stop_writer(db)
+        created = set(db.scalars(select(Event.name)))
+        assert db.scalar(select(func.count()).select_from(Event)) == 24
+
+    # One winner per slot, and every loser names it
+    assert len(created) == 24
+    assert {outcome.removeprefix("lost to ") for outcome in outcomes} == created
+    assert len(commits) < len(attempts)
+
+
+@pytest.mark.parametrize("max_batch", [1, 64])
+def test_group_commit_writer_finishes_queue_on_stop(file_engine, monkeypatch, max_batch):
+    """Test that stopping the writer first writes everything already queued."""
+    monkeypatch.setattr(settings, "GROUP_COMMIT_MAX_BATCH", max_batch)
+    base_time = datetime(2024, 3, 18, 9, 0)
+    with Session(file_engine) as db:
+        writer = group_commit.get_writer(db)
+        futures = [
+            writer.submit(
+                EventCreate(
+                    name=f"Event {i}",
+                    start_datetime=base_time + timedelta(hours=i),
+                    end_datetime=base_time + timedelta(hours=i, minutes=30),
+                    timezone="UTC",
+                )
+            )
+            for i in range(10)
+        ]
+        group_commit.stop_writer(db)
+        assert all(future.done() for future in futures)
+        assert [future.result().name for future in futures] == [f"Event {i}" for i in range(10)]
+
+
+def test_shutdown_stops_writer_after_its_queue(file_engine, monkeypatch):
+    """Test that app shutdown writes the queued creates and stops the writer thread."""
+    # Keeps startup from building a conflict index of the default database
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    base_time = datetime(2024, 3, 18, 9, 0)
+    with Session(file_engine) as db:
+        writer = group_commit.get_writer(db)
+        with TestClient(app):
+            futures = [
+                writer.submit(
+                    EventCreate(
+                        name=f"Event {i}",
+                        start_datetime=base_time + timedelta(hours=i),
+                        end_datetime=base_time + timedelta(hours=i, minutes=30),
+                        timezone="UTC",
+                    )
+                )
+                for i in range(10)
+            ]
+        assert not writer.thread.is_alive()
+        assert [future.result(timeout=0).name for future in futures] == [f"Event {i}" for i in range(10)]
+        assert group_commit.get_writer(db) is not writer
+        group_commit.stop_writer(db)
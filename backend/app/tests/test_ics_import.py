@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import Base
+from app.models.event import Event, Weekday
+from app.services import ics_import
+from app.services.ics_import import VEvent, parse_vevent, read_vevents
+
+
+def ics(*vevents: str, header: str = "") -> bytes:
+    """Build a calendar file with CRLF line endings from VEVENT bodies."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Test//EN"]
+    if header:
+        lines.append(header)
+    for vevent in vevents:
+        lines += ["BEGIN:VEVENT", *vevent.strip().splitlines(), "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def parse(*properties: str, default_timezone=None):
+    return parse_vevent(VEvent(1, list(properties), default_timezone))
+
+
+def test_read_vevents():
+    """Test that VEVENTs are read with folded lines joined and nested components left out."""
+    body = ics(
+        "UID:1\nSUMMARY:Caf\nDTSTART:20240318T090000Z\nBEGIN:VALARM\nTRIGGER:-PT15M\nEND:VALARM",
+        "UID:2\nSUMMARY:Second",
+        header="X-WR-TIMEZONE:Europe/Paris",
+    )
+    # Fold the first summary in the middle of a two-byte character
+    body = body.replace(b"SUMMARY:Caf", b"SUMMARY:Caf\xc3\r\n \xa9 Meeting")
+
+    vevents = list(read_vevents(body.splitlines(keepends=True)))
+
+    assert vevents == [
+        VEvent(5, ["UID:1", "SUMMARY:Café Meeting", "DTSTART:20240318T090000Z"], "Europe/Paris"),
+        VEvent(14, ["UID:2", "SUMMARY:Second"], "Europe/Paris"),
+    ]
+
+
+def test_parse_vevent():
+    """Test mapping VEVENT properties to an EventCreate."""
+    parsed = parse(
+        "UID:abc",
+        "SUMMARY:Lunch\\, team\\nroom",
+        "DTSTART;TZID=America/New_York:20240318T210000",
+        "DTEND;TZID=America/New_York:20240318T220000",
+        "RRULE:FREQ=WEEKLY",
+    )
+    assert parsed.uid == "abc" and parsed.error is None
+    event = parsed.event
+    assert event.name == "Lunch, team room"
+    assert event.timezone == "America/New_York"
+    assert (event.start_datetime, event.end_datetime) == (datetime(2024, 3, 19, 1, 0), datetime(2024, 3, 19, 2, 0))
+    # The weekday comes from the local start (Monday), not the UTC one (Tuesday)
+    assert event.days_of_week == [Weekday.MONDAY]
+
+    event = parse(
+        "SUMMARY:Standup",
+        "DTSTART;TZID=/citadel.org/20190914_1/Europe/Berlin:20240318T090000",
+        "DURATION:PT1H30M",
+        "RRULE:FREQ=WEEKLY;BYDAY=WE,MO;WKST=MO",
+    ).event
+    assert event.timezone == "Europe/Berlin"
+    assert (event.start_datetime, event.end_datetime) == (datetime(2024, 3, 18, 8, 0), datetime(2024, 3, 18, 9, 30))
+    assert event.days_of_week == [Weekday.MONDAY, Weekday.WEDNESDAY]
+
+    event = parse(
+        "SUMMARY:Call", "DTSTART:20240318T090000Z", "DTEND:20240318T093000Z", default_timezone="Asia/Tokyo"
+    ).event
+    assert event.timezone == "Asia/Tokyo"
+    assert event.start_datetime == datetime(2024, 3, 18, 9, 0)
+
+    event = parse("SUMMARY:Daily", "DTSTART;VALUE=DATE:20240318", "RRULE:FREQ=DAILY").event
+    assert event.end_datetime - event.start_datetime == timedelta(days=1)
+    assert event.days_of_week == list(Weekday)
+
+
+@pytest.mark.parametrize(
+    "properties, error",
+    [
+        (["SUMMARY:x"], "DTSTART is missing"),
+        (["SUMMARY:x", "DTSTART:20240318T090000Z", "RRULE:FREQ=WEEKLY;COUNT=5"], "COUNT and UNTIL"),
+        (["SUMMARY:x", "DTSTART:20240318T090000Z", "RRULE:FREQ=MONTHLY;BYDAY=1MO"], "FREQ=MONTHLY"),
+        (["SUMMARY:x", "DTSTART:20240318T090000Z", "RRULE:FREQ=WEEKLY;INTERVAL=2"], "INTERVAL"),
+        (["SUMMARY:x", "DTSTART:20240318T090000Z", "RECURRENCE-ID:20240325T090000Z"], "single occurrence"),
+        (["SUMMARY:x", "DTSTART;TZID=Eastern Standard Time:20240318T090000"], "Unknown timezone"),
+        (["SUMMARY:x", "DTSTART:20240318T090000Z", "DTEND:20240318T080000Z"], "Event must end after it starts"),
+        (["DTSTART:20240318T090000Z", "DTEND:20240318T100000Z"], "Name cannot be empty"),
+        (["SUMMARY:x", "DTSTART:yesterday"], "does not match format"),
+    ],
+)
+def test_parse_vevent_errors(properties, error):
+    """Test that VEVENTs that can't be imported are reported, not raised."""
+    parsed = parse("UID:bad", *properties)
+    assert parsed.event is None
+    assert parsed.uid == "bad"
+    assert error in parsed.error
+
+
+def test_import_events(client, monkeypatch):
+    """Test importing a calendar: conflicts with existing and earlier imported events are reported."""
+    monkeypatch.setattr(settings, "ICS_IMPORT_BATCH_SIZE", 2)
+    response = client.post(
+        "/api/events/",
+        json={
+            "name": "Existing",
+            "start_datetime": "2024-03-18T09:00:00",
+            "end_datetime": "2024-03-18T10:00:00",
+            "timezone": "UTC",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    etag = client.get("/api/events/").headers["ETag"]
+
+    body = ics(
+        "UID:clash\nSUMMARY:Clash\nDTSTART:20240318T093000Z\nDTEND:20240318T103000Z",
+        "UID:weekly\nSUMMARY:Weekly\nDTSTART:20240319T090000Z\nDTEND:20240319T100000Z\nRRULE:FREQ=WEEKLY;BYDAY=TU",
+        "UID:broken\nSUMMARY:Broken\nDTSTART:20240320T090000Z\nRRULE:FREQ=YEARLY",
+        "UID:one-off\nSUMMARY:One-off\nDTSTART:20240320T090000Z\nDTEND:20240320T100000Z",
+        "UID:next-tuesday\nSUMMARY:Next Tuesday\nDTSTART:20240326T093000Z\nDTEND:20240326T100000Z",
+    )
+    response = client.post("/api/events/import", content=body, headers={"Content-Type": "text/calendar"})
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+
+    assert (report["imported"], report["conflicts"], report["invalid"]) == (2, 2, 1)
+    results = report["results"]
+    assert [(result["uid"], result["status_code"]) for result in results] == [
+        ("clash", 409),
+        ("weekly", 200),
+        ("broken", 422),
+        ("one-off", 200),
+        ("next-tuesday", 409),
+    ]
+    assert [result["line"] for result in results] == [4, 10, 17, 23, 29]
+    assert [conflict["name"] for conflict in results[0]["conflicts"]] == ["Existing"]
+    # Conflicts within the file are caught too, across batches
+    assert [conflict["name"] for conflict in results[4]["conflicts"]] == ["Weekly"]
+    assert results[1]["event"]["recurrence_rule"]["days_of_week"] == ["TUESDAY"]
+    assert "FREQ=YEARLY" in results[2]["detail"]
+
+    response = client.get("/api/events/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert [event["name"] for event in response.json()] == ["Existing", "Weekly", "One-off"]
+
+
+def test_import_with_parser_processes(tmp_path):
+    """Test that parsing in a process pool imports the same events, in the same order."""
+    start = datetime(2024, 3, 18, 9, 0)
+    vevents = []
+    for i in range(450):
+        # Every tenth event takes the slot of the one before it
+        slot = start + timedelta(days=i - 1 if i % 10 == 9 else i)
+        vevents.append(
+            f"UID:{i}\nSUMMARY:Event {i}\n"
+            f"DTSTART:{slot:%Y%m%dT%H%M%S}Z\nDTEND:{slot + timedelta(hours=1):%Y%m%dT%H%M%S}Z"
+        )
+    path = tmp_path / "calendar.ics"
+    path.write_bytes(ics(*vevents))
+
+    outcomes = {}
+    for workers in (0, 2):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{workers}.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db, open(path, "rb") as file:
+            results = list(ics_import.import_events(db, file, batch_size=100, workers=workers))
+            outcomes[workers] = [(result.uid, isinstance(result.outcome, Event)) for result in results]
+            assert db.scalar(select(func.count()).select_from(Event)) == 405
+        engine.dispose()
+
+    assert outcomes[0] == outcomes[2]
+    assert [uid for uid, created in outcomes[0] if not created] == [str(i) for i in range(9, 450, 10)]
@@ -0,0 +1,80 @@
+import re
+from datetime import datetime, timedelta
+
+from fastapi import status
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine, registry
+from app.core.slow_queries import log_slow_queries, slow_query_log
+from app.models.event import Weekday
+from app.services import event as event_service
+
+
+def test_server_timing_and_metrics(client, engine):
+    """Test per-request SQL counts in Server-Timing and route-labelled Prometheus metrics."""
+    instrument_engine(engine)
+    labels = (("method", "GET"), ("route", "/api/events/"), ("status", "200"))
+    requests_before = registry.requests.series.get(labels, 0)
+
+    response = client.get("/api/events/")
+    assert response.status_code == status.HTTP_200_OK
+    match = re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries"', response.headers["Server-Timing"])
+    # The shared write counter and the page
+    assert match and int(match.group(1)) == 2
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        f'http_requests_total{{method="GET",route="/api/events/",status="200"}} {requests_before + 1}' in response.text
+    )
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'http_request_db_queries_bucket{method="GET",route="/api/events/",le="1"}' in response.text
+    assert "db_queries_total" in response.text
+
+    # Unknown paths share one label instead of creating a series each
+    assert client.get("/api/nope/123").status_code == status.HTTP_404_NOT_FOUND
+    assert (("method", "GET"), ("route", "unmatched"), ("status", "404")) in registry.requests.series
+
+
+def test_slow_query_log(client, engine, db_session, monkeypatch):
+    """Test that slow statements are captured with their caller, conflict cases and query plan."""
+    log_slow_queries(engine)
+    slow_query_log.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", False)
+    monkeypatch.setattr(settings, "ADMIN_API_ENABLED", True)
+
+    start_time = datetime(2024, 3, 18, 10, 0)
+    event_service.check_time_conflict(db_session, start_time, start_time + timedelta(hours=1), "UTC", [Weekday.MONDAY])
+
+    response = client.get("/api/admin/slow-queries")
+    assert response.status_code == status.HTTP_200_OK
+    entries = response.json()
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry["caller"] == "app.services.event.get_conflicting_events"
+    assert entry["parameters"]
+    # Each branch of the UNION names its conflict case, and so do its plan steps
+    cases = ["anchor_x_anchor", "anchor_x_recurrence", "recurrence_x_anchor", "recurrence_x_recurrence"]
+    assert entry["tags"] == [f"conflict.{case}" for case in cases]
+    assert any(
+        step.startswith("[conflict.recurrence_x_anchor] SEARCH event USING INDEX ix_event_weekday_minute_of_week")
+        for step in entry["plan"]
+    ), entry["plan"]
+    assert any(
+        step.startswith("[conflict.anchor_x_anchor] SEARCH event USING INDEX ix_event_start_datetime_end_datetime")
+        for step in entry["plan"]
+    ), entry["plan"]
+
+    assert client.delete("/api/admin/slow-queries").status_code == status.HTTP_204_NO_CONTENT
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", None)
+    event_service.check_time_conflict(db_session, start_time, start_time + timedelta(hours=1), "UTC")
+    assert client.get("/api/admin/slow-queries").json() == []
+
+
+def test_admin_api_is_off_by_default(client, monkeypatch):
+    """Test that the slow query log, which shows bound parameters, isn't served unless enabled."""
+    monkeypatch.setattr(settings, "ADMIN_API_ENABLED", False)
+    assert client.get("/api/admin/slow-queries").status_code == status.HTTP_404_NOT_FOUND
+    assert client.delete("/api/admin/slow-queries").status_code == status.HTTP_404_NOT_FOUND
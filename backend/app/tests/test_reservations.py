@@ -0,0 +1,248 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models.event import Event, RecurrenceRule, Weekday
+from app.models.reservation import SlotReservation
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+from app.services.conflict_index import get_conflict_index
+from app.services.event_cache import EventCache
+from app.services.reservations import Reservation, reservation_buckets
+
+
+def test_reservation_buckets():
+    """Test that events get the weekday buckets their footprint touches."""
+    monday = datetime(2024, 3, 18, 9, 0)
+    assert reservation_buckets(monday, monday + timedelta(hours=1), "UTC") == {0}
+    assert reservation_buckets(monday + timedelta(days=2), monday + timedelta(days=2, hours=1), "UTC") == {2}
+
+    sunday_night = datetime(2024, 3, 24, 23, 30)
+    assert reservation_buckets(sunday_night, sunday_night + timedelta(hours=1), "UTC") == {6, 0}
+
+    # Monday 21:00 in New York is Tuesday 01:00 or 02:00 UTC, depending on DST
+    start = datetime(2024, 3, 19, 1, 0)
+    assert reservation_buckets(start, start + timedelta(minutes=30), "America/New_York", [Weekday.MONDAY]) == {1}
+
+    assert len(reservation_buckets(monday, monday + timedelta(days=8), "UTC")) == 7
+
+
+@pytest.mark.parametrize("index_enabled", [True, False])
+def test_concurrent_creates_never_double_book(file_engine, monkeypatch, index_enabled):
+    """Test that concurrent creates of the same slots only ever let one through per slot."""
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", index_enabled)
+    SessionLocal = sessionmaker(autoflush=False, bind=file_engine)
+    base_time = datetime(2024, 3, 18, 9, 0)
+    # Eight contenders for each of four slots on different weekdays
+    slots = [base_time + timedelta(days=day) for day in range(4)]
+    attempts = [(slot, contender) for contender in range(8) for slot in slots]
+    start_together = threading.Barrier(len(attempts))
+
+    def create(attempt) -> bool:
+        slot, contender = attempt
+        event = EventCreate(
+            name=f"Contender {contender}",
+            start_datetime=slot,
+            end_datetime=slot + timedelta(minutes=30 + contender),
+            timezone="UTC",
+        )
+        with SessionLocal() as db:
+            start_together.wait()
+            try:
+                event_service.create_event(db, event)
+                return True
+            except HTTPException as e:
+                assert e.status_code == 409
+                return False
+
+    with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+        created = list(pool.map(create, attempts))
+
+    assert sum(created) == len(slots)
+    with Session(file_engine) as db:
+        per_day = db.execute(select(Event.weekday, func.count()).group_by(Event.weekday)).all()
+        assert sorted(per_day) == [(day, 1) for day in range(4)]
+        versions = dict(db.execute(select(SlotReservation.bucket, SlotReservation.version)).tuples().all())
+        assert versions == {0: 1, 1: 1, 2: 1, 3: 1, 4: 0, 5: 0, 6: 0}
+
+
+def test_claim_rechecks_after_another_process_writes(file_engine, monkeypatch):
+    """Test that a create re-checks on a rebuilt index when another process wrote into its buckets after the check."""
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", True)
+    # Mondays at 9:00 in New York since January: 14:00 UTC in winter, 13:00 UTC in summer
+    series_start = datetime(2024, 1, 15, 14, 0)
+    read_versions = Reservation.read_versions
+    other_writes = []
+
+    def read_versions_then_other_process_writes(self, db):
+        read_versions(self, db)
+        if other_writes:
+            return
+        # What a create in another worker does: the insert isn't in this process's conflict index
+        with Session(file_engine) as other:
+            other.add(
+                Event(
+                    name="Other Worker",
+                    start_datetime=series_start,
+                    end_datetime=series_start + timedelta(hours=1),
+                    timezone="America/New_York",
+                    recurrence_rule=RecurrenceRule(days_of_week=[Weekday.MONDAY]),
+                )
+            )
+            other.execute(update(SlotReservation).values(version=SlotReservation.version + 1))
+            other.commit()
+        other_writes.append(True)
+
+    monkeypatch.setattr(Reservation, "read_versions", read_versions_then_other_process_writes)
+
+    with Session(file_engine) as db:
+        index = get_conflict_index(db)  # Built before the other process writes, so it misses that series
+        # A Monday in June at 13:00 UTC only meets the series in its own wall-clock time
+        start = datetime(2024, 6, 17, 13, 0)
+        event = EventCreate(name="Clash", start_datetime=start, end_datetime=start + timedelta(hours=1), timezone="UTC")
+        with pytest.raises(HTTPException) as exc_info:
+            event_service.create_event(db, event)
+        assert exc_info.value.status_code == 409
+        assert [conflict["name"] for conflict in exc_info.value.detail["conflicts"]] == ["Other Worker"]
+        assert db.scalar(select(func.count()).select_from(Event)) == 1
+        # The retry replaced the stale index with one that has the other worker's series
+        rebuilt = get_conflict_index(db)
+        assert rebuilt is not index and len(rebuilt) == 1
+
+
+def test_workers_pick_up_each_others_writes(file_engine, monkeypatch):
+    """Test that a worker's list cache and conflict index notice events created by another worker."""
+    monkeypatch.setattr(settings, "WORKERS", 2)
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", True)
+    SessionLocal = sessionmaker(autoflush=False, bind=file_engine)
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    start = datetime(2024, 3, 18, 9, 0)
+    event_data = {
+        "name": "Ours",
+        "start_datetime": start.isoformat(),
+        "end_datetime": (start + timedelta(hours=1)).isoformat(),
+        "timezone": "UTC",
+    }
+    try:
+        assert client.post("/api/events/", json=event_data).status_code == 200
+        etag = client.get("/api/events/").headers["ETag"]
+        with SessionLocal() as db:
+            index = get_conflict_index(db)
+
+        # This worker's own writes don't invalidate anything
+        wednesday = start + timedelta(days=2)
+        event_data.update(
+            start_datetime=wednesday.isoformat(), end_datetime=(wednesday + timedelta(hours=1)).isoformat()
+        )
+        assert client.post("/api/events/", json=event_data).status_code == 200
+        etag = client.get("/api/events/").headers["ETag"]
+        assert client.get("/api/events/", headers={"If-None-Match": etag}).status_code == 304
+        with SessionLocal() as db:
+            assert get_conflict_index(db) is index
+        # Any worker validates the ETag: it comes from the shared write counter, not this process's cache
+        other_worker_cache = EventCache(max_pages=1)
+        with SessionLocal() as db:
+            other_worker_cache.shared_version = db.scalar(select(func.sum(SlotReservation.version)))
+        assert other_worker_cache.etag == etag
+
+        # Another worker creates a Tuesday event: insert it and claim its bucket
+        tuesday = start + timedelta(days=1)
+        with SessionLocal() as other:
+            other.execute(
+                insert(Event),
+                [
+                    {
+                        "name": "Theirs",
+                        "start_datetime": tuesday,
+                        "end_datetime": tuesday + timedelta(hours=1),
+                        "timezone": "UTC",
+                    }
+                ],
+            )
+            other.execute(
+                update(SlotReservation).where(SlotReservation.bucket == 1).values(version=SlotReservation.version + 1)
+            )
+            other.commit()
+
+        response = client.get("/api/events/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert [event["name"] for event in response.json()] == ["Ours", "Theirs", "Ours"]
+
+        event_data.update(
+            name="Clash",
+            start_datetime=(tuesday + timedelta(minutes=30)).isoformat(),
+            end_datetime=(tuesday + timedelta(minutes=90)).isoformat(),
+        )
+        response = client.post("/api/events/", json=event_data)
+        assert response.status_code == 409
+        assert [conflict["name"] for conflict in response.json()["detail"]["conflicts"]] == ["Theirs"]
+    finally:
+        del app.dependency_overrides[get_db]
+
+
+def test_single_worker_picks_up_writes_from_another_process(file_engine, monkeypatch):
+    """Test that a lone worker's conflict index notices events another process, such as import-ics, created."""
+    monkeypatch.setattr(settings, "WORKERS", 1)
+    monkeypatch.setattr(settings, "CONFLICT_INDEX_ENABLED", True)
+    SessionLocal = sessionmaker(autoflush=False, bind=file_engine)
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    start = datetime(2024, 3, 18, 9, 0)
+    event_data = {
+        "name": "Ours",
+        "start_datetime": start.isoformat(),
+        "end_datetime": (start + timedelta(hours=1)).isoformat(),
+        "timezone": "UTC",
+    }
+    try:
+        assert client.post("/api/events/", json=event_data).status_code == 200
+
+        # The import-ics command creates a Tuesday event: insert it and claim its bucket
+        tuesday = start + timedelta(days=1)
+        with SessionLocal() as other:
+            other.execute(
+                insert(Event),
+                [
+                    {
+                        "name": "Theirs",
+                        "start_datetime": tuesday,
+                        "end_datetime": tuesday + timedelta(hours=1),
+                        "timezone": "UTC",
+                    }
+                ],
+            )
+            other.execute(
+                update(SlotReservation).where(SlotReservation.bucket == 1).values(version=SlotReservation.version + 1)
+            )
+            other.commit()
+
+        event_data.update(
+            name="Clash",
+            start_datetime=(tuesday + timedelta(minutes=30)).isoformat(),
+            end_datetime=(tuesday + timedelta(minutes=90)).isoformat(),
+        )
+        response = client.post("/api/events/", json=event_data)
+        assert response.status_code == 409
+        assert [conflict["name"] for conflict in response.json()["detail"]["conflicts"]] == ["Theirs"]
+    finally:
+        del app.dependency_overrides[get_db]
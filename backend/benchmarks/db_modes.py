@@ -0,0 +1,141 @@
+"""Compare requests/sec of the sync and ASYNC_DB event routes under concurrent load.
+
+Each mode gets its own temporary SQLite file, seeded with the same events, and
+is driven in-process through httpx's ASGI transport with a mix of creates and
+list requests.
+
+Usage:
+    poetry run python -m benchmarks.db_modes --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Tuple
+
+from app.api.events import router as events_router
+from app.api.events_async import router as events_async_router
+from app.core.config import settings
+from app.db.session import Base, get_async_db, get_db
+from app.models.event import Event
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+BASE_TIME = datetime(2024, 1, 1, 8, 0)
+
+
+def seed(db_file: Path, count: int) -> None:
+    engine = create_engine(f"sqlite:///{db_file}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            Event(
+                name=f"Seed {i}",
+                start_datetime=BASE_TIME + timedelta(hours=i),
+                end_datetime=BASE_TIME + timedelta(hours=i, minutes=30),
+                timezone="UTC",
+            )
+            for i in range(count)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def build_sync_app(db_file: Path) -> FastAPI:
+    engine = create_engine(f"sqlite:///{db_file}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(events_router, prefix=settings.API_PREFIX)
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def build_async_app(db_file: Path) -> FastAPI:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(events_async_router, prefix=settings.API_PREFIX)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def drive(
+    app: FastAPI,
+    requests: int,
+    concurrency: int,
+    write_ratio: float,
+    seed_count: int,
+) -> Tuple[float, Counter]:
+    """Send the request mix with ``concurrency`` workers.
+
+    Returns requests/sec and a count of response status codes.
+    """
+    counter = iter(range(requests))
+    writes_every = max(1, round(1 / write_ratio)) if write_ratio else 0
+    statuses: Counter = Counter()
+
+    async def worker(client: AsyncClient) -> None:
+        for i in counter:
+            if writes_every and i % writes_every == 0:
+                start = BASE_TIME + timedelta(hours=seed_count + i)
+                response = await client.post(
+                    "/api/events/",
+                    json={
+                        "name": f"Load {i}",
+                        "start_datetime": start.isoformat(),
+                        "end_datetime": (start + timedelta(minutes=30)).isoformat(),
+                        "timezone": "UTC",
+                    },
+                )
+            else:
+                response = await client.get("/api/events/", params={"limit": 50})
+            statuses[response.status_code] += 1
+
+    # Unhandled errors (e.g. "database is locked") become 500s instead of aborting the run
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        return requests / (time.perf_counter() - started), statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="fraction of requests that are creates")
+    parser.add_argument("--seed", type=int, default=1000, help="events in the database before the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, build in (("sync", build_sync_app), ("async", build_async_app)):
+            db_file = Path(tmp) / f"{mode}.db"
+            seed(db_file, args.seed)
+            rps, statuses = asyncio.run(
+                drive(build(db_file), args.requests, args.concurrency, args.write_ratio, args.seed)
+            )
+            print(f"{mode:>5}: {rps:8.1f} req/s  statuses: {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
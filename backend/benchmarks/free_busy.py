@@ -0,0 +1,83 @@
+"""Measure free/busy latency for month-long windows.
+
+Seeds a temporary SQLite file with one-off and weekly recurring events spread
+over a year, then times get_free_busy for random 30-day windows.
+
+Usage:
+    poetry run python -m benchmarks.free_busy --events 10000 --runs 50
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.db.session import Base
+from app.models.event import Event, RecurrenceRule, Weekday
+from app.services import occurrences as occurrence_service
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def seed(db: Session, count: int, recurring_ratio: float, rng: random.Random) -> None:
+    weekdays = list(Weekday)
+    for i in range(count):
+        start = BASE_TIME + timedelta(days=rng.randrange(365), hours=rng.randrange(8, 18), minutes=rng.choice([0, 30]))
+        recurring = rng.random() < recurring_ratio
+        db.add(
+            Event(
+                name=f"Seed {i}",
+                start_datetime=start,
+                end_datetime=start + timedelta(minutes=rng.choice([15, 30, 60])),
+                timezone="UTC",
+                recurrence_rule=RecurrenceRule(days_of_week=rng.sample(weekdays, 2)) if recurring else None,
+            )
+        )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--recurring-ratio", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--duration", type=int, default=45, help="free slot length in minutes")
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'free_busy.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.events, args.recurring_ratio, rng)
+
+            timings = []
+            for _ in range(args.runs):
+                window_start = BASE_TIME + timedelta(days=rng.randrange(335))
+                started = time.perf_counter()
+                free_busy = occurrence_service.get_free_busy(
+                    db,
+                    window_start,
+                    window_start + timedelta(days=30),
+                    timedelta(minutes=args.duration),
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+                db.expunge_all()  # Don't let the identity map carry events between runs
+
+        engine.dispose()
+
+    timings.sort()
+    print(
+        f"{args.events} events, 30-day windows: "
+        f"p50 {statistics.median(timings):.1f} ms  p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms  "
+        f"max {timings[-1]:.1f} ms  ({len(free_busy.busy)} busy blocks in the last window)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Sustained create throughput with and without GROUP_COMMIT.
+
+Threads create non-conflicting events (plus a share of duplicates, which are
+rejected) on a seeded temporary SQLite file, either each committing its own
+create (event_service.create_event) or through the group-commit writer
+(group_commit.create_event). This measures the write path without the HTTP
+layer, which caps benchmarks.load well below either.
+
+Usage:
+    poetry run python -m benchmarks.group_commit --creates 5000 --threads 32
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+from app.core.config import SQLITE_PROFILES
+from app.db.session import Base, apply_sqlite_pragmas
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+from app.services import group_commit
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.services import BASE_TIME, seed
+
+
+def run(create: Callable, args: argparse.Namespace, tmp: Path, name: str) -> Dict[str, float]:
+    engine = create_engine(
+        f"sqlite:///{tmp / f'{name}.db'}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.threads,
+        max_overflow=0,
+    )
+    apply_sqlite_pragmas(engine, SQLITE_PROFILES[args.profile])
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, args.seed_events, 0.1, random.Random(args.seed))
+
+    rng = random.Random(args.seed)
+    events = []
+    for i in range(args.creates):
+        # One night slot per create after the seeded year; duplicates reuse an earlier slot
+        day = rng.randrange(max(1, i)) if i and rng.random() < args.duplicate_rate else i
+        start = BASE_TIME + timedelta(days=400 + day, hours=2)
+        events.append(
+            EventCreate(
+                name=f"Create {i}", start_datetime=start, end_datetime=start + timedelta(minutes=30), timezone="UTC"
+            )
+        )
+
+    counts = {"created": 0, "conflicts": 0}
+    counts_lock = threading.Lock()
+
+    def worker(event: EventCreate) -> None:
+        with Session(engine) as db:
+            try:
+                create(db, event)
+                outcome = "created"
+            except HTTPException:
+                outcome = "conflicts"
+        with counts_lock:
+            counts[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(worker, events))
+    elapsed = time.perf_counter() - started
+
+    with Session(engine) as db:
+        group_commit.stop_writer(db)
+    engine.dispose()
+    return {**counts, "creates_per_s": args.creates / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--creates", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="fraction of creates that conflict")
+    parser.add_argument("--seed-events", type=int, default=10000)
+    parser.add_argument("--profile", default="default", choices=sorted(SQLITE_PROFILES))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, create in (("per-request", event_service.create_event), ("group-commit", group_commit.create_event)):
+            result = run(create, args, Path(tmp), name)
+            print(
+                f"{name:<13} {result['creates_per_s']:8.1f} creates/s  "
+                f"created {result['created']}  conflicts {result['conflicts']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
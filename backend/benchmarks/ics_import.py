@@ -0,0 +1,110 @@
+"""Throughput of the iCalendar import, parsing alone and end to end.
+
+Writes a calendar of one-off VEVENTs, a share of which clash with earlier
+ones, to a temporary file. It times parsing alone, in this process and in a
+process pool, then imports the file into fresh SQLite files: in batches,
+and one commit per event as POST /api/events/ would make them.
+
+Usage:
+    poetry run python -m benchmarks.ics_import --events 10000 --workers 4
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict
+
+from app.db.session import Base
+from app.models.event import Event
+from app.services import event as event_service
+from app.services import ics_import
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.services import BASE_TIME
+
+
+def write_calendar(path: Path, args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    with open(path, "w", newline="\r\n") as file:
+        file.write("BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Benchmark//EN\nX-WR-TIMEZONE:Europe/Berlin\n")
+        for i in range(args.events):
+            # Each event gets its own 30-minute slot; clashes reuse an earlier event's slot
+            slot = rng.randrange(max(1, i)) if i and rng.random() < args.conflict_rate else i
+            start = BASE_TIME + timedelta(days=slot // 20, minutes=30 * (slot % 20))
+            file.write(
+                f"BEGIN:VEVENT\nUID:{i}@benchmark\nSUMMARY:Event {i}\n"
+                f"DESCRIPTION:{'Agenda item. ' * 10}\n"
+                f"DTSTART:{start:%Y%m%dT%H%M%S}Z\nDTEND:{start + timedelta(minutes=30):%Y%m%dT%H%M%S}Z\n"
+            )
+            file.write("END:VEVENT\n")
+        file.write("END:VCALENDAR\n")
+
+
+def run_import(path: Path, tmp: Path, name: str, batch_size: int, workers: int) -> Dict[str, float]:
+    engine = create_engine(f"sqlite:///{tmp / f'{name}.db'}")
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    with Session(engine) as db, open(path, "rb") as file:
+        results = list(ics_import.import_events(db, file, batch_size, workers))
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    imported = sum(1 for result in results if isinstance(result.outcome, Event))
+    return {"events_per_s": len(results) / elapsed, "imported": imported, "rejected": len(results) - imported}
+
+
+def run_per_event(path: Path, tmp: Path) -> Dict[str, float]:
+    engine = create_engine(f"sqlite:///{tmp / 'per-event.db'}")
+    Base.metadata.create_all(engine)
+    imported = rejected = 0
+    started = time.perf_counter()
+    with Session(engine) as db, open(path, "rb") as file:
+        for parsed in ics_import.parse_all(ics_import.read_vevents(file)):
+            try:
+                event_service.create_event(db, parsed.event)
+                imported += 1
+            except HTTPException:
+                rejected += 1
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return {"events_per_s": (imported + rejected) / elapsed, "imported": imported, "rejected": rejected}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--conflict-rate", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "calendar.ics"
+        write_calendar(path, args)
+        print(f"{args.events} VEVENTs, {path.stat().st_size / 1e6:.1f} MB")
+
+        for workers in (0, args.workers):
+            started = time.perf_counter()
+            with open(path, "rb") as file:
+                count = sum(1 for _ in ics_import.parse_all(ics_import.read_vevents(file), workers))
+            print(f"parse, {workers} workers   {count / (time.perf_counter() - started):9.0f} events/s")
+
+        results = {
+            "per-event commits": run_per_event(path, Path(tmp)),
+            "import, 0 workers": run_import(path, Path(tmp), "import-0", args.batch_size, 0),
+            f"import, {args.workers} workers": run_import(path, Path(tmp), "import-n", args.batch_size, args.workers),
+        }
+        for name, result in results.items():
+            print(
+                f"{name:<20} {result['events_per_s']:9.0f} events/s  "
+                f"imported {result['imported']}  rejected {result['rejected']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""In-process HTTP load generator for the full FastAPI app.
+
+Drives app.main:app through httpx's ASGI transport, so requests go through
+routing, validation, the ORM and serialization without a network or server.
+The app's database is swapped for a seeded temporary SQLite file. Workers
+send a weighted mix of:
+- create: POST /api/events/, a share of which deliberately conflict (409)
+- list: GET /api/events/ first pages
+- deep: GET /api/events/ at random offsets deep into the table
+
+and the run reports throughput, per-kind latency histograms and status counts.
+
+Usage:
+    poetry run python -m benchmarks.load --requests 5000 --concurrency 32 --mix create=2,list=6,deep=2
+    poetry run python -m benchmarks.load --mix create=1 --conflict-rate 0 --group-commit
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.db.session import Base, get_db
+from app.main import app
+from app.models.event import Event
+from app.services import group_commit
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from benchmarks.services import BASE_TIME, percentiles, seed
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        kind, weight = part.split("=")
+        if kind not in ("create", "list", "deep"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind: {kind}")
+        weights[kind] = float(weight)
+    return weights
+
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for sample in samples:
+        counts[bisect_left(BUCKETS_MS, sample)] += 1
+    labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+async def drive(args: argparse.Namespace, anchors: List[Tuple]) -> Tuple[float, Dict[str, List[float]], Counter]:
+    """Send the request mix with ``args.concurrency`` workers.
+
+    Returns the wall time, latencies per kind and status counts per kind.
+    """
+    rng = random.Random(args.seed)
+    kinds, weights = zip(*parse_mix(args.mix).items())
+    plan = rng.choices(kinds, weights=weights, k=args.requests)
+    counter = iter(enumerate(plan))
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+
+    async def worker(client: AsyncClient) -> None:
+        for i, kind in counter:
+            if kind == "create":
+                if rng.random() < args.conflict_rate:
+                    start, end = rng.choice(anchors)
+                else:
+                    # One night slot per request after the seeded year, so these never conflict
+                    start = BASE_TIME + timedelta(days=400 + i, hours=2)
+                    end = start + timedelta(minutes=30)
+                request = client.post(
+                    "/api/events/",
+                    json={
+                        "name": f"Load {i}",
+                        "start_datetime": start.isoformat(),
+                        "end_datetime": end.isoformat(),
+                        "timezone": "UTC",
+                    },
+                )
+            elif kind == "list":
+                request = client.get("/api/events/", params={"limit": 50})
+            else:
+                request = client.get("/api/events/", params={"skip": rng.randrange(args.seed_events), "limit": 50})
+
+            started = time.perf_counter()
+            response = await request
+            latencies[kind].append((time.perf_counter() - started) * 1000)
+            statuses[kind, response.status_code] += 1
+
+    # Unhandled errors become 500s in the counts instead of aborting the run
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://load") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(args.concurrency)])
+        return time.perf_counter() - started, latencies, statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default="create=2,list=6,deep=2", help="relative weights of create, list and deep")
+    parser.add_argument("--conflict-rate", type=float, default=0.2, help="fraction of creates that conflict")
+    parser.add_argument("--seed-events", type=int, default=10000, help="events in the database before the run")
+    parser.add_argument("--recurring-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--group-commit", action="store_true", help="create through the GROUP_COMMIT writer")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'load.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.seed_events, args.recurring_ratio, random.Random(args.seed))
+            anchors = list(db.execute(select(Event.start_datetime, Event.end_datetime).limit(1000)))
+
+        SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        settings.GROUP_COMMIT = args.group_commit
+        try:
+            elapsed, latencies, statuses = asyncio.run(drive(args, anchors))
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            with SessionLocal() as db:
+                group_commit.stop_writer(db)
+            engine.dispose()
+
+    report = {
+        "group_commit": args.group_commit,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "requests_per_s": args.requests / elapsed,
+        "kinds": {
+            kind: {
+                **percentiles(samples),
+                "statuses": {str(status): count for (k, status), count in sorted(statuses.items()) if k == kind},
+                "histogram": histogram(samples),
+            }
+            for kind, samples in sorted(latencies.items())
+        },
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}: {report['requests_per_s']:.1f} req/s")
+    for kind, stats in report["kinds"].items():
+        print(
+            f"  {kind:<6} n {stats['n']:>6}  p50 {stats['p50_ms']:7.1f} ms  p95 {stats['p95_ms']:7.1f} ms  "
+            f"p99 {stats['p99_ms']:7.1f} ms  statuses {stats['statuses']}"
+        )
+        busy = {bucket: count for bucket, count in stats["histogram"].items() if count}
+        print(f"         histogram {busy}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Per-event cost of serving a page of GET /api/events/.
+
+Seeds a temporary SQLite file, then times loading and encoding pages of
+events two ways:
+- orm: get_events, EventRead validation from attributes and json.dumps, which
+  is what FastAPI does with a response_model
+- rows: get_event_rows and serialize_page, the path the list routes use
+
+Times are reported per event, split into loading and encoding.
+
+Usage:
+    poetry run python -m benchmarks.serialization --events 10000 --page-size 1000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from app.db.session import Base
+from app.schemas.event import EventRead
+from app.services import event as event_service
+from app.services.event_cache import serialize_page
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.services import seed
+
+_event_list_adapter = TypeAdapter(List[EventRead])
+
+
+def encode_orm(events) -> bytes:
+    # FastAPI validates the returned objects against the response_model, dumps them
+    # in JSON mode and renders the result with json.dumps
+    content = _event_list_adapter.dump_python(_event_list_adapter.validate_python(events), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def encode_rows(rows) -> bytes:
+    return serialize_page(rows, None)[0]
+
+
+def time_page(db: Session, load: Callable, encode: Callable, skip: int, limit: int) -> Tuple[float, float]:
+    """Return the seconds spent loading and encoding one page."""
+    db.expunge_all()  # Each request starts with an empty identity map
+    started = time.perf_counter()
+    page = load(db, skip=skip, limit=limit)
+    loaded = time.perf_counter()
+    encode(page)
+    return loaded - started, time.perf_counter() - loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--recurring-ratio", type=float, default=0.1)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'serialization.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.events, args.recurring_ratio, rng)
+            assert encode_orm(event_service.get_events(db, limit=10)) == encode_rows(
+                event_service.get_event_rows(db, limit=10)
+            )
+
+            paths = {
+                "orm": (event_service.get_events, encode_orm),
+                "rows": (event_service.get_event_rows, encode_rows),
+            }
+            offsets = [rng.randrange(max(1, args.events - args.page_size)) for _ in range(args.runs)]
+            print(f"{args.events} events, pages of {args.page_size}, per event:")
+            for name, (load, encode) in paths.items():
+                timings = [time_page(db, load, encode, skip, args.page_size) for skip in offsets]
+                load_us = sum(t[0] for t in timings) / len(timings) / args.page_size * 1e6
+                encode_us = sum(t[1] for t in timings) / len(timings) / args.page_size * 1e6
+                total_us = load_us + encode_us
+                print(f"  {name:<5} load {load_us:6.1f} us  encode {encode_us:6.1f} us  total {total_us:6.1f} us")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
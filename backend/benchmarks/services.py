@@ -0,0 +1,204 @@
+"""Latency micro-benchmarks for the event service hot paths.
+
+For each database size this seeds a fresh SQLite database with a mix of
+one-off and weekly recurring events, then times individual calls to
+check_time_conflict (through the conflict index and through SQL),
+create_event and get_events (offset and cursor pages). It prints p50/p95/p99
+per benchmark and can write them as JSON, and compare against an earlier run.
+
+Usage:
+    poetry run python -m benchmarks.services --sizes 1000,10000 --output bench.json
+    poetry run python -m benchmarks.services --sizes 1000,10000 --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from uuid import uuid4
+
+import sqlalchemy
+from app.core.config import settings
+from app.db.session import Base
+from app.models.event import Event, RecurrenceRule, Weekday, weekdays_to_mask
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+from app.services.conflict_index import get_conflict_index
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+BASE_TIME = datetime(2024, 1, 1)
+WEEKDAYS = list(Weekday)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds."""
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+    }
+
+
+def time_calls(call: Callable, args: Iterable) -> List[float]:
+    samples = []
+    for arg in args:
+        started = time.perf_counter()
+        call(*arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def random_slot(rng: random.Random, recurring_ratio: float):
+    start = BASE_TIME + timedelta(days=rng.randrange(365), hours=rng.randrange(7, 20), minutes=rng.choice([0, 15, 30]))
+    end = start + timedelta(minutes=rng.choice([15, 30, 60]))
+    days = rng.sample(WEEKDAYS, rng.randint(1, 2)) if rng.random() < recurring_ratio else None
+    return start, end, days
+
+
+def seed(db: Session, count: int, recurring_ratio: float, rng: random.Random) -> None:
+    """Bulk insert ``count`` events without conflict checks; overlaps are fine for timing."""
+    rule_rows, event_rows = [], []
+    for i in range(count):
+        start, end, days = random_slot(rng, recurring_ratio)
+        rule_id = None
+        if days:
+            rule_id = uuid4()
+            rule_rows.append({"id": rule_id, "days_mask": weekdays_to_mask(days), "_days_of_week_json": days})
+        event_rows.append(
+            {
+                "id": uuid4(),
+                "name": f"Seed {i}",
+                "start_datetime": start,
+                "end_datetime": end,
+                "timezone": "UTC",
+                "recurrence_rule_id": rule_id,
+            }
+        )
+    if rule_rows:
+        db.execute(insert(RecurrenceRule), rule_rows)
+    db.execute(insert(Event), event_rows)
+    db.commit()
+
+
+def run_size(size: int, args: argparse.Namespace, db_url: str) -> List[Dict]:
+    rng = random.Random(args.seed)
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    results = []
+
+    def record(name: str, samples: List[float]) -> None:
+        summary = {"size": size, "benchmark": name, **percentiles(samples)}
+        results.append(summary)
+        print(
+            f"{size:>7} {name:<28} p50 {summary['p50_ms']:8.3f} ms  "
+            f"p95 {summary['p95_ms']:8.3f} ms  p99 {summary['p99_ms']:8.3f} ms"
+        )
+
+    index_enabled = settings.CONFLICT_INDEX_ENABLED
+    try:
+        with Session(engine) as db:
+            seed(db, size, args.recurring_ratio, rng)
+            probes = []
+            for _ in range(args.iterations):
+                start, end, days = random_slot(rng, args.recurring_ratio)
+                probes.append((db, start, end, "UTC", days))
+
+            settings.CONFLICT_INDEX_ENABLED = True
+            get_conflict_index(db)  # Build outside the timings
+            record("check_time_conflict[index]", time_calls(event_service.check_time_conflict, probes))
+
+            settings.CONFLICT_INDEX_ENABLED = False
+            record("check_time_conflict[sql]", time_calls(event_service.check_time_conflict, probes))
+
+            # New events go after the seeded year, at night, so they never conflict
+            settings.CONFLICT_INDEX_ENABLED = index_enabled
+            creates = []
+            for i in range(args.iterations):
+                start = BASE_TIME + timedelta(days=400 + i, hours=2)
+                event = EventCreate(
+                    name=f"Bench {i}", start_datetime=start, end_datetime=start + timedelta(minutes=30), timezone="UTC"
+                )
+                creates.append((db, event))
+            record("create_event", time_calls(event_service.create_event, creates))
+
+            pages = [(db, rng.randrange(max(1, size - 100)), 100) for _ in range(args.iterations)]
+            record("get_events[offset]", time_calls(event_service.get_events, pages))
+
+            cursors = []
+            page = event_service.get_events(db, limit=100)
+            while page and len(cursors) < args.iterations:
+                cursors.append((db, 0, 100, event_service.encode_cursor(page[-1])))
+                page = event_service.get_events(db, limit=100, cursor=cursors[-1][3])
+            record("get_events[cursor]", time_calls(event_service.get_events, cursors))
+    finally:
+        settings.CONFLICT_INDEX_ENABLED = index_enabled
+        engine.dispose()
+
+    return results
+
+
+def compare(results: List[Dict], baseline_file: Path) -> None:
+    """Print each p50/p95/p99 relative to a previous run; > 1.00x means slower."""
+    baseline = {(row["size"], row["benchmark"]): row for row in json.loads(baseline_file.read_text())["results"]}
+    print(f"\nCompared with {baseline_file}:")
+    for row in results:
+        before: Optional[Dict] = baseline.get((row["size"], row["benchmark"]))
+        if before is None:
+            continue
+        ratios = "  ".join(f"{key[:3]} {row[key] / before[key]:5.2f}x" for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{row['size']:>7} {row['benchmark']:<28} {ratios}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated event counts, e.g. 1000,10000,100000")
+    parser.add_argument("--recurring-ratio", type=float, default=0.1, help="fraction of seeded events that recur")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--on-disk", action="store_true", help="use a temporary SQLite file instead of :memory:")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(size) for size in args.sizes.split(",")):
+            db_url = f"sqlite:///{Path(tmp) / f'{size}.db'}" if args.on_disk else "sqlite:///:memory:"
+            results.extend(run_size(size, args, db_url))
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "python": sys.version.split()[0],
+                    "sqlalchemy": sqlalchemy.__version__,
+                    "platform": platform.platform(),
+                    "args": {key: str(value) for key, value in vars(args).items()},
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
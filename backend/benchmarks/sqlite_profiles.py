@@ -0,0 +1,126 @@
+"""Measure read/write throughput of the event service under each SQLite profile.
+
+For every profile in SQLITE_PROFILES this creates a fresh on-disk database and
+measures:
+- writes: sequential create_event calls, one commit each
+- reads: sequential get_events pages
+- mixed: reader threads paging through events while one thread keeps writing
+
+Usage:
+    poetry run python -m benchmarks.sqlite_profiles --writes 1000 --reads 2000 --readers 4
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+from app.core.config import SQLITE_PROFILES
+from app.db.session import Base, create_db_engine
+from app.schemas.event import EventCreate
+from app.services import event as event_service
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+BASE_TIME = datetime(2024, 1, 1, 8, 0)
+
+
+def make_event(i: int) -> EventCreate:
+    start = BASE_TIME + timedelta(hours=i)
+    return EventCreate(
+        name=f"Event {i}",
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=30),
+        timezone="UTC",
+    )
+
+
+def measure(profile: str, db_file: Path, writes: int, reads: int, readers: int, mixed_seconds: float) -> Dict:
+    engine = create_db_engine(f"sqlite:///{db_file}", SQLITE_PROFILES[profile])
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    results = {}
+
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        for i in range(writes):
+            event_service.create_event(db, make_event(i))
+        results["writes/s"] = writes / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for i in range(reads):
+            event_service.get_events(db, skip=(i * 100) % writes, limit=100)
+        results["reads/s"] = reads / (time.perf_counter() - started)
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader() -> None:
+        with SessionLocal() as db:
+            while not stop.is_set():
+                try:
+                    event_service.get_events(db, limit=100)
+                    key = "reads"
+                except OperationalError:
+                    db.rollback()
+                    key = "errors"
+                db.rollback()  # End the read transaction, as a request would
+                with lock:
+                    counts[key] += 1
+
+    def writer() -> None:
+        i = writes
+        with SessionLocal() as db:
+            while not stop.is_set():
+                try:
+                    event_service.create_event(db, make_event(i))
+                    key = "writes"
+                except OperationalError:
+                    db.rollback()
+                    key = "errors"
+                i += 1
+                with lock:
+                    counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(mixed_seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    results["mixed reads/s"] = counts["reads"] / mixed_seconds
+    results["mixed writes/s"] = counts["writes"] / mixed_seconds
+    results["mixed errors"] = counts["errors"]
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--mixed-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in SQLITE_PROFILES:
+            results = measure(
+                profile,
+                Path(tmp) / f"{profile}.db",
+                args.writes,
+                args.reads,
+                args.readers,
+                args.mixed_seconds,
+            )
+            print(f"{profile:>12}: " + "  ".join(f"{name} {value:,.0f}" for name, value in results.items()))
+
+
+if __name__ == "__main__":
+    main()
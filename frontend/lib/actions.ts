@@ -60,11 +60,14 @@ export async function scheduleEventAction(
     if (error instanceof ApiError) {
       // If it's a 409 Conflict error, we show it as a form-level error
       if (error.status === 409) {
+        const names = error.conflicts.map((conflict) => conflict.name);
         return {
           success: false,
           data: null,
           errors: {
-            form: "This time slot conflicts with another event. Please choose a different time.",
+            form: names.length
+              ? `This time slot conflicts with ${names.join(", ")}. Please choose a different time.`
+              : "This time slot conflicts with another event. Please choose a different time.",
           },
         };
       }
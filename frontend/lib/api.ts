@@ -4,8 +4,17 @@ const API_BASE_URL = `${
   process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
 }/api`;
 
+export interface ConflictingEvent {
+  id: string;
+  name: string;
+}
+
 export class ApiError extends Error {
-  constructor(public status: number, message: string) {
+  constructor(
+    public status: number,
+    message: string,
+    public conflicts: ConflictingEvent[] = []
+  ) {
     super(message);
     this.name = "ApiError";
   }
@@ -16,7 +25,15 @@ async function handleResponse<T>(response: Response): Promise<T> {
     const error = await response
       .json()
       .catch(() => ({ detail: "An error occurred" }));
-    throw new ApiError(response.status, error.detail || "An error occurred");
+    const detail = error.detail;
+    // A 409 detail is { message, conflicts }; other errors send a string
+    if (detail && typeof detail === "object" && "message" in detail) {
+      throw new ApiError(response.status, detail.message, detail.conflicts);
+    }
+    throw new ApiError(
+      response.status,
+      typeof detail === "string" ? detail : "An error occurred"
+    );
   }
   return response.json();
 }